@@ -0,0 +1,256 @@
+"""
+Intelligence artificielle des unités, sans pygame.
+
+Les fonctions travaillent sur l'état de la partie (MatchState de rules.py) : elles servent au tour
+de l'ennemi dans game.py et aux parties automatiques de simulate.py.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    # sans numpy, les scores sont calculés cellule par cellule (même résultat)
+    np = None
+
+from grid import TERRAIN_HEALING, TERRAIN_MAGMA
+from movement import reachable_cells, path_to, follow_path
+from influence import InfluenceMap
+from rules import clone_match
+
+
+
+
+def opponents(match, unit):
+    """Retourne les unités adverses d'une unité (les unités des joueurs pour l'ennemi)."""
+    return [other for other in match.all_units() if other.team != unit.team]
+
+
+
+
+def find_best_move(match, unit, rng=random, influence=None):
+    """
+    Évalue les cellules que l'unité peut atteindre ce tour et retourne le chemin vers la meilleure.
+
+    Paramètres :
+    -----------
+    - match : MatchState
+        La partie en cours.
+    - unit : Fighter
+        L'unité qui se déplace.
+    - rng : random.Random
+        Générateur aléatoire (fixé par les simulations pour rejouer une partie).
+    - influence : InfluenceMap
+        Carte d'influence du tour de l'équipe (construite ici si elle n'est pas fournie).
+
+    Retourne :
+    ---------
+    - list[tuple[int, int]] : les pas (dx, dy) à suivre, ou None si aucun déplacement n'est intéressant.
+    """
+    if influence is None:
+        influence = InfluenceMap(match, unit.team)
+    reached = reachable_cells(match, unit)
+    if np is not None:
+        best_cell = best_cell_vectorized(match, reached, influence)
+    else:
+        best_cell = best_cell_scalar(match, reached, influence)
+
+    if best_cell is None:
+        return None
+
+    # alterer la destination legerement de facon aleatoire (si la cellule alteree est atteignable)
+    potential_alteration = [-2, -1, 0, 1, 2]
+    probabilities = [0.1, 0.1, 0.6, 0.1, 0.1]
+    ax = rng.choices(potential_alteration, weights=probabilities, k=1)[0]
+    ay = rng.choices(potential_alteration, weights=probabilities, k=1)[0]
+    if (best_cell[0] + ax, best_cell[1] + ay) in reached:
+        best_cell = (best_cell[0] + ax, best_cell[1] + ay)
+
+    return path_to(reached, best_cell[0], best_cell[1]) or None
+
+
+
+
+def best_cell_scalar(match, cells, influence):
+    """
+    Retourne la cellule de meilleur score parmi cells (la première en cas d'égalité),
+    ou None si aucune ne dépasse -500.
+    """
+    best_cell = None
+    best_score = -500
+    for (x, y) in cells:
+        score = evaluate_position(match, x, y, influence)
+        if score > best_score:
+            best_score = score
+            best_cell = (x, y)
+    return best_cell
+
+
+
+
+def best_cell_vectorized(match, cells, influence):
+    """
+    Même choix que best_cell_scalar, avec les scores de toute la carte calculés d'un coup par numpy.
+    """
+    if not cells:
+        return None
+    scores = position_scores(match, influence)
+    width = match.terrain.width
+    indices = np.fromiter((y * width + x for (x, y) in cells), dtype=np.intp, count=len(cells))
+    candidates = scores[indices]
+    best = int(np.argmax(candidates))  # premier maximum, comme la boucle scalaire
+    if candidates[best] <= -500:
+        return None
+    cell = indices[best]
+    return (int(cell % width), int(cell // width))
+
+
+
+
+def position_scores(match, influence):
+    """
+    Retourne le score de evaluate_position pour toutes les cellules (tableau numpy, index y * width + x).
+    """
+    terrain = np.frombuffer(match.terrain.data, dtype=np.uint8)
+    scores = -2 * np.asarray(influence.distance, dtype=np.int64)
+    scores += 5 * (terrain == TERRAIN_HEALING)
+    scores -= 10 * (terrain == TERRAIN_MAGMA)
+    return scores
+
+
+
+
+def evaluate_position(match, x, y, influence):
+    """
+    Retourne un score pour la cellule (x, y) : proximité de l'adversaire le plus proche et type de terrain.
+    """
+    score = -2 * influence.at(influence.distance, x, y)  # Prefer closer positions
+    terrain = match.terrain.terrain_at(x, y)
+    if terrain == TERRAIN_HEALING:
+        score += 5  # Bonus for healing zones
+    if terrain == TERRAIN_MAGMA:
+        score -= 10  # Penalty for harmful terrain
+    return score
+
+
+
+
+def find_best_target(match, unit):
+    """Retourne la cible d'attaque préférée de l'unité (la plus faible à distance 10 ou moins)."""
+    if np is not None:
+        return find_best_target_vectorized(match, unit)
+
+    best_target = None
+    best_score = -500
+    for player in opponents(match, unit):
+        distance = abs(player.x - unit.x) + abs(player.y - unit.y)
+        if distance <= 10:
+            score = player.health * -1  # Prefer low-health targets
+            if score > best_score:
+                best_score = score
+                best_target = player
+    return best_target
+
+
+
+
+def find_best_target_vectorized(match, unit):
+    """Même choix que find_best_target, avec les positions et la santé des adversaires en tableaux."""
+    targets = opponents(match, unit)
+    if not targets:
+        return None
+    xs = np.fromiter((player.x for player in targets), dtype=np.int64, count=len(targets))
+    ys = np.fromiter((player.y for player in targets), dtype=np.int64, count=len(targets))
+    health = np.fromiter((player.health for player in targets), dtype=np.int64, count=len(targets))
+
+    in_range = np.abs(xs - unit.x) + np.abs(ys - unit.y) <= 10
+    scores = np.where(in_range, -health, np.iinfo(np.int64).min)
+    best = int(np.argmax(scores))
+    if not in_range[best] or scores[best] <= -500:
+        return None
+    return targets[best]
+
+
+
+
+def evaluate_skills(match, unit):
+    """Retourne la compétence la plus efficace de l'unité, ou None si aucune n'est utilisable par l'IA."""
+    best_skill = None
+    best_effectiveness = -100
+    for skill in unit.skills:
+        effectiveness = simulate_skill_use(match, skill, unit)
+        if effectiveness > best_effectiveness:
+            best_effectiveness = effectiveness
+            best_skill = skill
+
+    # si best_effectiveness == -100 alors aucun skill n'est compatible avec l'IA
+    if best_effectiveness == -100 :
+        return None
+
+    return best_skill
+
+
+
+
+def simulate_skill_use(match, skill, unit):
+    """
+    Estime l'efficacité d'une compétence : les dégâts réels de son utilisation automatique (skill.preview),
+    moins les dégâts subis par l'équipe de l'unité.
+    """
+    # test if skill is AI compatible
+    if skill.AI_compatible == False :
+        return -100
+
+    effectiveness = 0
+    for target, damage in skill.preview(unit, match).items():
+        if target.team != unit.team:
+            effectiveness += damage
+        else:
+            effectiveness -= damage
+    return effectiveness
+
+
+
+
+def greedy_plan(match, unit, rng=random, influence=None):
+    """
+    Choisit le plan de l'unité sans l'appliquer, comme play_turn : le déplacement d'abord, puis la
+    compétence, évaluée sur une copie de la partie où l'unité a suivi son chemin (positions et
+    effets du terrain à jour).
+
+    Retourne :
+    ---------
+    - tuple[list[tuple[int, int]], int] : le chemin à suivre et l'index de la compétence à utiliser (ou None).
+    """
+    path = find_best_move(match, unit, rng, influence)
+    state = clone_match(match)
+    moved = state.all_units()[match.all_units().index(unit)]
+    if path:
+        follow_path(state, moved, path)
+
+    best_skill = evaluate_skills(state, moved)
+    return path, (moved.skills.index(best_skill) if best_skill else None)
+
+
+
+
+def play_turn(match, unit, rng=random, influence=None):
+    """
+    Joue le tour complet d'une unité sans affichage, dans le même ordre que Game.enemy_AI_turn :
+    déplacement, compétence, puis attaque. Les unités tuées sont retirées à la fin du tour.
+    """
+    path = find_best_move(match, unit, rng, influence)
+    if path:
+        follow_path(match, unit, path)
+
+    best_skill = evaluate_skills(match, unit)
+    if best_skill:
+        best_skill.auto_use(unit, match)
+
+    target = find_best_target(match, unit)
+    if target:
+        health = target.health
+        unit.attack(target)
+        match.record_damage("Attack", health - target.health)
+
+    match.remove_dead_units()
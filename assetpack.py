@@ -0,0 +1,293 @@
+"""
+Paquet de ressources : tout le dossier data/ dans un seul fichier indexé.
+
+Sur une installation en réseau, ouvrir des dizaines de petits fichiers coûte plus cher que les lire.
+Le paquet regroupe les fichiers de data/ derrière un index (chemin -> position, taille) ; le jeu
+l'ouvre une fois avec mmap et passe à pygame des vues sur la mémoire projetée (PackedFile), sans
+copier chaque fichier dans un objet bytes intermédiaire. Sans paquet (développement), assets.py lit
+les fichiers séparés. Les modules sans pygame (cartes CSV de grid.py, rules.py, fov.py, footprints.py)
+lisent leurs fichiers avec read_file et open_text, depuis le même paquet.
+
+Construire le paquet (à refaire quand data/ change) :
+    python assetpack.py                 # data/ -> data.pack
+    python assetpack.py --list          # contenu du paquet
+"""
+
+import argparse
+import io
+import mmap
+import os
+import posixpath
+import struct
+
+
+PACK_FILE = "data.pack"
+FILE_MAGIC = b"FGPAK1"
+SKIPPED_EXTENSIONS = (".los", ".mask")  # fichiers générés à côté des cartes (fov.py, grid.py)
+
+# paquets déjà ouverts, par chemin : un seul mmap par paquet pour tout le jeu (shared_pack)
+open_packs = {}
+
+
+
+
+def normalize(path):
+    """Retourne la clé d'un chemin dans l'index : séparateurs '/', sans './' ni '..' superflus."""
+    return posixpath.normpath(path.replace("\\", "/"))
+
+
+
+
+class PackedFile(io.RawIOBase):
+    """
+    Classe pour lire un fichier du paquet comme un fichier ouvert (pygame.image.load, pygame.mixer.Sound).
+
+    Attributs :
+    ----------
+    - view : memoryview
+        Les octets du fichier dans la mémoire projetée du paquet.
+    - position : int
+        Position de lecture.
+    """
+
+
+
+
+    def __init__(self, view):
+        super().__init__()
+        self.view = view
+        self.position = 0
+
+
+
+
+    def readable(self):
+        return True
+
+
+
+
+    def seekable(self):
+        return True
+
+
+
+
+    def readinto(self, buffer):
+        """Copie les octets suivants directement dans le tampon du lecteur."""
+        count = min(len(buffer), len(self.view) - self.position)
+        buffer[:count] = self.view[self.position:self.position + count]
+        self.position += count
+        return count
+
+
+
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, offset)
+        return self.position
+
+
+
+
+    def tell(self):
+        return self.position
+
+
+
+
+class AssetPack:
+    """
+    Classe pour lire un paquet de ressources projeté en mémoire.
+
+    Attributs :
+    ----------
+    - path : str
+        Chemin du paquet.
+    - entries : dict[str, tuple[int, int]]
+        Position et taille de chaque fichier, par chemin normalisé (normalize).
+    - mtime_ns : int
+        Date de modification du paquet (ns), celle de tous ses fichiers pour le cache de textures.
+    """
+
+
+
+
+    def __init__(self, path, file, mapping, entries):
+        self.path = path
+        self.file = file
+        self.mapping = mapping
+        self.view = memoryview(mapping)
+        self.entries = entries
+        self.mtime_ns = os.fstat(file.fileno()).st_mtime_ns
+
+
+
+
+    @classmethod
+    def open(cls, path=PACK_FILE):
+        """Ouvre un paquet. Retourne None s'il n'existe pas ou s'il est invalide."""
+        try:
+            file = open(path, mode='rb')
+        except OSError:
+            return None
+        try:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # fichier vide
+            file.close()
+            return None
+
+        header_size = len(FILE_MAGIC) + 8
+        entries = {}
+        if len(mapping) >= header_size and mapping[:len(FILE_MAGIC)] == FILE_MAGIC:
+            count, index_size = struct.unpack("<II", mapping[len(FILE_MAGIC):header_size])
+            position = header_size
+            try:
+                for _ in range(count):
+                    (name_size,) = struct.unpack("<H", mapping[position:position + 2])
+                    name = mapping[position + 2:position + 2 + name_size].decode("utf-8")
+                    offset, size = struct.unpack("<QQ", mapping[position + 2 + name_size:position + 18 + name_size])
+                    entries[name] = (offset, size)
+                    position += 18 + name_size
+            except (struct.error, UnicodeDecodeError):
+                entries = None
+            if entries is not None and position == header_size + index_size \
+                    and all(offset + size <= len(mapping) for offset, size in entries.values()):
+                return cls(path, file, mapping, entries)
+
+        mapping.close()
+        file.close()
+        return None
+
+
+
+
+    def __contains__(self, path):
+        return normalize(path) in self.entries
+
+
+
+
+    def data(self, path):
+        """Retourne les octets d'un fichier du paquet (vue sur la mémoire projetée, sans copie)."""
+        offset, size = self.entries[normalize(path)]
+        return self.view[offset:offset + size]
+
+
+
+
+    def reader(self, path):
+        """Retourne un PackedFile pour lire un fichier du paquet."""
+        return PackedFile(self.data(path))
+
+
+
+
+    def listdir(self, directory):
+        """Retourne les noms des fichiers d'un dossier du paquet (sans les sous-dossiers), triés."""
+        prefix = normalize(directory) + "/"
+        return sorted(name[len(prefix):] for name in self.entries
+                      if name.startswith(prefix) and "/" not in name[len(prefix):])
+
+
+
+
+def shared_pack(path=PACK_FILE):
+    """Retourne le paquet partagé de ce chemin (ouvert à la première demande), ou None s'il n'existe pas."""
+    if path not in open_packs:
+        open_packs[path] = AssetPack.open(path)
+    return open_packs[path]
+
+
+
+
+def read_file(path, pack_path=PACK_FILE):
+    """Retourne les octets d'un fichier de data/ : depuis le paquet s'il le contient, sinon depuis le disque."""
+    pack = shared_pack(pack_path)
+    if pack is not None and path in pack:
+        return bytes(pack.data(path))
+    with open(path, mode='rb') as file:
+        return file.read()
+
+
+
+
+def open_text(path, pack_path=PACK_FILE):
+    """Ouvre un fichier texte de data/ (paquet ou disque), pour csv.reader par exemple."""
+    return io.StringIO(read_file(path, pack_path).decode("utf-8"), newline=None)
+
+
+
+
+def build_pack(source="data", output=PACK_FILE):
+    """
+    Écrit le paquet de tous les fichiers du dossier source.
+
+    Paramètres :
+    -----------
+    - source : str
+        Dossier à empaqueter (chemins gardés tels que le jeu les demande, par exemple data/tiles/mud.png).
+    - output : str
+        Chemin du paquet.
+
+    Retourne :
+    ---------
+    - tuple[int, int] : nombre de fichiers et taille du paquet en octets.
+    """
+    names = []
+    for root, directories, files in os.walk(source):
+        directories.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if not name.endswith(SKIPPED_EXTENSIONS) and os.path.abspath(path) != os.path.abspath(output):
+                names.append(normalize(path))
+
+    encoded = [name.encode("utf-8") for name in names]
+    index_size = sum(18 + len(name) for name in encoded)
+    offset = len(FILE_MAGIC) + 8 + index_size
+    index = []
+    for name, path in zip(encoded, names):
+        size = os.path.getsize(path)
+        index.append(struct.pack("<H", len(name)) + name + struct.pack("<QQ", offset, size))
+        offset += size
+
+    with open(output, mode='wb') as pack:
+        pack.write(FILE_MAGIC)
+        pack.write(struct.pack("<II", len(names), index_size))
+        pack.write(b"".join(index))
+        for path in names:
+            with open(path, mode='rb') as file:
+                pack.write(file.read())
+    return len(names), offset
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regroupe les ressources du jeu dans un seul fichier indexé.")
+    parser.add_argument("source", nargs="?", default="data", help="dossier à empaqueter")
+    parser.add_argument("-o", "--output", default=PACK_FILE, help="paquet à écrire")
+    parser.add_argument("--list", action="store_true", help="afficher le contenu du paquet au lieu de le construire")
+    args = parser.parse_args()
+
+    if args.list:
+        pack = AssetPack.open(args.output)
+        if pack is None:
+            parser.error(f"paquet absent ou invalide : {args.output}")
+        for name, (offset, size) in sorted(pack.entries.items()):
+            print(f"{size:>10}  {name}")
+        return
+
+    count, size = build_pack(args.source, args.output)
+    print(f"{args.output} : {count} fichiers, {size / (1024 * 1024):.1f} Mo")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,520 @@
+"""
+Chargement des images, sons et polices du jeu, avec un cache commun.
+
+Chaque ressource est chargée à la première demande puis gardée sous une clé (chemin, taille,
+format) : une image demandée à plusieurs endroits, ou à chaque utilisation d'une compétence, n'est
+décodée et redimensionnée qu'une fois. La mémoire occupée par les images et les sons est bornée :
+au-delà du budget, les ressources utilisées le moins récemment sont retirées du cache (LRU). Une
+ressource retirée reste valable pour ceux qui l'ont déjà ; elle sera rechargée à la demande suivante.
+Les ressources épinglées (les sons de la banque de sounds.py, gardés toute la partie) sont comptées à
+part : les retirer ne libérerait rien, et elles ne doivent pas pousser les images hors du budget.
+
+Les ressources peuvent aussi être chargées à l'avance par preload(), dans un pool de threads, pendant
+que l'interface reste utilisable : les demandes les plus prioritaires (l'écran affiché) passent d'abord.
+Le cache est protégé par un verrou et une ressource en cours de chargement dans un thread n'est pas
+décodée une deuxième fois : la demande attend son résultat.
+
+Les fichiers sont lus dans le paquet de ressources (assetpack.py) s'il a été construit, sinon dans
+le dossier data/. Les images décodées, converties et redimensionnées sont aussi gardées sur le disque
+(TextureCache) : au lancement suivant, elles sont relues telles quelles.
+"""
+
+import collections
+import concurrent.futures
+import hashlib
+import heapq
+import os
+import struct
+import threading
+
+import pygame
+
+from assetpack import PACK_FILE, PackedFile, normalize, shared_pack
+
+
+MEMORY_BUDGET = 32 * 1024 * 1024  # octets d'images et de sons gardés en cache
+LOADER_THREADS = 4                # threads de chargement en arrière-plan
+TEXTURE_CACHE = ".texture_cache"  # dossier des images prêtes à afficher (TextureCache)
+NATIVE_ALPHA_MASKS = (0xFF0000, 0xFF00, 0xFF, 0xFF000000)  # format habituel de convert_alpha : octets BGRA
+
+
+
+
+class TextureCache:
+    """
+    Classe pour garder sur le disque les images déjà converties et redimensionnées.
+
+    Chaque image (chemin, taille, format, format de l'écran) est enregistrée comme un tableau de
+    pixels brut, avec la taille, la date de modification et l'empreinte SHA-256 de son fichier source.
+    Au lancement suivant, elle est relue avec pygame.image.frombuffer : ni décodage PNG/JPG/WEBP, ni
+    redimensionnement. Tant que la taille et la date du fichier source n'ont pas changé, il n'est même
+    pas lu ; sinon son empreinte décide si l'image enregistrée est encore valable. Quand l'écran
+    utilise le format habituel de convert_alpha, les pixels sont rangés dans cet ordre (BGRA) et la
+    surface relue est directement au bon format.
+
+    Seules les images converties ("alpha" ou "opaque") passent par le cache : une image sans
+    conversion garde le format de son fichier, qu'un tableau de pixels RGBA ne reproduit pas.
+
+    Attributs :
+    ----------
+    - directory : str
+        Dossier des fichiers .tex.
+    - hits, misses : int
+        Images relues et images recalculées.
+    - rehashed : int
+        Images dont le fichier source a été relu pour comparer son empreinte (taille ou date changée).
+    """
+
+    FILE_MAGIC = b"FGTEX2"
+    STAMP_FORMAT = "<QQ"  # taille et date de modification (ns) du fichier source
+
+
+
+
+    def __init__(self, directory=TEXTURE_CACHE):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.rehashed = 0
+
+
+
+
+    def file_for(self, path, size, mode):
+        """Retourne le fichier du cache d'une image (le nom dépend aussi du format de l'écran)."""
+        display = pygame.display.get_surface()
+        screen_format = (display.get_bitsize(), display.get_masks()) if display is not None else None
+        key = repr((normalize(path), size, mode, screen_format)).encode("utf-8")
+        return os.path.join(self.directory, hashlib.sha256(key).hexdigest()[:32] + ".tex")
+
+
+
+
+    def load(self, cache_path, stamp, mode, source_hash):
+        """
+        Relit une image enregistrée par save().
+
+        Paramètres :
+        -----------
+        - cache_path : str
+            Fichier du cache (file_for).
+        - stamp : tuple[int, int]
+            Taille et date de modification actuelles du fichier source.
+        - mode : str
+            "alpha" ou "opaque" (voir AssetManager.image).
+        - source_hash : function
+            source_hash() -> bytes : empreinte SHA-256 du fichier source, appelée seulement si stamp a changé.
+
+        Retourne :
+        ---------
+        - pygame.Surface : l'image, ou None si elle est absente, invalide ou périmée.
+        """
+        try:
+            with open(cache_path, mode='rb') as file:
+                data = bytearray(os.fstat(file.fileno()).st_size)
+                file.readinto(data)
+        except OSError:
+            return None
+
+        stamp_end = len(self.FILE_MAGIC) + struct.calcsize(self.STAMP_FORMAT)
+        header_size = stamp_end + 32 + 8
+        if len(data) < header_size or not data.startswith(self.FILE_MAGIC):
+            return None
+        width, height = struct.unpack("<HH", data[header_size - 8:header_size - 4])
+        layout = bytes(data[header_size - 4:header_size]).decode("ascii", "replace")
+        if layout not in ("BGRA", "RGBA") or len(data) != header_size + width * height * 4:
+            return None
+
+        if struct.unpack(self.STAMP_FORMAT, data[len(self.FILE_MAGIC):stamp_end]) != tuple(stamp):
+            # fichier source touché (copie, extraction, paquet reconstruit) : le contenu a-t-il changé ?
+            self.rehashed += 1
+            if data[stamp_end:stamp_end + 32] != source_hash():
+                return None
+            self.restamp(cache_path, stamp)
+
+        # la surface garde une référence au tableau : pas de copie des pixels
+        surface = pygame.image.frombuffer(memoryview(data)[header_size:], (width, height), layout)
+        if mode == "alpha" and layout != "BGRA":
+            surface = surface.convert_alpha()
+        elif mode == "opaque":
+            surface = surface.convert()
+        return surface
+
+
+
+
+    def restamp(self, cache_path, stamp):
+        """Remplace la taille et la date du fichier source dans l'en-tête (le contenu n'a pas changé)."""
+        try:
+            with open(cache_path, mode='r+b') as file:
+                file.seek(len(self.FILE_MAGIC))
+                file.write(struct.pack(self.STAMP_FORMAT, *stamp))
+        except OSError:
+            # installation en lecture seule : l'empreinte sera encore comparée au prochain lancement
+            pass
+
+
+
+
+    def save(self, cache_path, stamp, source_hash, surface):
+        """Enregistre les pixels d'une image (sans effet si le dossier n'est pas accessible en écriture)."""
+        if surface.get_bitsize() == 32 and surface.get_masks() == NATIVE_ALPHA_MASKS:
+            layout = "BGRA"
+        else:
+            layout = "RGBA"
+        width, height = surface.get_size()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(cache_path + ".tmp", mode='wb') as file:
+                file.write(self.FILE_MAGIC)
+                file.write(struct.pack(self.STAMP_FORMAT, *stamp))
+                file.write(source_hash)
+                file.write(struct.pack("<HH", width, height))
+                file.write(layout.encode("ascii"))
+                file.write(pygame.image.tobytes(surface, layout))
+            os.replace(cache_path + ".tmp", cache_path)
+        except OSError:
+            # installation en lecture seule : l'image sera recalculée au prochain lancement
+            pass
+
+
+
+
+class AssetManager:
+    """
+    Classe pour charger les ressources du jeu une seule fois.
+
+    Attributs :
+    ----------
+    - budget : int
+        Taille maximale du cache, en octets.
+    - entries : collections.OrderedDict
+        clé -> (ressource, taille en octets), de la moins récemment utilisée à la plus récente.
+    - fonts : dict[tuple, pygame.font.Font]
+        Polices déjà créées (petites : jamais retirées).
+    - used_bytes : int
+        Taille actuelle du cache.
+    - pinned : dict
+        clé -> (ressource, taille en octets) des ressources épinglées : jamais retirées, hors budget.
+    - pinned_bytes : int
+        Taille des ressources épinglées.
+    - hits, misses, evictions : int
+        Statistiques : demandes servies par le cache, chargements, ressources retirées.
+    - queue : list[tuple]
+        Tas des chargements en attente : (priorité, -taille du fichier, numéro, demande).
+    - queued, completed : int
+        Nombre de chargements demandés à preload() et terminés (barre de progression).
+    - pack : AssetPack
+        Paquet de ressources ouvert, ou None (fichiers séparés).
+    - textures : TextureCache
+        Images prêtes à afficher gardées sur le disque, ou None pour tout recalculer.
+    """
+
+
+
+
+    def __init__(self, budget=MEMORY_BUDGET, pack_path=PACK_FILE, texture_cache=TEXTURE_CACHE):
+        self.budget = budget
+        self.pack = shared_pack(pack_path)
+        self.textures = TextureCache(texture_cache) if texture_cache else None
+        self.entries = collections.OrderedDict()
+        self.pending = {}  # clé -> threading.Event des chargements en cours
+        self.lock = threading.Lock()
+        self.fonts = {}
+        self.used_bytes = 0
+        self.pinned = {}
+        self.pinned_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.queue = []
+        self.queue_lock = threading.Lock()
+        self.queued = 0
+        self.completed = 0
+        self.loaders = 0
+        self.executor = None
+
+
+
+
+    def source(self, path):
+        """Retourne de quoi lire un fichier : un PackedFile s'il est dans le paquet, sinon son chemin."""
+        if self.pack is not None and path in self.pack:
+            return self.pack.reader(path)
+        return path
+
+
+
+
+    def read_source(self, path):
+        """Retourne le contenu d'un fichier : vue sur le paquet (sans copie), sinon lu dans data/."""
+        if self.pack is not None and path in self.pack:
+            return self.pack.data(path)
+        with open(path, mode='rb') as file:
+            return file.read()
+
+
+
+
+    def source_hash(self, path):
+        """Retourne l'empreinte SHA-256 du contenu d'un fichier (paquet ou data/)."""
+        return hashlib.sha256(self.read_source(path)).digest()
+
+
+
+
+    def source_stamp(self, path):
+        """Retourne la taille et la date de modification (ns) d'un fichier ; dans le paquet, la date du paquet."""
+        if self.pack is not None and path in self.pack:
+            return len(self.pack.data(path)), self.pack.mtime_ns
+        status = os.stat(path)
+        return status.st_size, status.st_mtime_ns
+
+
+
+
+    def exists(self, path):
+        """Vérifie si un fichier existe (dans le paquet ou dans data/)."""
+        return (self.pack is not None and path in self.pack) or os.path.exists(path)
+
+
+
+
+    def file_size(self, path):
+        """Retourne la taille d'un fichier en octets (0 s'il n'existe pas)."""
+        if self.pack is not None and path in self.pack:
+            return len(self.pack.data(path))
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+
+
+    def listdir(self, directory):
+        """Retourne les noms des fichiers d'un dossier (paquet et data/ réunis), triés."""
+        names = set(self.pack.listdir(directory)) if self.pack is not None else set()
+        if os.path.isdir(directory):
+            names.update(name for name in os.listdir(directory) if os.path.isfile(os.path.join(directory, name)))
+        return sorted(names)
+
+
+
+
+    def get(self, key, decode, pinned=False):
+        """
+        Retourne la ressource d'une clé (et la marque comme récente). Si elle n'est pas en cache,
+        decode() -> (ressource, taille en octets) la charge ; si un autre thread est déjà en train
+        de la charger, on attend son résultat. Avec pinned=True, la ressource chargée est épinglée
+        (gardée hors du budget, jamais retirée).
+        """
+        with self.lock:
+            entry = self.pinned.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return entry[0]
+            pending = self.pending.get(key)
+            if pending is None:
+                self.misses += 1
+                self.pending[key] = threading.Event()
+
+        if pending is not None:
+            pending.wait()
+            return self.get(key, decode, pinned)
+
+        try:
+            asset, size = decode()
+            self.store(key, asset, size, pinned)
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+        return asset
+
+
+
+
+    def store(self, key, asset, size, pinned=False):
+        """Ajoute une ressource au cache puis retire les plus anciennes tant que le budget est dépassé."""
+        with self.lock:
+            if pinned:
+                self.pinned[key] = (asset, size)
+                self.pinned_bytes += size
+                return
+            self.entries[key] = (asset, size)
+            self.used_bytes += size
+            while self.used_bytes > self.budget and len(self.entries) > 1:
+                self.used_bytes -= self.entries.popitem(last=False)[1][1]
+                self.evictions += 1
+
+
+
+
+    def image(self, path, size=None, mode="alpha"):
+        """
+        Retourne une image chargée, convertie au format de l'écran et redimensionnée.
+
+        Paramètres :
+        -----------
+        - path : str
+            Chemin du fichier.
+        - size : tuple[int, int]
+            Taille voulue en pixels, ou None pour garder la taille du fichier.
+        - mode : str
+            "alpha" (convert_alpha), "opaque" (convert) ou None (surface telle que décodée, au format
+            du fichier : pas gardée dans le cache de textures).
+
+        Retourne :
+        ---------
+        - pygame.Surface : l'image, partagée avec les autres demandes de la même clé (ne pas dessiner dessus).
+        """
+        def decode():
+            cached = self.textures is not None and mode is not None
+            surface = None
+            if cached:
+                stamp = self.source_stamp(path)
+                cache_path = self.textures.file_for(path, size, mode)
+                surface = self.textures.load(cache_path, stamp, mode, lambda: self.source_hash(path))
+                if surface is not None:
+                    self.textures.hits += 1
+
+            if surface is None:
+                # le fichier est lu une seule fois, pour le décodage et pour l'empreinte
+                data = self.read_source(path)
+                surface = pygame.image.load(PackedFile(memoryview(data)), path)
+                if mode == "alpha":
+                    surface = surface.convert_alpha()
+                elif mode == "opaque":
+                    surface = surface.convert()
+                if size is not None:
+                    surface = pygame.transform.scale(surface, size)
+                if cached:
+                    self.textures.misses += 1
+                    self.textures.save(cache_path, stamp, hashlib.sha256(data).digest(), surface)
+            return surface, surface.get_pitch() * surface.get_height()
+
+        return self.get(("image", path, size, mode), decode)
+
+
+
+
+    def sound(self, path, pinned=False):
+        """
+        Retourne un son décodé (partagé : plusieurs play() simultanés restent possibles).
+        pinned=True pour un son gardé toute la partie (banque de sons) : il ne compte pas dans le budget.
+        """
+        def decode():
+            sound = pygame.mixer.Sound(self.source(path))
+            frequency, size, channels = pygame.mixer.get_init() or (44100, -16, 2)
+            return sound, int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+        return self.get(("sound", path), decode, pinned)
+
+
+
+
+    def font(self, name, size):
+        """Retourne une police (name : fichier de police, ou None pour la police par défaut)."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+
+
+
+    def preload(self, requests, priority=0):
+        """
+        Charge des ressources en arrière-plan, dans un pool de LOADER_THREADS threads.
+
+        Paramètres :
+        -----------
+        - requests : list[tuple]
+            Chargements à faire : (fonction, chemin, autres arguments), par exemple
+            (assets.image, chemin, taille) ou (assets.sound, chemin).
+        - priority : int
+            Les plus petites priorités passent d'abord ; à priorité égale, les fichiers les plus
+            lourds d'abord (ils occupent le plus longtemps un thread). Une ressource déjà demandée
+            peut être redemandée avec une meilleure priorité : la deuxième demande la charge plus tôt,
+            la première la trouvera en cache.
+        """
+        with self.queue_lock:
+            for request in requests:
+                size = self.file_size(request[1])
+                heapq.heappush(self.queue, (priority, -size, self.queued, request))
+                self.queued += 1
+            if self.executor is None:
+                self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=LOADER_THREADS,
+                                                                      thread_name_prefix="assets")
+            while self.loaders < min(LOADER_THREADS, len(self.queue)):
+                self.loaders += 1
+                self.executor.submit(self.load_queued)
+
+
+
+
+    def load_queued(self):
+        """Boucle d'un thread de chargement : traite les demandes de preload() jusqu'à ce qu'il n'y en ait plus."""
+        while True:
+            with self.queue_lock:
+                if not self.queue:
+                    self.loaders -= 1
+                    return
+                request = heapq.heappop(self.queue)[3]
+            try:
+                request[0](*request[1:])
+            except (pygame.error, OSError) as error:
+                # la ressource sera chargée (et l'erreur levée) à la première vraie demande
+                print(f"{request[1]} : {error}")
+            with self.queue_lock:
+                self.completed += 1
+
+
+
+
+    def progress(self):
+        """Retourne la part des chargements demandés à preload() qui sont terminés (1.0 s'il n'y en a aucun)."""
+        with self.queue_lock:
+            return self.completed / self.queued if self.queued else 1.0
+
+
+
+
+    def clear(self):
+        """Vide le cache (changement de résolution, libération de mémoire) ; les ressources épinglées restent."""
+        with self.lock:
+            self.entries.clear()
+            self.used_bytes = 0
+
+
+
+
+    def stats(self):
+        """Retourne les compteurs du cache (suivi de la mémoire et des chargements)."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.used_bytes,
+            "pinned": len(self.pinned),
+            "pinned_bytes": self.pinned_bytes,
+            "budget": self.budget,
+            "progress": self.progress(),
+            "disk_hits": self.textures.hits if self.textures is not None else 0,
+            "disk_misses": self.textures.misses if self.textures is not None else 0,
+            "disk_rehashed": self.textures.rehashed if self.textures is not None else 0,
+        }
+
+
+
+
+# Gestionnaire partagé par tout le jeu
+assets = AssetManager()
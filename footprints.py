@@ -0,0 +1,186 @@
+"""
+Formes des zones d'effet des compétences et recherche des meilleurs centres, sans pygame.
+
+Une empreinte (Footprint) est la liste des cellules touchées, relatives à un centre. Pour trouver
+où la placer, on calcule la valeur de chaque cellule (les dégâts qu'y subirait l'unité présente),
+puis la somme de ces valeurs sous l'empreinte pour tous les centres d'un coup (une convolution,
+avec numpy s'il est installé).
+
+Les empreintes des compétences sont enregistrées dans FOOTPRINTS par rules.py, sous le nom de la
+compétence : l'IA et l'interface (suggestion de cible) les lisent au même endroit.
+"""
+
+import csv
+
+from assetpack import open_text
+
+try:
+    import numpy as np
+except ImportError:
+    # sans numpy, les sommes sont calculées centre par centre (même résultat)
+    np = None
+
+
+# nom de la compétence -> liste des empreintes possibles (plusieurs pour Poison Apocalypse)
+FOOTPRINTS = {}
+
+
+
+
+class Footprint:
+    """
+    Classe pour représenter la forme d'une zone d'effet.
+
+    Attributs :
+    ----------
+    - name : str
+        Nom de l'empreinte (affichage, statistiques).
+    - offsets : list[tuple[int, int]]
+        Cellules touchées, relatives au centre.
+    - reach : int
+        Centres possibles : à distance reach ou moins du lanceur (carré, comme square_area) ;
+        0 : toujours sur le lanceur ; None : zone fixe de la carte, centrée en (0, 0).
+    - filename : str
+        Masque CSV d'où viennent les cellules (lu à la première utilisation), ou None.
+    """
+
+
+
+
+    def __init__(self, name, offsets=None, reach=None, filename=None):
+        self.name = name
+        self.loaded_offsets = list(offsets) if offsets is not None else None
+        self.reach = reach
+        self.filename = filename
+
+
+
+
+    @property
+    def offsets(self):
+        """Cellules touchées, relatives au centre (un masque CSV est lu à la première utilisation)."""
+        if self.loaded_offsets is None:
+            self.loaded_offsets = []
+            with open_text(self.filename) as file:
+                for y, row in enumerate(csv.reader(file)):
+                    for x, cell in enumerate(row):
+                        if cell == '*':
+                            self.loaded_offsets.append((x, y))
+        return self.loaded_offsets
+
+
+
+
+    @classmethod
+    def square(cls, name, radius, reach):
+        """Zone carrée de rayon radius autour du centre (radius 1 : 3x3)."""
+        offsets = [(dx, dy) for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1)]
+        return cls(name, offsets, reach)
+
+
+
+
+    @classmethod
+    def from_csv(cls, filename):
+        """Zone fixe de la carte lue depuis un masque CSV (une case '*' par cellule touchée, comme load_poison_zones)."""
+        return cls(filename, reach=None, filename=filename)
+
+
+
+
+    def anchors(self, owner, width, height):
+        """Retourne les bornes (x0, x1, y0, y1) des centres possibles (x1 et y1 exclus)."""
+        if self.reach is None:
+            return 0, 1, 0, 1
+        return (max(owner.x - self.reach, 0), min(owner.x + self.reach + 1, width),
+                max(owner.y - self.reach, 0), min(owner.y + self.reach + 1, height))
+
+
+
+
+    def cells(self, anchor_x, anchor_y, width, height):
+        """Retourne les cellules de la carte touchées avec ce centre."""
+        return [(anchor_x + dx, anchor_y + dy) for dx, dy in self.offsets
+                if 0 <= anchor_x + dx < width and 0 <= anchor_y + dy < height]
+
+
+
+
+def register(skill_name, *footprints):
+    """Enregistre les empreintes d'une compétence."""
+    FOOTPRINTS[skill_name] = list(footprints)
+
+
+
+
+def top_anchors(owner, match, footprint, value, k=1):
+    """
+    Cherche les k meilleurs centres d'une empreinte.
+
+    Paramètres :
+    -----------
+    - owner : Fighter
+        Le lanceur.
+    - match : MatchState
+        La partie en cours.
+    - footprint : Footprint
+        La forme de la zone.
+    - value : function
+        value(unit) -> int : ce que rapporte l'unité si elle est dans la zone (négatif pour un allié).
+    - k : int
+        Nombre de centres voulus.
+
+    Retourne :
+    ---------
+    - list[tuple[int, tuple[int, int]]] : (dégâts attendus, centre) du meilleur au moins bon, seulement
+      les centres qui rapportent plus que 0 ; à égalité, dans l'ordre de square_area (x puis y).
+    """
+    width = match.terrain.width
+    height = match.terrain.height
+    x0, x1, y0, y1 = footprint.anchors(owner, width, height)
+    if x0 >= x1 or y0 >= y1:
+        return []
+
+    if np is None:
+        scored = []
+        for x in range(x0, x1):
+            for y in range(y0, y1):
+                score = sum(value(unit) for unit in match.occupancy.units_in(footprint.cells(x, y, width, height)))
+                scored.append((score, (x, y)))
+        scored.sort(key=lambda item: -item[0])  # tri stable : l'ordre x puis y est gardé à égalité
+        return [item for item in scored[:k] if item[0] > 0]
+
+    sums = convolve(match, footprint, value)[x0:x1, y0:y1]
+    order = np.argsort(-sums, axis=None, kind="stable")[:k]
+    result = []
+    for index in order:
+        x, y = divmod(int(index), y1 - y0)
+        if sums[x, y] > 0:
+            result.append((int(sums[x, y]), (x0 + x, y0 + y)))
+    return result
+
+
+
+
+def convolve(match, footprint, value):
+    """
+    Retourne le tableau numpy [x, y] des dégâts attendus pour chaque centre de la carte : la valeur des
+    unités est rangée dans une grille, puis les copies décalées de la grille sont additionnées (une par
+    cellule de l'empreinte).
+    """
+    width = match.terrain.width
+    height = match.terrain.height
+    left = max([0] + [-dx for dx, dy in footprint.offsets])
+    right = max([0] + [dx for dx, dy in footprint.offsets])
+    top = max([0] + [-dy for dx, dy in footprint.offsets])
+    bottom = max([0] + [dy for dx, dy in footprint.offsets])
+
+    cells = np.zeros((width + left + right, height + top + bottom), dtype=np.int64)
+    for (x, y), unit in match.occupancy.cells.items():
+        if 0 <= x < width and 0 <= y < height:
+            cells[x + left, y + top] = value(unit)
+
+    sums = np.zeros((width, height), dtype=np.int64)
+    for dx, dy in footprint.offsets:
+        sums += cells[left + dx:left + dx + width, top + dy:top + dy + height]
+    return sums
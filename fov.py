@@ -0,0 +1,440 @@
+"""
+Champ de vision (field of view) des unités.
+
+Une cellule est visible depuis une unité si la ligne de Bresenham qui les relie ne passe
+par aucun mur (même règle que l'ancien Game.get_visible_cells).
+
+Les lignes de Bresenham ne dépendent que du décalage (dx, dy) entre l'unité et la cellule.
+Pour un rayon donné, toutes les lignes partant de l'unité sont donc pré-calculées une
+seule fois et rangées dans un arbre : deux lignes qui commencent par les mêmes cellules
+partagent les mêmes noeuds. Le calcul de la vision est alors un seul parcours de cet
+arbre : dès qu'un noeud tombe sur un mur, toutes les cellules cachées derrière lui sont
+ignorées d'un coup, comme dans un shadowcasting, mais avec exactement le même résultat
+que la règle de Bresenham.
+
+Ce module ne dépend pas de pygame.
+"""
+
+import hashlib
+import os
+import struct
+
+from assetpack import read_file
+
+
+
+
+def bresenham_line(x1, y1, x2, y2):
+    """
+    Retourne la liste des cellules traversées par la ligne de Bresenham de (x1, y1) à (x2, y2),
+    extrémités comprises.
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    err = dx - dy
+
+    cells = [(x1, y1)]
+    while (x1, y1) != (x2, y2):
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x1 += sx
+        if e2 < dx:
+            err += dx
+            y1 += sy
+        cells.append((x1, y1))
+    return cells
+
+
+
+
+class RayTree:
+    """
+    Arbre des lignes de Bresenham partant de (0, 0) vers toutes les cellules d'une fenêtre carrée.
+
+    Attributs :
+    ----------
+    - radius : int
+        Portée de la vision (demi-côté de la fenêtre carrée).
+    - offsets : list[tuple[int, int]]
+        Décalage (dx, dy) de la cellule de chaque noeud. Le noeud 0 est l'unité elle-même.
+    - children : list[tuple[int, ...]]
+        Indices des noeuds fils de chaque noeud.
+    - is_target : list[bool]
+        True si le chemin de la racine à ce noeud est la ligne complète vers sa cellule.
+    """
+
+    def __init__(self, radius):
+        self.radius = radius
+        self.offsets = [(0, 0)]
+        children = [{}]
+        self.is_target = [True]
+
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                node = 0
+                for cell in bresenham_line(0, 0, dx, dy)[1:]:
+                    if cell not in children[node]:
+                        children[node][cell] = len(self.offsets)
+                        self.offsets.append(cell)
+                        children.append({})
+                        self.is_target.append(False)
+                    node = children[node][cell]
+                self.is_target[node] = True
+
+        self.children = [tuple(child.values()) for child in children]
+
+
+
+
+_ray_trees = {}
+
+def get_ray_tree(radius):
+    """Retourne l'arbre des lignes pour un rayon donné (construit une seule fois par rayon)."""
+    if radius not in _ray_trees:
+        _ray_trees[radius] = RayTree(radius)
+    return _ray_trees[radius]
+
+
+
+
+def compute_visible_cells(origin_x, origin_y, is_opaque, grid_width, grid_height, radius):
+    """
+    Calcule les cellules visibles depuis (origin_x, origin_y) en un seul parcours.
+
+    Paramètres :
+    -----------
+    - origin_x, origin_y : int
+        Position de l'unité.
+    - is_opaque : callable(x, y) -> bool
+        Retourne True si la cellule bloque la vue (mur).
+    - grid_width, grid_height : int
+        Dimensions de la carte.
+    - radius : int
+        Portée de la vision (fenêtre carrée de (2*radius+1)² cellules).
+
+    Retourne :
+    ---------
+    - set[tuple[int, int]] : les cellules visibles.
+    """
+    tree = get_ray_tree(radius)
+    offsets = tree.offsets
+    children = tree.children
+    is_target = tree.is_target
+
+    visible_cells = set()
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        dx, dy = offsets[node]
+        x = origin_x + dx
+        y = origin_y + dy
+
+        # une cellule hors carte ou un mur cache toute la suite de ses lignes
+        if not (0 <= x < grid_width and 0 <= y < grid_height) or is_opaque(x, y):
+            continue
+
+        if is_target[node]:
+            visible_cells.add((x, y))
+        stack.extend(children[node])
+
+    return visible_cells
+
+
+
+
+def bresenham_visible_cells(origin_x, origin_y, is_opaque, grid_width, grid_height, radius):
+    """
+    Version de référence : une ligne de Bresenham par cellule de la fenêtre.
+    Sert uniquement à vérifier compute_visible_cells (tests/test_fov.py).
+    """
+    visible_cells = set()
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            x, y = origin_x + dx, origin_y + dy
+            if not (0 <= x < grid_width and 0 <= y < grid_height):
+                continue
+            if not any(is_opaque(cx, cy) for cx, cy in bresenham_line(origin_x, origin_y, x, y)):
+                visible_cells.add((x, y))
+    return visible_cells
+
+
+
+
+class VisibilityCache:
+    """
+    Cache des cellules visibles, par position et par révision de la carte.
+
+    La vision ne dépend que de la position de l'unité, de sa portée et des murs. Les
+    résultats sont donc gardés par clé (x, y, portée, révision de la carte) : un nouvel
+    affichage sans déplacement ne refait aucun calcul. Pour chaque équipe, l'union des
+    visions de ses unités est tenue à jour de façon incrémentale (compteur de références
+    par cellule) : seule la vision des unités qui ont bougé est retirée puis ajoutée.
+
+    Attributs :
+    ----------
+    - compute : callable(x, y, radius) -> set
+        Fonction qui calcule réellement la vision (appelée uniquement en cas d'échec du cache).
+    - hits : int
+        Nombre de visions trouvées dans le cache.
+    - misses : int
+        Nombre de visions calculées.
+    - team_reuses : int
+        Nombre de fois où la vision d'une unité dans l'union d'équipe n'a pas eu à changer.
+    """
+
+    def __init__(self, compute):
+        self.compute = compute
+        self.revision = None
+        self.cells_by_key = {}
+        self.teams = {}
+        self.hits = 0
+        self.misses = 0
+        self.team_reuses = 0
+
+
+
+
+    def get(self, x, y, radius, revision):
+        """
+        Retourne les cellules visibles depuis (x, y) (frozenset, à ne pas modifier).
+        Un changement de révision de la carte (murs modifiés) vide le cache.
+        """
+        if revision != self.revision:
+            self.cells_by_key.clear()
+            self.revision = revision
+
+        key = (x, y, radius)
+        cells = self.cells_by_key.get(key)
+        if cells is None:
+            self.misses += 1
+            cells = frozenset(self.compute(x, y, radius))
+            self.cells_by_key[key] = cells
+        else:
+            self.hits += 1
+        return cells
+
+
+
+
+    def team_visible_cells(self, team, units, radius, revision):
+        """
+        Retourne l'union des cellules visibles par les unités d'une équipe.
+
+        Le set retourné est tenu à jour par le cache : il ne doit pas être modifié.
+        """
+        state = self.teams.get(team)
+        if state is None:
+            state = {"units": {}, "counts": {}, "cells": set()}
+            self.teams[team] = state
+        unit_views = state["units"]
+        counts = state["counts"]
+        union = state["cells"]
+
+        present = set()
+        for unit in units:
+            unit_id = id(unit)
+            present.add(unit_id)
+            key = (unit.x, unit.y, radius, revision)
+            old_view = unit_views.get(unit_id)
+            if old_view is not None and old_view[0] == key:
+                self.team_reuses += 1
+                continue
+
+            if old_view is not None:
+                self.remove_view(counts, union, old_view[1])
+            cells = self.get(unit.x, unit.y, radius, revision)
+            self.add_view(counts, union, cells)
+            unit_views[unit_id] = (key, cells)
+
+        # unités mortes ou retirées de l'équipe
+        for unit_id in list(unit_views):
+            if unit_id not in present:
+                self.remove_view(counts, union, unit_views.pop(unit_id)[1])
+
+        return union
+
+
+
+
+    def add_view(self, counts, union, cells):
+        """Ajoute la vision d'une unité à l'union de son équipe."""
+        for cell in cells:
+            count = counts.get(cell, 0)
+            if count == 0:
+                union.add(cell)
+            counts[cell] = count + 1
+
+
+
+
+    def remove_view(self, counts, union, cells):
+        """Retire la vision d'une unité de l'union de son équipe."""
+        for cell in cells:
+            count = counts[cell] - 1
+            if count == 0:
+                del counts[cell]
+                union.discard(cell)
+            else:
+                counts[cell] = count
+
+
+
+
+    def stats(self):
+        """Retourne les compteurs du cache (lisibles pendant une partie)."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "team_reuses": self.team_reuses,
+            "cached_positions": len(self.cells_by_key),
+        }
+
+
+
+
+
+class LineOfSightTable:
+    """
+    Table de visibilité pré-calculée pour une carte.
+
+    Les murs ne changent pas pendant une partie : pour chaque cellule source, l'ensemble des
+    cellules visibles dans la portée est calculé une seule fois et rangé dans un entier
+    utilisé comme bitset (bit y*width + x). La vision d'une unité et les tests de visibilité
+    de l'IA deviennent de simples lectures dans la table.
+
+    La table est enregistrée à côté du CSV de la carte (même nom, extension .los) avec
+    l'empreinte SHA-256 du CSV : elle est réutilisée au lancement suivant si la carte n'a
+    pas changé.
+
+    Attributs :
+    ----------
+    - width, height : int
+        Dimensions de la carte.
+    - radius : int
+        Portée de vision utilisée pour la table.
+    - rows : list[int]
+        Bitset des cellules visibles pour chaque cellule source (index y*width + x).
+    - source_hash : bytes
+        Empreinte SHA-256 du CSV de la carte.
+    """
+
+    FILE_MAGIC = b"FGLOS1"
+
+    def __init__(self, width, height, radius, rows, source_hash):
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.rows = rows
+        self.source_hash = source_hash
+        self.decoded = {}
+
+
+
+
+    @classmethod
+    def build(cls, is_opaque, width, height, radius, source_hash=b""):
+        """Calcule la table pour toutes les cellules de la carte."""
+        rows = []
+        for index in range(width * height):
+            x, y = index % width, index // width
+            bits = 0
+            for cx, cy in compute_visible_cells(x, y, is_opaque, width, height, radius):
+                bits |= 1 << (cy * width + cx)
+            rows.append(bits)
+        return cls(width, height, radius, rows, source_hash)
+
+
+
+
+    def can_see(self, x1, y1, x2, y2):
+        """Retourne True si la cellule (x2, y2) est visible depuis (x1, y1)."""
+        return (self.rows[y1 * self.width + x1] >> (y2 * self.width + x2)) & 1 == 1
+
+
+
+
+    def visible_cells(self, x, y):
+        """Retourne les cellules visibles depuis (x, y) (frozenset décodé une seule fois)."""
+        index = y * self.width + x
+        cells = self.decoded.get(index)
+        if cells is None:
+            decoded = []
+            bits = self.rows[index]
+            while bits:
+                lowest = bits & -bits
+                bit = lowest.bit_length() - 1
+                decoded.append((bit % self.width, bit // self.width))
+                bits ^= lowest
+            cells = frozenset(decoded)
+            self.decoded[index] = cells
+        return cells
+
+
+
+
+    def save(self, path):
+        """Enregistre la table dans un fichier binaire."""
+        row_size = (self.width * self.height + 7) // 8
+        with open(path, mode='wb') as file:
+            file.write(self.FILE_MAGIC)
+            file.write(self.source_hash)
+            file.write(struct.pack("<HHH", self.width, self.height, self.radius))
+            for bits in self.rows:
+                file.write(bits.to_bytes(row_size, "little"))
+
+
+
+
+    @classmethod
+    def load(cls, path):
+        """Charge une table enregistrée par save(). Retourne None si le fichier est invalide."""
+        try:
+            with open(path, mode='rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        header_size = len(cls.FILE_MAGIC) + 32 + 6
+        if len(data) < header_size or not data.startswith(cls.FILE_MAGIC):
+            return None
+        source_hash = data[len(cls.FILE_MAGIC):len(cls.FILE_MAGIC) + 32]
+        width, height, radius = struct.unpack("<HHH", data[header_size - 6:header_size])
+        row_size = (width * height + 7) // 8
+        if len(data) != header_size + width * height * row_size:
+            return None
+
+        rows = []
+        for index in range(width * height):
+            start = header_size + index * row_size
+            rows.append(int.from_bytes(data[start:start + row_size], "little"))
+        return cls(width, height, radius, rows, source_hash)
+
+
+
+
+    @classmethod
+    def for_map(cls, csv_path, is_opaque, width, height, radius):
+        """
+        Retourne la table de la carte csv_path : lue depuis le fichier .los voisin si l'empreinte
+        du CSV, les dimensions et la portée correspondent, sinon recalculée puis enregistrée.
+        """
+        source_hash = hashlib.sha256(read_file(csv_path)).digest()
+
+        table_path = os.path.splitext(csv_path)[0] + ".los"
+        table = cls.load(table_path)
+        if (table is not None and table.source_hash == source_hash
+                and (table.width, table.height, table.radius) == (width, height, radius)):
+            return table
+
+        table = cls.build(is_opaque, width, height, radius, source_hash)
+        try:
+            table.save(table_path)
+        except OSError:
+            # installation en lecture seule : la table reste en mémoire
+            pass
+        return table
@@ -1,4 +1,21 @@
+import copy
+import os
+import sys
+import time
+STARTUP_TIME = time.perf_counter()  # pour mesurer le temps jusqu'au premier écran utilisable
+
 from unit import *
+from assets import assets
+from sounds import sound_bank
+from render import Renderer, FogLayer
+from fov import compute_visible_cells, VisibilityCache, LineOfSightTable
+from grid import TERRAIN_WALL
+from rules import MatchState, CHARACTER_PER_TEAM, VISION_RANGE
+from movement import follow_path
+from influence import InfluenceMap
+import ai
+import mcts
+from thinking import BackgroundThinker
 
 # VERSION
 X = 1
@@ -6,10 +23,30 @@ Y = 5
 Z = 0
 print(f"\n =========== {GAME_TITLE} Version {X}.{Y}.{Z} =========== \n")
 
+# Mesures de démarrage affichées dans la console : python game.py --timings
+SHOW_TIMINGS = "--timings" in sys.argv[1:]
+
+# Écrans du jeu, dans l'ordre où ils s'affichent (ordre de préchargement de leurs ressources)
+SCREENS = ["menu", "map", "characters", "game"]
+
+# Textures des cases de la carte (attributs de Game)
+TILE_TEXTURES = {
+    'GRASS': 'data/tiles/simplegrass.png',
+    'WALL': 'data/tiles/cartoon_wall.png',
+    'MAGMA': 'data/tiles/magma.png',
+    'WATER': 'data/tiles/lilypad.png',
+    'MUD': 'data/tiles/mud.png',
+    'APPLE_TREE': 'data/tiles/appletree2.png',
+    'SNOW': 'data/tiles/snow.jpg',
+    'BUSH': 'data/tiles/bush.png',
+}
+INFO_PANEL_BACKGROUND = "data\splash_images\info_panel_background.png"
+MAP_CARD_SIZE = (180, 140)  # aperçus des cartes dans choose_map
+
 
-class Game:
+class Game(MatchState):
     """
-    Classe pour représenter le jeu.
+    Classe pour représenter le jeu (affichage et commandes d'une MatchState de rules.py).
 
     ...
     Attributs
@@ -35,20 +72,12 @@ class Game:
             La surface de la fenêtre du jeu.
         """
 
+        # units, terrain, game mode et compteur de tours (rules.py)
+        super().__init__()
+
         # screen
         self.screen = screen
 
-        # units
-        self.player_units = []
-        self.player2_units = []
-        self.enemy_units = []
-
-        # game mode
-        self.GameMode = ""
-        
-        # Compteur de tours
-        self.turn_counter = 0  
-
         # maps
         self.maps = {
            "map1": {"name": "Novigrad Meadows", "fichier": "data/maps/map1.csv", "photo": "data/maps/map1.png"},
@@ -57,18 +86,84 @@ class Game:
         # map choice
         self.selected_map_file = []
         # map textures
-        self.grass=[]
-        self.walls = []
-        self.magmas = []
-        self.water = []
-        self.muds = []
-        self.healing=[]
-        self.snow=[]
-        self.bush=[]
+        self.update_terrain_views()
+
+        # couche de terrain pré-calculée (reconstruite si la carte ou CELL_SIZE change)
+        self.terrain_surface = None
+        self.terrain_surface_key = None
+        self.terrain_surface_map = None
+
+        # rafraîchissement par rectangles modifiés
+        self.renderer = Renderer()
+        self.drawn_units = {}  # cellule -> etat de l'unité affichée au dernier draw_map_units
+
+        # cache de vision : à incrémenter map_revision à chaque changement des murs
+        self.map_revision = 0
+        self.visibility = VisibilityCache(self.trace_visible_cells)
+        self.los_table = None  # table de visibilité de la carte chargée
+
+        # brouillard de guerre (une seule surface pour toute la carte)
+        self.fog = FogLayer(GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT)
 
-        # Load background image
-        self.info_panel_background_image = pygame.image.load("data\splash_images\info_panel_background.png").convert()
-        self.info_panel_background_image = pygame.transform.scale(self.info_panel_background_image, (WIDTH, INFO_PANEL_HEIGHT))
+        # décisions de l'IA calculées en arrière-plan pendant le tour ennemi
+        self.thinker = BackgroundThinker()
+
+        # temps jusqu'au premier écran utilisable (secondes), mesuré par Main_menu
+        self.first_frame_time = None
+
+        # chargement en arrière-plan déjà demandé (preload_assets, une seule fois par lancement)
+        self.assets_requested = False
+
+
+
+
+    # Ressources de chaque écran
+    def screen_assets(self, screen):
+        """
+        Retourne les images d'un écran, pour assets.preload.
+
+        Paramètres :
+        -----------
+        - screen : str
+            Un des écrans de SCREENS.
+
+        Retourne :
+        ---------
+        - list[tuple] : les demandes de chargement (assets.image, chemin, taille[, format]).
+        """
+        background = (assets.image, "data/splash_images/pic_avatar.png", (WIDTH, WINDOW_HEIGHT))
+        if screen == "menu":
+            return [(assets.image, "data/splash_images/menu_image.png", (WIDTH, WINDOW_HEIGHT))]
+        if screen == "map":
+            return [background] + [(assets.image, info["photo"], MAP_CARD_SIZE) for info in self.maps.values()]
+        if screen == "characters":
+            return [background] + [(assets.image, unit.texture_path, (CELL_SIZE*4, CELL_SIZE*4))
+                                   for unit in Personnages.values() if unit.texture_path]
+
+        # partie : cases, panneau d'information, unités et compétences
+        requests = [(assets.image, path, (CELL_SIZE, CELL_SIZE)) for path in TILE_TEXTURES.values()]
+        requests.append((assets.image, INFO_PANEL_BACKGROUND, (WIDTH, INFO_PANEL_HEIGHT), "opaque"))
+        for unit in Personnages.values():
+            requests += unit.image_requests()
+        return requests
+
+
+
+
+    # Précharger les ressources de tous les écrans en arrière-plan
+    def preload_assets(self):
+        """
+        Lance le chargement des images et des sons de tous les écrans dans les threads de assets.py,
+        dans l'ordre d'affichage des écrans : le menu est utilisable pendant que la suite se charge.
+        Les parties suivantes (retour au menu) réutilisent ces ressources : rien n'est redemandé.
+        """
+        if self.assets_requested:
+            return
+        self.assets_requested = True
+        pygame.mixer.init()
+        for priority, screen in enumerate(SCREENS):
+            assets.preload(self.screen_assets(screen), priority)
+        sound_bank.preload(SCREENS.index("game"))
 
 
 
@@ -77,38 +172,21 @@ class Game:
     def load_textures_sounds(self):
         # Sound effects
         pygame.mixer.init()
-        self.current_sound = None
         self.sounds = {
-            'footstep': pygame.mixer.Sound('data/map_sound_effects/grass_footstep.wav'),
-            'magma': pygame.mixer.Sound('data/map_sound_effects/fire.wav'),
-            'mud': pygame.mixer.Sound('data/map_sound_effects/mud.wav'),
-            'water': pygame.mixer.Sound('data/map_sound_effects/swimming.mp3'),
-            'healing': pygame.mixer.Sound('data/map_sound_effects/apple.wav'),
-            'snow': pygame.mixer.Sound('data/map_sound_effects/snow.mp3'),
-            'bush': pygame.mixer.Sound('data/map_sound_effects/bush.mp3'),
+            'footstep': 'data/map_sound_effects/grass_footstep.wav',
+            'magma': 'data/map_sound_effects/fire.wav',
+            'mud': 'data/map_sound_effects/mud.wav',
+            'water': 'data/map_sound_effects/swimming.mp3',
+            'healing': 'data/map_sound_effects/apple.wav',
+            'snow': 'data/map_sound_effects/snow.mp3',
+            'bush': 'data/map_sound_effects/bush.mp3',
 
         }
 
         # Map textures
-        # charger les textures de la map
-        self.GRASS=pygame.image.load('data/tiles/simplegrass.png').convert_alpha()
-        self.WALL= pygame.image.load('data/tiles/cartoon_wall.png').convert_alpha()
-        self.MAGMA=pygame.image.load('data/tiles/magma.png').convert_alpha()
-        self.WATER=pygame.image.load('data/tiles/lilypad.png').convert_alpha()
-        self.MUD=pygame.image.load('data/tiles/mud.png').convert_alpha()
-        self.APPLE_TREE=pygame.image.load('data/tiles/appletree2.png').convert_alpha()
-        self.SNOW=pygame.image.load('data/tiles/snow.jpg').convert_alpha()
-        self.BUSH=pygame.image.load('data/tiles/bush.png').convert_alpha()
-       
-        # Redimensionner les textures
-        self.GRASS = pygame.transform.scale(self.GRASS, (CELL_SIZE, CELL_SIZE))
-        self.WALL = pygame.transform.scale(self.WALL, (CELL_SIZE, CELL_SIZE))
-        self.MAGMA = pygame.transform.scale(self.MAGMA, (CELL_SIZE, CELL_SIZE))
-        self.WATER = pygame.transform.scale(self.WATER, (CELL_SIZE, CELL_SIZE))
-        self.MUD = pygame.transform.scale(self.MUD, (CELL_SIZE, CELL_SIZE))
-        self.APPLE_TREE = pygame.transform.scale(self.APPLE_TREE, (CELL_SIZE, CELL_SIZE))
-        self.SNOW=pygame.transform.scale(self.SNOW, (CELL_SIZE, CELL_SIZE))
-        self.BUSH=pygame.transform.scale(self.BUSH, (CELL_SIZE, CELL_SIZE))
+        # charger les textures de la map, redimensionnées à la taille des cellules
+        for name, path in TILE_TEXTURES.items():
+            setattr(self, name, assets.image(path, (CELL_SIZE, CELL_SIZE)))
         
 
 
@@ -121,7 +199,7 @@ class Game:
 
        # Dessiner le bouton
        pygame.draw.rect(self.screen, WHITE, back_button_rect)  
-       back_button_font = pygame.font.Font(None, 40)
+       back_button_font = assets.font(None, 40)
        back_button_text = back_button_font.render("Retour", True, BLACK ) 
        self.screen.blit(back_button_text, (back_button_rect.centerx - back_button_text.get_width() // 2, back_button_rect.centery - back_button_text.get_height() // 2))
 
@@ -147,104 +225,121 @@ class Game:
         
         """
 
-        # Charger la map du csv
-        map = []
-        with open(os.path.join(filename), mode='r') as data: # mode = 'r' :read 
-            data = csv.reader(data, delimiter=',') # une autre variable s'appelle 'data' qui prend data comme sa fonction / csv.reader : est utilisée pour lire des fichiers au format CSV (Comma-Separated Values, ou valeurs séparées par des virgules) et convertir leurs contenus en lignes faciles à manipuler.
-            for row in data:
-                map.append(list(row))
-        
-        for y, row in enumerate(map):
-            for x, cell in enumerate(row):
-                if cell == '0':  # Si la valeur est '0', c'est un type de terrain
-                    self.grass.append((x, y))
-                if cell == '1':  # Si la valeur est '1', c'est un mur
-                    self.walls.append((x, y))
-                if cell == '2':  # Si la valeur est '2', c'est un magma
-                    self.magmas.append((x, y))
-                if cell == '3':  # Si la valeur est '3', c'est un lilypad
-                    self.water.append((x, y))
-                if cell == '4':  # Si la valeur est '4', c'est un mud
-                    self.muds.append((x, y))
-                if cell == '5':  # Si la valeur est '5', c'est une case healing
-                    self.healing.append((x, y))
-                if cell == '6':   # Si la valeur est '6', c'est un type de terrain 
-                    self.snow.append((x,y))
-                if cell == '7':   # Si la valeur est '7', c'est un buisson
-                    self.bush.append((x,y))
-                
+        # Charger la map du csv dans la grille de terrain (un octet par cellule, voir grid.py)
+        self.load_terrain(os.path.join(filename))
+        self.update_terrain_views()
+
+        # Les visions calculées sur l'ancienne carte ne sont plus valables
+        self.map_revision += 1
+
+        # Table de visibilité de la carte (relue depuis le disque si le CSV n'a pas changé)
+        self.los_table = LineOfSightTable.for_map(filename, self.terrain.is_wall,
+                                                  GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT, VISION_RANGE)
+
+        # Pré-calculer la couche de terrain de la nouvelle carte
+        self.terrain_surface_map = filename
+        self.build_terrain_surface()
+
+
+
+
+    # listes de coordonnées par type de terrain
+    def update_terrain_views(self):
+        """
+        Met à jour les listes de coordonnées de chaque type de terrain à partir de la grille.
+        Ces listes ne servent qu'à l'affichage : les tests de terrain passent par self.terrain.terrain_at(x, y).
+        """
+        self.grass = self.terrain.cells(TERRAIN_GRASS)
+        self.walls = self.terrain.cells(TERRAIN_WALL)
+        self.magmas = self.terrain.cells(TERRAIN_MAGMA)
+        self.water = self.terrain.cells(TERRAIN_WATER)
+        self.muds = self.terrain.cells(TERRAIN_MUD)
+        self.healing = self.terrain.cells(TERRAIN_HEALING)
+        self.snow = self.terrain.cells(TERRAIN_SNOW)
+        self.bush = self.terrain.cells(TERRAIN_BUSH)
+
 
 
 
-    # verifie si c'est un mur
-    def is_wall(self, x, y):
+    # couche de terrain statique
+    def build_terrain_surface(self):
         """
-        Vérifie si une cellule est un mur.
+        Dessine toutes les tuiles de la carte une seule fois dans une surface en cache.
+        La surface n'est reconstruite que si la carte ou CELL_SIZE a changé.
         """
-        return (x, y) in self.walls
+        key = (self.terrain_surface_map, CELL_SIZE)
+        if self.terrain_surface is not None and self.terrain_surface_key == key:
+            return
+
+        surface = pygame.Surface((GRID_SIZE_WIDTH * CELL_SIZE, GRID_SIZE_HEIGHT * CELL_SIZE)).convert()
+        surface.fill(BLACK)
+
+        # Même ordre d'affichage que les listes de terrain
+        layers = [
+            (self.grass, self.GRASS),
+            (self.walls, self.WALL),
+            (self.magmas, self.MAGMA),
+            (self.water, self.WATER),
+            (self.muds, self.MUD),
+            (self.healing, self.APPLE_TREE),
+            (self.snow, self.SNOW),
+            (self.bush, self.BUSH),
+        ]
+        for cells, texture in layers:
+            for x, y in cells:
+                surface.blit(texture, (x * CELL_SIZE, y * CELL_SIZE))
+
+        self.terrain_surface = surface
+        self.terrain_surface_key = key
 
 
 
 
     # determiner les blocks visibles :
-    def get_visible_cells(self, unit):
+    def get_visible_cells(self, unit, max_range=VISION_RANGE):
+        """
+        Retourne un set de tuples (x, y) representant les cellules visibles par l'unité.
+        Le résultat vient du cache de vision tant que l'unité n'a pas bougé et que les murs n'ont pas changé.
+        """
+        return self.visibility.get(unit.x, unit.y, max_range, self.map_revision)
 
-        def est_visible(x1, y1, x2, y2):
-            # tester si le aucun obstacle est entre le block 2 et 1 grace a l'algorithme de Bresenham
-            dx = abs(x2 - x1)
-            dy = abs(y2 - y1)
-            sx = 1 if x1 < x2 else -1
-            sy = 1 if y1 < y2 else -1
-            err = dx - dy
 
-            while True:
-                # If the current cell is a wall, the line of sight is blocked
-                if (x1, y1) in self.walls:
-                    return False
-
-                # If we've reached the target cell, the line of sight is clear
-                if (x1, y1) == (x2, y2):
-                    return True
-
-                e2 = 2 * err
-                if e2 > -dy:
-                    err -= dy
-                    x1 += sx
-                if e2 < dx:
-                    err += dx
-                    y1 += sy
-
-        # retourne un set de tuples representant les cellules visibles (x, y)
-        # we use set() to avoid overlap, cheking if a cell is in the set is also very fast (complexity of O(1))
-        # cells must store immutable objects, thats why we chose to use tuples for a cell coordinate
 
-        
-        max_range = 6
-        visible_cells = set()
-        
-        for dx in range(-max_range, max_range + 1):
-            for dy in range(-max_range, max_range + 1):
-                x, y = unit.x + dx, unit.y + dy
 
-                # Skip cells outside the grid
-                if not (0 <= x < GRID_SIZE_WIDTH and 0 <= y < GRID_SIZE_HEIGHT):
-                    continue
+    def trace_visible_cells(self, x, y, max_range):
+        """
+        Calcule les cellules visibles depuis (x, y) : une cellule est visible si la ligne de Bresenham
+        entre elle et l'unité ne traverse aucun mur (voir fov.py : toutes les lignes en une seule passe).
+        Avec la portée par défaut, le résultat est lu dans la table de visibilité de la carte.
+        """
+        if self.los_table is not None and max_range == self.los_table.radius:
+            return self.los_table.visible_cells(x, y)
+
+        return compute_visible_cells(x, y, self.terrain.is_wall,
+                                     GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT, max_range)
 
-                # tester si aucun obstacle est entre le block et l'unité
-                if est_visible(unit.x, unit.y, x, y):
-                    visible_cells.add((x, y))
 
-        return visible_cells
+
+
+    def can_see(self, x1, y1, x2, y2):
+        """
+        Vérifie si la cellule (x2, y2) est visible depuis (x1, y1) avec la portée de vision par défaut.
+        """
+        if abs(x2 - x1) > VISION_RANGE or abs(y2 - y1) > VISION_RANGE:
+            return False
+        return self.los_table.can_see(x1, y1, x2, y2)
 
 
 
 
     # ecran de choix de la carte
     def choose_map(self):
+
+        # ressources de cet écran en premier si elles ne sont pas encore chargées
+        assets.preload(self.screen_assets("map"), priority=-1)
     
         # Charger l'image de fond
-        splash_menu_image_1 = pygame.image.load("data/splash_images/pic_avatar.png") 
-        splash_menu_image_1 = pygame.transform.scale(splash_menu_image_1, (WIDTH,WINDOW_HEIGHT))
+        splash_menu_image_1 = assets.image("data/splash_images/pic_avatar.png", (WIDTH,WINDOW_HEIGHT))
         
         # affiche l'image de fond
         self.screen.blit(splash_menu_image_1, (0,0))
@@ -256,27 +351,23 @@ class Game:
         # rafraichir l'écran
         pygame.display.flip()
 
-        # Charger les cartes 
+        # Charger les cartes, redimensionnées pour qu'elles tiennent dans la fenêtre
+        card_width, card_height = MAP_CARD_SIZE
         map_previews = {
             name: {
-             "image": pygame.image.load(info["photo"]).convert_alpha(),
+             "image": assets.image(info["photo"], (card_width, card_height)),
              "fichier": info["fichier"],
         }
         for name, info in self.maps.items()
         }
 
-        # Redimensionner les map pour qu'elles tiennent dans la fenêtre
-        card_width, card_height = 180, 140
         positions = {
            "map1": pygame.Rect(WIDTH // 3 - card_width // 2, HEIGHT // 2 - card_height // 2, card_width, card_height),
            "map2": pygame.Rect(2 * WIDTH // 3 - card_width // 2, HEIGHT // 2 - card_height // 2, card_width, card_height),
         }
 
-        for name, info in map_previews.items():
-            map_previews[name]["image"] = pygame.transform.scale(info["image"], (card_width, card_height))
-
         # Texte pour le titre
-        title_font = pygame.font.Font(None, 60)
+        title_font = assets.font(None, 60)
         title_text = title_font.render("Choose Your Map:", True, WHITE)
 
         # boucle pour le choix de la carte
@@ -292,7 +383,7 @@ class Game:
                 # Ajouter une bordure blanche autour
                 pygame.draw.rect(self.screen, WHITE, rect, 3)
                 # Dessiner le nom de la carte
-                map_name_font = pygame.font.Font(None, 40)
+                map_name_font = assets.font(None, 40)
                 map_name_text = map_name_font.render(self.maps[name]["name"], True, WHITE)
                 self.screen.blit( map_name_text,(rect.centerx - map_name_text.get_width() // 2, rect.bottom + 10))
                
@@ -334,53 +425,9 @@ class Game:
         rect_to_fill = pygame.Rect(0, 0, WIDTH, HEIGHT)
         self.screen.fill(BLACK, rect_to_fill)
 
-        # Affiche les blocs : "GRASS"
-        for grass in self.grass:    
-            x = grass[0] * CELL_SIZE
-            y = grass[1] * CELL_SIZE
-            self.screen.blit(self.GRASS, (x, y))
-
-        # Affiche les blocs : "WALL"
-        for wall in self.walls:
-            x = wall[0] * CELL_SIZE
-            y = wall[1] * CELL_SIZE
-            self.screen.blit(self.WALL, (x, y))
-
-        # Affiche les blocs : "MAGMA"
-        for magma in self.magmas:
-            x = magma[0] * CELL_SIZE
-            y = magma[1] * CELL_SIZE
-            self.screen.blit(self.MAGMA, (x, y))
-
-        # Affiche les blocs : "LILYPAD"
-        for water in self.water:
-            x = water[0] * CELL_SIZE
-            y = water[1] * CELL_SIZE
-            self.screen.blit(self.WATER, (x, y))
-
-        # Affiche les blocs : "MUD"
-        for mud in self.muds:
-            x = mud[0] * CELL_SIZE
-            y = mud[1] * CELL_SIZE
-            self.screen.blit(self.MUD, (x, y))
-
-        # Affiche les blocs : "HEALING"
-        for healing in self.healing:
-            x = healing[0] * CELL_SIZE
-            y = healing[1] * CELL_SIZE
-            self.screen.blit(self.APPLE_TREE, (x, y))        
-
-        # Affiche les blocs : "SNOW"
-        for grasse_ocr in self.snow:
-            x = grasse_ocr[0] * CELL_SIZE
-            y = grasse_ocr[1] * CELL_SIZE
-            self.screen.blit(self.SNOW, (x, y))     
-
-        # Affiche les blocs : "BUSH"
-        for bush in self.bush:
-            x = bush[0] * CELL_SIZE
-            y = bush[1] * CELL_SIZE
-            self.screen.blit(self.BUSH, (x, y))     
+        # Affiche la couche de terrain pré-calculée en un seul blit
+        self.build_terrain_surface()
+        self.screen.blit(self.terrain_surface, (0, 0))
 
         # Affiche les contours de la grille (optionnel si vous voulez une bordure blanche)
         if ShowGrille == True :
@@ -390,7 +437,6 @@ class Game:
                     pygame.draw.rect(self.screen, WHITE, rect, 1)
 
         # Calculer les cellules visibles pour les unités de l'équipe
-        all_visible_cells = set()
         if team == "player 1":
             units = self.player_units
         elif team == "player 2":
@@ -398,27 +444,30 @@ class Game:
         elif team == "enemy":
             units = self.enemy_units
 
-        for unit in units:
-            all_visible_cells.update(self.get_visible_cells(unit))
+        all_visible_cells = self.visibility.team_visible_cells(team, units, VISION_RANGE, self.map_revision)
 
         # Afficher les unités
+        drawn_units = {}
         for unit in self.player_units + self.enemy_units + self.player2_units:
-            if (((unit.x, unit.y) in all_visible_cells) and ((unit.x, unit.y) not in self.bush)) or unit.team == team:
+            if (((unit.x, unit.y) in all_visible_cells) and (self.terrain.terrain_at(unit.x, unit.y) != TERRAIN_BUSH)) or unit.team == team:
                 unit.draw(self.screen)
+                drawn_units[(unit.x, unit.y)] = (id(unit), unit.team, unit.health, unit.is_selected)
+
+        # Ajouter un overlay gris pour les zones non visibles :
+        # seules les cellules dont la visibilité a changé sont repeintes, puis un seul blit
+        changed_cells = self.fog.update(all_visible_cells)
+        self.fog.draw(self.screen)
 
-        # Ajouter un overlay gris pour les zones non visibles
-        for x in range(GRID_SIZE_WIDTH):
-            for y in range(GRID_SIZE_HEIGHT):
-                if (x, y) not in all_visible_cells:
-                    overlay_rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    # Dessiner une couleur grise transparente (alpha blending)
-                    s = pygame.Surface((CELL_SIZE, CELL_SIZE))  # Surface temporaire
-                    s.set_alpha(100)  # Niveau de transparence (0-255)
-                    s.fill((50, 50, 50))  # Couleur grise
-                    self.screen.blit(s, overlay_rect.topleft)
+        # Marquer les cellules qui ont changé depuis le dernier affichage :
+        # anciennes et nouvelles cellules des unités, et cellules dont le brouillard a changé
+        for cell in drawn_units.keys() | self.drawn_units.keys():
+            if drawn_units.get(cell) != self.drawn_units.get(cell):
+                changed_cells.add(cell)
+        self.renderer.mark_cells(changed_cells)
+        self.drawn_units = drawn_units
 
         # Rafraîchit l'écran
-        pygame.display.flip()
+        self.renderer.present()
 
 
 
@@ -432,23 +481,25 @@ class Game:
         """
         
         # Charger l'image de fond
-        splash_menu_image = pygame.image.load("data/splash_images/menu_image.png")
-        splash_menu_image = pygame.transform.scale(splash_menu_image, (WIDTH,WINDOW_HEIGHT))
+        splash_menu_image = assets.image("data/splash_images/menu_image.png", (WIDTH,WINDOW_HEIGHT))
 
         # Charger la musique de fond
-        pygame.mixer.music.load("data/musics/Dark Souls - A moment's peace.mp3")
+        pygame.mixer.music.load(assets.source("data/musics/Dark Souls - A moment's peace.mp3"))
         pygame.mixer.music.set_volume(0.4)
         pygame.mixer.music.play(-1) # joue en boucle
 
         # Texte du titre
-        title_font = pygame.font.Font(None, 72)
+        title_font = assets.font(None, 72)
         title_text = title_font.render(GameName, True, WHITE)
 
         # Buttons 
-        button_font = pygame.font.Font(None, 36)
+        button_font = assets.font(None, 36)
+        progress_font = assets.font(None, 24)
         buttons = {
-            "Solo Deathmatch" : {"rect" : pygame.Rect(WIDTH//3, HEIGHT//2, WIDTH//3, 50), "mode": "PvE"},
-            "Multiplayer Deathmatch" : {"rect" : pygame.Rect(WIDTH//3, HEIGHT//2+70, WIDTH//3, 50), "mode" : "PvP"}
+            "Solo Deathmatch" : {"rect" : pygame.Rect(WIDTH//3, HEIGHT//2, WIDTH//3, 50), "mode": "PvE", "difficulty": "normal"},
+            "Solo Deathmatch (Hard)" : {"rect" : pygame.Rect(WIDTH//3, HEIGHT//2+70, WIDTH//3, 50), "mode": "PvE", "difficulty": "hard"},
+            "Solo Deathmatch (Expert)" : {"rect" : pygame.Rect(WIDTH//3, HEIGHT//2+140, WIDTH//3, 50), "mode": "PvE", "difficulty": "expert"},
+            "Multiplayer Deathmatch" : {"rect" : pygame.Rect(WIDTH//3, HEIGHT//2+210, WIDTH//3, 50), "mode" : "PvP"}
         }
 
         while True :
@@ -464,10 +515,25 @@ class Game:
                 button_text = button_font.render(text, True, BLACK)
                 self.screen.blit(button_text, (info["rect"].x + (info["rect"].width-button_text.get_width())//2,
                                                info["rect"].y + (info["rect"].height-button_text.get_height())//2))
+
+            # progression du chargement des autres écrans
+            progress = assets.progress()
+            if progress < 1.0:
+                progress_rect = pygame.Rect(WIDTH//3, WINDOW_HEIGHT - 40, WIDTH//3, 8)
+                pygame.draw.rect(self.screen, GREY, progress_rect)
+                pygame.draw.rect(self.screen, WHITE, (progress_rect.x, progress_rect.y, int(progress * progress_rect.width), progress_rect.height))
+                progress_text = progress_font.render(f"Loading... {int(progress * 100)}%", True, WHITE)
+                self.screen.blit(progress_text, (progress_rect.x, progress_rect.y - 20))
                 
             # rafraichir l'écran
             pygame.display.flip()
 
+            # temps jusqu'au premier écran utilisable (mesuré une seule fois)
+            if self.first_frame_time is None:
+                self.first_frame_time = time.perf_counter() - STARTUP_TIME
+                if SHOW_TIMINGS:
+                    print(f"Premier écran interactif après {self.first_frame_time * 1000:.0f} ms.")
+
             # si la souris a été cliqué
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -479,6 +545,7 @@ class Game:
                         if info["rect"].collidepoint(mouse_pos):
                             # pygame.mixer.music.stop() # Arréte la musique de fond
                             self.GameMode = info["mode"]
+                            self.difficulty = info.get("difficulty", "normal")
                             return info["mode"]
 
               
@@ -493,9 +560,11 @@ class Game:
             append chosen list 
         """
 
+        # ressources de cet écran en premier si elles ne sont pas encore chargées
+        assets.preload(self.screen_assets("characters"), priority=-1)
+
         # Charger l'image de fond
-        splash_menu_image_1 = pygame.image.load("data/splash_images/pic_avatar.png") 
-        splash_menu_image_1 = pygame.transform.scale(splash_menu_image_1, (WIDTH,WINDOW_HEIGHT))
+        splash_menu_image_1 = assets.image("data/splash_images/pic_avatar.png", (WIDTH,WINDOW_HEIGHT))
 
         # affiche l'image de fond
         self.screen.blit(splash_menu_image_1, (0,0))
@@ -511,7 +580,7 @@ class Game:
         while len(selected_units) < NumberOfCharacters:
 
             # Afficher l'instruction de choix :
-            font = pygame.font.Font(None, 60)
+            font = assets.font(None, 60)
             text = font.render(f"{player} : Choose your characters ({len(selected_units) + 1}/{NumberOfCharacters})", True, ANOTHER_GREY)
             self.screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//4))
 
@@ -534,29 +603,8 @@ class Game:
                             selected_units.append(copy.copy(Personnages[key]))
 
         
-        if player == "player 1":
-            self.player_units = selected_units
-            # position initiale des personnages :
-            for i in range(len(self.player_units)):
-                self.player_units[i].team = "player 1"
-                self.player_units[i].x = 0
-                self.player_units[i].y = 2 + i
-
-        elif player == "player 2":
-            self.player2_units = selected_units
-            # position initiale des personnages :
-            for i in range(len(self.player2_units)):
-                self.player2_units[i].team = "player 2"
-                self.player2_units[i].x = GRID_SIZE_WIDTH - 1
-                self.player2_units[i].y = GRID_SIZE_HEIGHT - 3 - i
-
-        elif player == "enemy" :
-            self.enemy_units = selected_units
-            # position initiale des personnages :
-            for i in range(len(self.enemy_units)):
-                self.enemy_units[i].team = "enemy"
-                self.enemy_units[i].x = GRID_SIZE_WIDTH - 1
-                self.enemy_units[i].y = GRID_SIZE_HEIGHT - 3 - i
+        # position initiale des personnages (et index d'occupation)
+        self.place_team(player, selected_units)
 
         return selected_units
 
@@ -565,7 +613,7 @@ class Game:
 
     def play_game_music(self):
         # Lancer la musique de jeu
-        pygame.mixer.music.load("data/musics/The Witcher 3 - The Hunt Begins.mp3")
+        pygame.mixer.music.load(assets.source("data/musics/The Witcher 3 - The Hunt Begins.mp3"))
         pygame.mixer.music.set_volume(0.1)
         pygame.mixer.music.play(-1) # joue en boucle
         return                  
@@ -576,7 +624,7 @@ class Game:
     def draw_info_panel(self, team=None, unit=None, mode=None):
 
         # afficher l'image de fond 
-        self.screen.blit(self.info_panel_background_image, (0, HEIGHT))
+        self.screen.blit(assets.image(INFO_PANEL_BACKGROUND, (WIDTH, INFO_PANEL_HEIGHT), mode="opaque"), (0, HEIGHT))
 
         # initialiser le rectangle de la bordure
         info_panel_rect = pygame.Rect(0, HEIGHT, WIDTH, INFO_PANEL_HEIGHT)
@@ -595,7 +643,7 @@ class Game:
         pygame.draw.rect(self.screen, border_color, info_panel_rect, 4)
 
         # Font for text
-        font = pygame.font.Font(None, 20)  
+        font = assets.font(None, 20)  
 
         # Draw columns
         column_width = WIDTH // 3
@@ -610,7 +658,7 @@ class Game:
                 profile_picture__height = 60
 
                 picture_rect = pygame.Rect(profile_picture_x, profile_picture_y, profile_picture_width, profile_picture__height)
-                self.screen.blit(pygame.transform.scale(unit.raw_texture, (profile_picture_width, profile_picture__height)), (profile_picture_x, profile_picture_y))
+                self.screen.blit(assets.image(unit.texture_path, (profile_picture_width, profile_picture__height)), (profile_picture_x, profile_picture_y))
                 pygame.draw.rect(self.screen, border_color, picture_rect, 2)
 
             # Display Name Below Picture
@@ -648,20 +696,19 @@ class Game:
             for i, skill in enumerate(unit.skills[:3]):
                 
                 # Skill Icon Rectangle
-                skill_picture_width = 50
+                skill_picture_width = SKILL_ICON_SIZE
                 skill_x = column_width + 60 + (i * (skill_picture_width + 60))  # Position squares with spacing
                 skill_y = HEIGHT + 20
                 skill_rect = pygame.Rect(skill_x, skill_y, skill_picture_width, skill_picture_width)
 
                 # Display Skill Icon
                 if skill.skill_logo:
-                    skill_icon = pygame.transform.scale(skill.skill_logo, (skill_picture_width, skill_picture_width))
-                    self.screen.blit(skill_icon, (skill_x, skill_y))
+                    self.screen.blit(skill.skill_logo, (skill_x, skill_y))
 
                 pygame.draw.rect(self.screen, WHITE, skill_rect, 2)  # Border for skill icon
 
                 # Display Skill Number (1, 2, 3)
-                number_font = pygame.font.Font(None, 20)
+                number_font = assets.font(None, 20)
                 number_text = number_font.render(str(i + 1), True, WHITE)
                 self.screen.blit(number_text, (skill_x + 5, skill_y + 5))
 
@@ -707,12 +754,10 @@ class Game:
         pygame.draw.line(self.screen, border_color, (column_width, HEIGHT), (column_width, HEIGHT + INFO_PANEL_HEIGHT), 2)
         pygame.draw.line(self.screen, border_color, (2 * column_width, HEIGHT), (2 * column_width, HEIGHT + INFO_PANEL_HEIGHT), 2)
 
+        # Le panneau sera envoyé à l'écran au prochain present()
+        self.renderer.mark(info_panel_rect)
+
 
-    def reset_endurance(self):
-        """Réinitialise l'endurance de toutes les unités (alliées et ennemies)."""
-        for unit in self.player_units + self.player2_units + self.enemy_units:
-            unit.endurence_max = unit.endurence_max_init  # Réinitialisation à la valeur initiale
-        print("Endurance réinitialisée pour tous les personnages !")
 
 
     # Tour des joueurs 1 et 2
@@ -731,7 +776,7 @@ class Game:
                 selected_unit.endurence = selected_unit.endurence_max
                 self.draw_map_units(team)
                 self.draw_info_panel(team, selected_unit, "moving")
-                pygame.display.flip() 
+                self.renderer.present()
                 while not has_acted:
                     
                     # Important: cette boucle permet de gérer les événements Pygame
@@ -767,13 +812,13 @@ class Game:
                             selected_unit.move(dx, dy, self)
                             self.draw_map_units(team)
                             self.draw_info_panel(team, selected_unit, "moving")
-                            pygame.display.flip()
+                            self.renderer.present()
 
                             # Use skills : skill 1, 2 or 3
                             if event.key == pygame.K_1:
                                 if len(selected_unit.skills) > 0:
                                     self.draw_info_panel(team, selected_unit, "skill 1")
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                     skill = selected_unit.skills[0]
                                     skill.use_skill(selected_unit, self)
                                     has_acted = True
@@ -784,26 +829,26 @@ class Game:
                             elif event.key == pygame.K_2:
                                 if len(selected_unit.skills) > 1:
                                     self.draw_info_panel(team, selected_unit, "skill 2")
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                     skill = selected_unit.skills[1]
                                     skill.use_skill(selected_unit, self)
                                     has_acted = True
                                     selected_unit.is_selected = False
                                     self.draw_map_units(team)
-                                    pygame.display.flip()
+                                    self.renderer.present()
 
                                 else:
                                     print(f"{selected_unit.name} has no skill 2.")
                             elif event.key == pygame.K_3:
                                 if len(selected_unit.skills) > 2:
                                     self.draw_info_panel(team, selected_unit, "skill 3")
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                     skill = selected_unit.skills[2]
                                     skill.use_skill(selected_unit, self)
                                     has_acted = True
                                     selected_unit.is_selected = False
                                     self.draw_map_units(team)
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                 else:
                                     print(f"{selected_unit.name} has no skill 3.")
 
@@ -813,22 +858,15 @@ class Game:
                                     if abs(selected_unit.x - enemy.x) <= 1 and abs(selected_unit.y - enemy.y) <= 1:
                                         selected_unit.attack(enemy)
                                         if enemy.health <= 0:
-                                            self.enemy_units.remove(enemy)
+                                            self.remove_unit(enemy)
 
                                 has_acted = True
                                 selected_unit.is_selected = False
 
                 # Tester si la game est finie
-                if self.GameMode == "PvE" :
-                    if len(self.enemy_units) == 0 :
-                        self.game_end("enemy")
-                    elif len(self.player_units) == 0 :
-                        self.game_end("player 1")
-                elif self.GameMode == "PvP" :
-                    if len(self.player2_units) == 0 :
-                        self.game_end("player 2")
-                    elif len(self.player_units) == 0 :
-                        self.game_end("player 1")
+                loser = self.loser()
+                if loser:
+                    self.game_end(loser)
 
         elif team == "player 2" :
             for selected_unit in self.player2_units:
@@ -839,7 +877,7 @@ class Game:
                 selected_unit.endurence = selected_unit.endurence_max
                 self.draw_map_units(team)
                 self.draw_info_panel(team, selected_unit, "moving")
-                pygame.display.flip()
+                self.renderer.present()
 
                 while not has_acted:
                     
@@ -876,43 +914,43 @@ class Game:
                             selected_unit.move(dx, dy, self)
                             self.draw_map_units(team)
                             self.draw_info_panel(team, selected_unit, "moving")
-                            pygame.display.flip()
+                            self.renderer.present()
 
                             # Use skills : skill 1, 2 or 3
                             if event.key == pygame.K_1:
                                 if len(selected_unit.skills) > 0:
                                     self.draw_info_panel(team, selected_unit, "skill 1")
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                     skill = selected_unit.skills[0]
                                     skill.use_skill(selected_unit, self)
                                     has_acted = True
                                     selected_unit.is_selected = False
                                     self.draw_map_units(team)
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                 else:
                                     print(f"{selected_unit.name} has no skill 1.")
                             elif event.key == pygame.K_2:
                                 if len(selected_unit.skills) > 1:
                                     self.draw_info_panel(team, selected_unit, "skill 2")
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                     skill = selected_unit.skills[1]
                                     skill.use_skill(selected_unit, self)
                                     has_acted = True
                                     selected_unit.is_selected = False
                                     self.draw_map_units(team)
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                 else:
                                     print(f"{selected_unit.name} has no skill 2.")
                             elif event.key == pygame.K_3:
                                 if len(selected_unit.skills) > 2:
                                     self.draw_info_panel(team, selected_unit, "skill 3")
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                     skill = selected_unit.skills[2]
                                     skill.use_skill(selected_unit, self)
                                     has_acted = True
                                     selected_unit.is_selected = False
                                     self.draw_map_units(team)
-                                    pygame.display.flip()
+                                    self.renderer.present()
                                 else:
                                     print(f"{selected_unit.name} has no skill 3.")
 
@@ -922,66 +960,68 @@ class Game:
                                     if abs(selected_unit.x - enemy.x) <= 1 and abs(selected_unit.y - enemy.y) <= 1:
                                         selected_unit.attack(enemy)
                                         if enemy.health <= 0:
-                                            self.enemy_units.remove(enemy)
+                                            self.remove_unit(enemy)
 
                                 has_acted = True
                                 selected_unit.is_selected = False
 
                 # Tester si la game est finie
-                if self.GameMode == "PvE" :
-                    if len(self.enemy_units) == 0 :
-                        self.game_end("enemy")
-                    elif len(self.player_units) == 0 :
-                        self.game_end("player 1")
-                elif self.GameMode == "PvP" :
-                    if len(self.player2_units) == 0 :
-                        self.game_end("player 2")
-                    elif len(self.player_units) == 0 :
-                        self.game_end("player 1")
+                loser = self.loser()
+                if loser:
+                    self.game_end(loser)
 
         # Incrémenter le compteur de tours **à la fin du tour**
-        self.turn_counter += 1
-        print(f"Tour {self.turn_counter} terminé.")
-
-        # Réinitialisation de l’endurance après 3 tours
-        if self.turn_counter >= 5:
-            self.reset_endurance()
-            self.turn_counter = 0  # Réinitialiser le compteur après réinitialisation
+        # (l'endurance est réinitialisée tous les ENDURANCE_RESET_TURNS tours)
+        print(f"Tour {self.turn_counter + 1} terminé.")
+        if self.end_turn():
+            print("Endurance réinitialisée pour tous les personnages !")
         
 
 
 
     # IA de enemy
     def enemy_AI_turn(self):
+        # carte d'influence construite une fois pour tout le tour de enemy
+        influence = InfluenceMap(self, "enemy")
+
+        # la décision de chaque ennemi est calculée en arrière-plan (thinking.py) pendant les attentes
+        # et les animations : la première dès la fin du tour du joueur, la suivante dès que l'ennemi a joué
+        enemies = list(self.enemy_units)
+        decision = self.thinker.submit(self, enemies[0], self.difficulty, influence) if enemies else None
+        planned = enemies[0] if enemies else None  # l'unité dont la décision est en cours de calcul
+
         # tour de chaque unité de enemy
-        for enemy in self.enemy_units:
+        for index, enemy in enumerate(enemies):
+            # une unité tuée plus tôt dans le tour (Purple Chaos touche aussi les alliés) ne joue plus
+            if enemy not in self.enemy_units:
+                continue
+            if planned is not enemy:
+                decision = self.thinker.submit(self, enemy, self.difficulty, influence)
+                planned = enemy
+
             # Tester si la game est finie
-            if self.GameMode == "PvE" :
-                if len(self.enemy_units) == 0 :
-                    self.game_end("enemy")
-                elif len(self.player_units) == 0 :
-                    self.game_end("player 1")
-            elif self.GameMode == "PvP" :
-                if len(self.player2_units) == 0 :
-                    self.game_end("player 2")
-                elif len(self.player_units) == 0 :
-                    self.game_end("player 1")
+            loser = self.loser()
+            if loser:
+                self.game_end(loser)
 
             # attente pour rendre le tour des ennemies plus realistique
             pygame.time.delay(500)
 
-            # Movement decision
-            best_move = self.AI_find_best_move(enemy)
-            if best_move:
-                enemy.move(best_move[0], best_move[1], self)
+            # Movement and skill decision (recherche avec budget de temps en difficulté "hard" et "expert")
+            # la compétence a été choisie pour la position d'arrivée : déplacement d'abord (thinking.decide)
+            path, skill_index = decision.result()
+            best_skill = enemy.skills[skill_index] if skill_index is not None else None
+
+            # Movement
+            if path:
+                follow_path(self, enemy, path)
 
             # Skill usage
-            best_skill = self.AI_evaluate_skills(enemy)
             if best_skill:
                 best_skill.use_skill(enemy, self)
 
             # Attack decision if no skill is ai compatible
-            target = self.AI_find_best_target(enemy)
+            target = ai.find_best_target(self, enemy)
             if target:
                 enemy.attack(target)
 
@@ -989,132 +1029,28 @@ class Game:
             if len(self.player_units) == 0 :
                 self.game_end("player 1")
 
+            # décision de l'ennemi suivant encore en vie, calculée pendant l'affichage et les attentes
+            following = next((other for other in enemies[index + 1:] if other in self.enemy_units), None)
+            if following is not None:
+                decision = self.thinker.submit(self, following, self.difficulty, influence)
+                planned = following
+
             # Met à jour le panneau d'information avec les détails de l'ennemi
             self.draw_map_units("enemy")
             self.draw_info_panel("enemy", enemy)
-            pygame.display.flip()
+            self.renderer.present()
 
             # attente pour rendre le tour des ennemies plus realistique
             pygame.time.delay(500)
 
             # Tester si la game est finie
-            if self.GameMode == "PvE" :
-                if len(self.enemy_units) == 0 :
-                    self.game_end("enemy")
-                elif len(self.player_units) == 0 :
-                    self.game_end("player 1")
-            elif self.GameMode == "PvP" :
-                if len(self.player2_units) == 0 :
-                    self.game_end("player 2")
-                elif len(self.player_units) == 0 :
-                    self.game_end("player 1")
-
-
-
-
-    def AI_find_best_move(self, enemy):
-        # Evaluate potential moves and return the best one
-        best_move = None
-        best_score = -500
-
-        for dx in range(-enemy.endurence_max, enemy.endurence_max + 1):  # Example range, adjust for movement rules
-            for dy in range(-enemy.endurence_max, enemy.endurence_max + 1):
-                new_x = enemy.x + dx
-                new_y = enemy.y + dy
-                if not self.is_wall(new_x, new_y) and (0 <= new_x < GRID_SIZE_WIDTH and 0 <= new_y < GRID_SIZE_HEIGHT):
-                    score = self.AI_evaluate_position(new_x, new_y)
-                    if score > best_score:
-                        best_score = score
-                        best_move = (dx, dy)
-
-        # alterer best_move legerement de facon aleatoire
-        potential_alteration = [-2, -1, 0, 1, 2]
-        probabilities = [0.1, 0.1, 0.6, 0.1, 0.1]
-        ax = random.choices(potential_alteration, weights=probabilities, k=1)[0]
-        ay = random.choices(potential_alteration, weights=probabilities, k=1)[0]
-        a_new_x = best_move[0] + ax
-        a_new_y = best_move[0] + ay
-        if not self.is_wall(a_new_x, a_new_y) and (0 <= a_new_x < GRID_SIZE_WIDTH and 0 <= a_new_y < GRID_SIZE_HEIGHT):
-            best_move = (a_new_x, a_new_y)
-
-        return best_move
-    
-
-
-
-    def AI_evaluate_position(self, x, y):
-            # Return a score based on strategic factors (e.g., proximity to player units, terrain)
-            score = 0
-            for player in self.player_units:
-                distance = abs(player.x - x) + abs(player.y - y)
-                score -= (distance * 2)  # Prefer closer positions
-            if (x == player.x) and (x == player.x):
-                score -= 500 # to avoid moving into player block
-            if (x, y) in self.healing:
-                score += 5  # Bonus for healing zones
-            if (x, y) in self.magmas:
-                score -= 10  # Penalty for harmful terrain
-            return score
-    
-
-
+            loser = self.loser()
+            if loser:
+                self.game_end(loser)
 
-    def AI_find_best_target(self, enemy):
-        # Return the best target for the given enemy
-        best_target = None
-        best_score = -500
-        for player in self.player_units:
-            distance = abs(player.x - enemy.x) + abs(player.y - enemy.y)
-            if distance <= 10:
-                score = player.health * -1  # Prefer low-health targets
-                if score > best_score:
-                    best_score = score
-                    best_target = player
-        return best_target
 
 
 
-
-
-    def AI_evaluate_skills(self, enemy):
-        # Evaluate the effectiveness of each skill and return the best one
-        best_skill = None
-        best_effectiveness = -100
-        for skill in enemy.skills:
-            effectiveness = self.AI_simulate_skill_use(skill, enemy)
-            if effectiveness > best_effectiveness:
-                best_effectiveness = effectiveness
-                best_skill = skill
-        
-        # si best_effectiveness == -100 alors aucun skill n'est compatible avec l'IA
-        if best_effectiveness == -100 :
-            return None
-
-        return best_skill
-
-
-
-
-
-    def AI_simulate_skill_use(self, skill, enemy):
-        # Simulate the skill's effect and return an effectiveness score
-        effectiveness = 0
-
-        # test if skill is AI compatible
-        if skill.AI_compatible == False :
-            effectiveness = -100
-            return effectiveness
-
-        # test effectiveness for all player units
-        for player in self.player_units:
-            if skill.range >= abs(player.x - enemy.x) + abs(player.y - enemy.y):
-                effectiveness += skill.damage  # Adjust based on skill properties
-        return effectiveness
-
-
-
-
-    
     # ecran de fin de jeu
     def game_end(self, loser):
         """
@@ -1141,23 +1077,22 @@ class Game:
             splash_game_over = "data/splash_images/game_win.jpg"
 
             # Charger la musique de fond
-            pygame.mixer.music.load("data/musics/end_victory.mp3")
+            pygame.mixer.music.load(assets.source("data/musics/end_victory.mp3"))
             pygame.mixer.music.play(loops=0) # joue en boucle
 
         # Charger l'image de fond
-        splash_menu_image_1 = pygame.image.load(splash_game_over) 
-        splash_menu_image_1 = pygame.transform.scale(splash_menu_image_1, (WIDTH,HEIGHT+INFO_PANEL_HEIGHT))
+        splash_menu_image_1 = assets.image(splash_game_over, (WIDTH,HEIGHT+INFO_PANEL_HEIGHT))
 
         # affiche l'image de fond
         self.screen.blit(splash_menu_image_1, (0,0))
         pygame.display.flip()
 
         # Font settings
-        title_font = pygame.font.Font(None, 72)
-        message_font = pygame.font.Font(None, 36)
+        title_font = assets.font(None, 72)
+        message_font = assets.font(None, 36)
 
         # Button settings
-        button_font = pygame.font.Font(None, 36)
+        button_font = assets.font(None, 36)
         button_text = "Go to Title Screen"
         button_rect = pygame.Rect(WIDTH // 3, HEIGHT // 2 + 100, WIDTH // 3, 50)
 
@@ -1199,13 +1134,14 @@ class Game:
         """
         Restarts the game by returning to the title screen.
         """
-        # charger les textures et sons
-        self.load_textures_sounds()
+        # précharger les ressources de tous les écrans en arrière-plan
+        self.preload_assets()
 
         # Clear the current game state
         self.player_units = []
         self.player2_units = []
         self.enemy_units = []
+        self.occupancy.rebuild([])
         self.selected_map_file = []
 
         # Afficher le menu principale
@@ -1213,6 +1149,11 @@ class Game:
 
         # choix de la carte
         selected_map = self.choose_map()
+
+        # charger les textures et sons (préchargés pendant les menus), avant la carte : la couche
+        # de terrain construite par read_map_from_csv utilise les textures des cases
+        assets.preload(self.screen_assets("game"), priority=-1)
+        self.load_textures_sounds()
         self.read_map_from_csv(selected_map)
 
         if selected_map is None:
@@ -1229,6 +1170,11 @@ class Game:
         # lancer la musique
         self.play_game_music()
 
+        # Les menus ont dessiné sur tout l'écran : le premier affichage de la partie est complet
+        self.renderer.invalidate()
+        self.drawn_units = {}
+        self.fog.reset()
+
         # Lancer la game
         if MenuChoice == "PvE":
             while True:
@@ -1246,6 +1192,9 @@ class Game:
 # main function
 def main():
 
+    # Processus de l'IA "expert" créés avant tout autre thread (voir mcts.start_pool)
+    mcts.start_pool()
+
     # Instanciation du jeu
     game = Game(screen)
 
@@ -1255,5 +1204,25 @@ def main():
 
 
 
+def prepare_assets():
+    """
+    Prépare les images de tous les écrans sans lancer le jeu : elles sont décodées, converties et
+    redimensionnées une fois, puis gardées dans le cache de textures (assets.py) pour les lancements
+    suivants. À refaire après avoir changé les images ou la taille des cellules (sinon, c'est fait
+    au premier lancement).
+    """
+    game = Game(screen)
+    for name in SCREENS:
+        for load, *arguments in game.screen_assets(name):
+            load(*arguments)
+    stats = assets.stats()
+    print(f"Textures prêtes : {stats['disk_misses']} préparées, {stats['disk_hits']} déjà dans le cache")
+
+
+
+
 if __name__ == "__main__":
-    main()
+    if "--prepare-assets" in sys.argv[1:]:
+        prepare_assets()
+    else:
+        main()
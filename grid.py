@@ -0,0 +1,360 @@
+"""
+Grilles de la carte : terrain et occupation des cellules par les unités.
+
+Ce module ne dépend pas de pygame.
+"""
+
+import csv
+import hashlib
+import os
+import struct
+
+from assetpack import open_text, read_file
+
+
+
+
+# Types de terrain (valeurs des cellules dans les CSV des cartes)
+TERRAIN_GRASS = 0
+TERRAIN_WALL = 1
+TERRAIN_MAGMA = 2
+TERRAIN_WATER = 3
+TERRAIN_MUD = 4
+TERRAIN_HEALING = 5
+TERRAIN_SNOW = 6
+TERRAIN_BUSH = 7
+TERRAIN_NONE = 255  # cellule vide ou valeur inconnue dans le CSV
+
+
+
+
+class TerrainGrid:
+    """
+    Classe pour représenter le terrain de la carte dans un tableau d'octets.
+
+    Chaque cellule est un octet (type de terrain) rangé ligne par ligne : la cellule (x, y)
+    est à l'index y * width + x. terrain_at(x, y) et is_wall(x, y) sont donc en O(1),
+    quelle que soit la taille de la carte.
+
+    Attributs :
+    ----------
+    - width : int
+        Largeur de la carte en cellules.
+    - height : int
+        Hauteur de la carte en cellules.
+    - data : bytearray
+        Type de terrain de chaque cellule.
+    """
+
+
+
+
+    def __init__(self, width, height, fill=TERRAIN_NONE):
+        """
+        Paramètres :
+        -----------
+        - width : int
+            Largeur de la carte en cellules.
+        - height : int
+            Hauteur de la carte en cellules.
+        - fill : int
+            Type de terrain initial de toutes les cellules.
+        """
+        self.width = width
+        self.height = height
+        self.data = bytearray([fill]) * (width * height)
+        self.views = {}
+
+
+
+
+    @classmethod
+    def from_csv(cls, filename):
+        """
+        Construit la grille à partir du CSV d'une carte (une ligne par rangée, un chiffre par cellule).
+        """
+        with open_text(filename) as data:
+            rows = [list(row) for row in csv.reader(data, delimiter=',')]
+
+        height = len(rows)
+        width = max((len(row) for row in rows), default=0)
+        grid = cls(width, height)
+        for y, row in enumerate(rows):
+            for x, cell in enumerate(row):
+                cell = cell.strip()
+                if cell.isdigit() and int(cell) <= TERRAIN_BUSH:
+                    grid.data[y * width + x] = int(cell)
+        return grid
+
+
+
+
+    def terrain_at(self, x, y):
+        """Retourne le type de terrain de la cellule (x, y), ou TERRAIN_NONE hors de la carte."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.data[y * self.width + x]
+        return TERRAIN_NONE
+
+
+
+
+    def is_wall(self, x, y):
+        """Vérifie si la cellule (x, y) est un mur."""
+        return self.terrain_at(x, y) == TERRAIN_WALL
+
+
+
+
+    def set_terrain(self, x, y, terrain):
+        """Change le type de terrain d'une cellule (les listes de coordonnées sont recalculées)."""
+        self.data[y * self.width + x] = terrain
+        self.views.clear()
+
+
+
+
+    def cells(self, terrain):
+        """
+        Retourne la liste des coordonnées (x, y) d'un type de terrain, dans l'ordre de lecture du CSV.
+        Utilisée là où l'affichage a besoin de listes ; la liste est gardée jusqu'au prochain set_terrain.
+        """
+        view = self.views.get(terrain)
+        if view is None:
+            view = [(index % self.width, index // self.width)
+                    for index, value in enumerate(self.data) if value == terrain]
+            self.views[terrain] = view
+        return view
+
+
+
+
+class OccupancyIndex:
+    """
+    Classe pour retrouver en O(1) l'unité présente sur une cellule.
+
+    L'index associe chaque cellule (x, y) occupée à son unité. Il doit être mis à jour à chaque
+    déplacement (move), téléportation et mort (remove) : toutes ces opérations passent par lui
+    pour que les positions des unités et l'index ne divergent jamais, même si une unité meurt
+    au milieu d'une compétence.
+
+    L'index tient aussi à jour un bitset des cellules occupées (bit y * width + x), à croiser
+    avec les masques de zones (PatternMask).
+
+    Attributs :
+    ----------
+    - cells : dict[tuple[int, int], Unit]
+        Unité présente sur chaque cellule occupée.
+    - width : int
+        Largeur de la carte en cellules (rang des bits).
+    - bits : int
+        Bitset des cellules occupées.
+    """
+
+
+
+
+    def __init__(self, units=(), width=30):
+        self.cells = {}
+        self.width = width
+        self.bits = 0
+        self.rebuild(units)
+
+
+
+
+    def rebuild(self, units):
+        """Reconstruit l'index à partir d'une liste d'unités (début de partie)."""
+        self.cells = {}
+        self.bits = 0
+        for unit in units:
+            self.add(unit)
+
+
+
+
+    def add(self, unit):
+        """Ajoute une unité à sa position actuelle."""
+        self.cells[(unit.x, unit.y)] = unit
+        if 0 <= unit.x < self.width and unit.y >= 0:
+            self.bits |= 1 << (unit.y * self.width + unit.x)
+
+
+
+
+    def remove(self, unit):
+        """Retire une unité de l'index (sans effet si elle n'y est pas)."""
+        if self.cells.get((unit.x, unit.y)) is unit:
+            del self.cells[(unit.x, unit.y)]
+            if 0 <= unit.x < self.width and unit.y >= 0:
+                self.bits &= ~(1 << (unit.y * self.width + unit.x))
+
+
+
+
+    def move(self, unit, x, y):
+        """Déplace une unité vers la cellule (x, y) et met l'index à jour."""
+        self.remove(unit)
+        unit.x = x
+        unit.y = y
+        self.add(unit)
+
+
+
+
+    def unit_at(self, x, y):
+        """Retourne l'unité présente sur la cellule (x, y), ou None si la cellule est libre."""
+        return self.cells.get((x, y))
+
+
+
+
+    def is_occupied(self, x, y):
+        """Vérifie si une unité se trouve sur la cellule (x, y)."""
+        return (x, y) in self.cells
+
+
+
+
+    def units_in(self, cells):
+        """Retourne les unités présentes sur une liste de cellules, dans l'ordre des cellules."""
+        units = []
+        for cell in cells:
+            unit = self.cells.get(cell)
+            if unit is not None:
+                units.append(unit)
+        return units
+
+
+
+
+    def units_in_mask(self, mask):
+        """
+        Retourne les unités présentes dans les cellules d'un masque (PatternMask), dans l'ordre
+        des bits (ligne par ligne, comme units_in sur les cellules du masque).
+        """
+        units = []
+        bits = mask.bits & self.bits
+        while bits:
+            lowest = bits & -bits
+            bit = lowest.bit_length() - 1
+            units.append(self.cells[(bit % self.width, bit // self.width)])
+            bits ^= lowest
+        return units
+
+
+
+
+class PatternMask:
+    """
+    Classe pour représenter une zone fixe de la carte (motif CSV, une case '*' par cellule touchée)
+    compilée en bitset : bit y * width + x pour la cellule (x, y).
+
+    Le masque est enregistré à côté du CSV (même nom, extension .mask) avec l'empreinte SHA-256
+    du CSV : il est relu au lancement suivant si le motif n'a pas changé.
+
+    Attributs :
+    ----------
+    - width, height : int
+        Dimensions de la carte.
+    - bits : int
+        Bitset des cellules touchées.
+    - source_hash : bytes
+        Empreinte SHA-256 du CSV du motif.
+    """
+
+    FILE_MAGIC = b"FGMSK1"
+
+
+
+
+    def __init__(self, width, height, bits, source_hash=b""):
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self.source_hash = source_hash
+        self.decoded = None
+
+
+
+
+    @classmethod
+    def from_csv(cls, filename, width, height, source_hash=b""):
+        """Compile le motif d'un CSV (les cases hors de la carte sont ignorées)."""
+        bits = 0
+        with open_text(filename) as file:
+            for y, row in enumerate(csv.reader(file)):
+                for x, cell in enumerate(row):
+                    if cell == '*' and x < width and y < height:
+                        bits |= 1 << (y * width + x)
+        return cls(width, height, bits, source_hash)
+
+
+
+
+    def cells(self):
+        """Retourne les cellules (x, y) du masque, ligne par ligne (liste décodée une seule fois)."""
+        if self.decoded is None:
+            self.decoded = []
+            bits = self.bits
+            while bits:
+                lowest = bits & -bits
+                bit = lowest.bit_length() - 1
+                self.decoded.append((bit % self.width, bit // self.width))
+                bits ^= lowest
+        return self.decoded
+
+
+
+
+    def save(self, path):
+        """Enregistre le masque dans un fichier binaire."""
+        with open(path, mode='wb') as file:
+            file.write(self.FILE_MAGIC)
+            file.write(self.source_hash)
+            file.write(struct.pack("<HH", self.width, self.height))
+            file.write(self.bits.to_bytes((self.width * self.height + 7) // 8, "little"))
+
+
+
+
+    @classmethod
+    def load(cls, path):
+        """Charge un masque enregistré par save(). Retourne None si le fichier est invalide."""
+        try:
+            with open(path, mode='rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        header_size = len(cls.FILE_MAGIC) + 32 + 4
+        if len(data) < header_size or not data.startswith(cls.FILE_MAGIC):
+            return None
+        source_hash = data[len(cls.FILE_MAGIC):len(cls.FILE_MAGIC) + 32]
+        width, height = struct.unpack("<HH", data[header_size - 4:header_size])
+        if len(data) != header_size + (width * height + 7) // 8:
+            return None
+        return cls(width, height, int.from_bytes(data[header_size:], "little"), source_hash)
+
+
+
+
+    @classmethod
+    def for_file(cls, csv_path, width, height):
+        """
+        Retourne le masque du motif csv_path : lu depuis le fichier .mask voisin si l'empreinte
+        du CSV et les dimensions correspondent, sinon compilé puis enregistré.
+        """
+        source_hash = hashlib.sha256(read_file(csv_path)).digest()
+
+        mask_path = os.path.splitext(csv_path)[0] + ".mask"
+        mask = cls.load(mask_path)
+        if mask is not None and mask.source_hash == source_hash and (mask.width, mask.height) == (width, height):
+            return mask
+
+        mask = cls.from_csv(csv_path, width, height, source_hash)
+        try:
+            mask.save(mask_path)
+        except OSError:
+            # installation en lecture seule : le masque reste en mémoire
+            pass
+        return mask
@@ -0,0 +1,118 @@
+"""
+Cartes d'influence pour l'IA, sans pygame.
+
+Une InfluenceMap est construite une fois au début du tour d'une équipe et partagée par toutes ses
+unités : les scores de position deviennent de simples lectures dans des tableaux au lieu de
+boucles sur les unités adverses pour chaque cellule candidate.
+"""
+
+from collections import deque
+
+from grid import TERRAIN_WALL, TERRAIN_NONE, TERRAIN_HEALING
+
+
+UNREACHABLE = 10000  # distance des cellules qu'aucun chemin ne relie aux sources
+
+
+
+
+def distance_field(terrain, sources, limit=None):
+    """
+    Calcule la distance en pas (haut, bas, gauche, droite) de chaque cellule à la source la plus proche
+    (parcours en largeur depuis toutes les sources à la fois). Les murs bloquent le passage.
+
+    Paramètres :
+    -----------
+    - terrain : TerrainGrid
+        Le terrain de la carte.
+    - sources : list[tuple[int, int]]
+        Les cellules de départ (distance 0).
+    - limit : int
+        Distance au-delà de laquelle le parcours s'arrête (None : toute la carte).
+
+    Retourne :
+    ---------
+    - list[int] : la distance de chaque cellule (index y * width + x), UNREACHABLE si elle n'est pas reliée.
+    """
+    width = terrain.width
+    height = terrain.height
+    data = terrain.data
+    field = [UNREACHABLE] * (width * height)
+
+    queue = deque()
+    for x, y in sources:
+        if 0 <= x < width and 0 <= y < height and field[y * width + x] != 0:
+            field[y * width + x] = 0
+            queue.append((x, y))
+
+    while queue:
+        x, y = queue.popleft()
+        distance = field[y * width + x] + 1
+        if limit is not None and distance > limit:
+            continue
+        for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if 0 <= nx < width and 0 <= ny < height:
+                index = ny * width + nx
+                if field[index] > distance and data[index] != TERRAIN_WALL and data[index] != TERRAIN_NONE:
+                    field[index] = distance
+                    queue.append((nx, ny))
+    return field
+
+
+
+
+class InfluenceMap:
+    """
+    Classe pour regrouper les couches d'influence vues par une équipe.
+
+    Toutes les couches sont des listes d'une valeur par cellule, rangées comme TerrainGrid.data
+    (index y * width + x) ; at(layer, x, y) les lit par coordonnées.
+
+    Attributs :
+    ----------
+    - team : str
+        L'équipe pour laquelle la carte est construite.
+    - distance : list[int]
+        Distance en pas à l'unité adverse la plus proche.
+    - threat : list[int]
+        Somme de la puissance d'attaque des unités adverses qui peuvent attaquer la cellule au prochain tour
+        (se déplacer à côté avec leur endurance maximale).
+    - healing : list[int]
+        Distance en pas à la case healing la plus proche.
+    """
+
+
+
+
+    def __init__(self, match, team):
+        """
+        Paramètres :
+        -----------
+        - match : MatchState
+            La partie en cours.
+        - team : str
+            L'équipe qui va jouer.
+        """
+        self.team = team
+        terrain = match.terrain
+        self.width = terrain.width
+        self.height = terrain.height
+
+        opponents = [unit for unit in match.all_units() if unit.team != team]
+        self.distance = distance_field(terrain, [(unit.x, unit.y) for unit in opponents])
+
+        self.threat = [0] * (self.width * self.height)
+        for unit in opponents:
+            reach = distance_field(terrain, [(unit.x, unit.y)], unit.endurence_max + 1)
+            for index, distance in enumerate(reach):
+                if distance != UNREACHABLE:
+                    self.threat[index] += unit.attack_power
+
+        self.healing = distance_field(terrain, terrain.cells(TERRAIN_HEALING))
+
+
+
+
+    def at(self, layer, x, y):
+        """Retourne la valeur d'une couche pour la cellule (x, y)."""
+        return layer[y * self.width + x]
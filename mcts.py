@@ -0,0 +1,310 @@
+"""
+IA Monte-Carlo (recherche arborescente Monte-Carlo, difficulté "expert"), sans pygame.
+
+Chaque processus du pool construit son propre arbre depuis la même copie de la partie, avec sa
+propre graine (parallélisation à la racine). Les statistiques des fils de la racine (visites et
+gains) sont additionnées, puis on joue le plan le plus visité. La force de l'IA augmente donc avec
+le nombre de cœurs.
+
+Deux modes :
+- budget de temps (budget, en secondes) : pour le jeu ;
+- nombre d'itérations fixé avec une graine (iterations et seed) : le plan choisi ne dépend que de
+  la graine, des itérations et du nombre de processus, ce qui permet de vérifier le déterminisme.
+
+Les processus sont créés par fork : avec spawn (Windows), ils réimporteraient le module principal
+(game.py ouvrirait une fenêtre par processus). Sans fork, la recherche tourne dans le processus du jeu.
+fork ne copie que le thread qui l'appelle : un verrou tenu par un autre thread à ce moment resterait
+fermé pour toujours dans les processus du pool. Le jeu crée donc le pool et tous ses processus au
+démarrage, depuis le thread principal, avant les threads de chargement, du mélangeur et de l'IA
+(start_pool) ; ensuite, aucun fork n'a lieu pendant la partie.
+"""
+
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+
+import ai
+from movement import follow_path
+from rules import clone_match
+from search import PlanSearch, candidate_plans, evaluate
+
+
+EXPLORATION = 1.4      # constante d'exploration UCT
+ROLLOUT_PLIES = 4      # plans joués au hasard après une feuille avant d'évaluer l'état
+REWARD_SCALE = 30.0    # écart de score (search.evaluate) qui donne un gain de 0.73 au lieu de 0.5
+RESERVED_CORES = 1     # cœur laissé au thread principal, au mélangeur et aux threads de chargement
+
+executor = None        # pool de processus partagé par tous les tours (créé par start_pool)
+executor_workers = 0
+
+
+
+
+class Node:
+    """
+    Classe pour représenter un nœud de l'arbre : l'état après les plans joués depuis la racine.
+
+    Attributs :
+    ----------
+    - state : MatchState
+        Copie de la partie à ce nœud.
+    - ids : dict[int, Fighter]
+        Unités de state en vie, par indice dans la partie d'origine.
+    - ply : int
+        Position dans l'ordre de jeu (PlanSearch.order) de l'unité qui joue à ce nœud.
+    - plan : tuple
+        Le plan qui a mené à ce nœud (None pour la racine).
+    - untried : list
+        Plans pas encore essayés depuis ce nœud.
+    - children : list[Node]
+        Nœuds fils déjà développés.
+    - visits, value : int, float
+        Nombre de passages et somme des gains (du point de vue de l'équipe de la racine).
+    """
+
+
+
+
+    def __init__(self, searcher, state, ids, ply, plan=None):
+        self.state = state
+        self.ids = ids
+        self.plan = plan
+        self.children = []
+        self.visits = 0
+        self.value = 0.0
+
+        # les unités mortes passent leur tour
+        while ply < len(searcher.order) and searcher.order[ply] not in ids:
+            ply += 1
+        self.ply = ply
+
+        if ply >= len(searcher.order) or state.loser() is not None:
+            self.mover = None
+            self.untried = []
+        else:
+            self.mover = ids[searcher.order[ply]]
+            self.untried = candidate_plans(state, self.mover)
+
+
+
+
+    def select(self, team):
+        """Retourne le fils qui maximise le critère UCT, du point de vue de l'unité qui joue à ce nœud."""
+        log_visits = math.log(self.visits)
+        best = None
+        best_score = None
+        for child in self.children:
+            mean = child.value / child.visits
+            if self.mover.team != team:
+                mean = 1.0 - mean
+            score = mean + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if best_score is None or score > best_score:
+                best = child
+                best_score = score
+        return best
+
+
+
+
+def rollout(searcher, state, ids, ply, rng):
+    """
+    Joue ROLLOUT_PLIES plans au hasard (les unités dans l'ordre de searcher.order, en boucle)
+    et retourne le gain de l'état final pour l'équipe de la racine, entre 0 et 1.
+    """
+    order = searcher.order
+    for step in range(ROLLOUT_PLIES):
+        if state.loser() is not None:
+            break
+        index = order[(ply + step) % len(order)]
+        unit = ids.get(index)
+        if unit is None:
+            continue
+        state, ids = searcher.play(state, ids, index, rng.choice(candidate_plans(state, unit)))
+    return 1.0 / (1.0 + math.exp(-evaluate(state, searcher.team) / REWARD_SCALE))
+
+
+
+
+def grow_tree(state, unit_index, budget=None, iterations=None, seed=None):
+    """
+    Construit un arbre depuis state pour l'unité d'indice unit_index (dans state.all_units()).
+    Point d'entrée des processus du pool : tous les arguments et le résultat sont sérialisables.
+
+    Paramètres :
+    -----------
+    - state : MatchState
+        Copie sans affichage de la partie (clone_match).
+    - unit_index : int
+        Indice de l'unité qui joue.
+    - budget : float
+        Temps de réflexion en secondes (ignoré si iterations est donné).
+    - iterations : int
+        Nombre d'itérations à faire.
+    - seed : int
+        Graine du générateur aléatoire de l'arbre.
+
+    Retourne :
+    ---------
+    - dict[tuple, list] : pour chaque plan de la racine (chemin en tuple, compétence), [visites, gains].
+    """
+    deadline = time.perf_counter() + (budget or 0.0)
+    rng = random.Random(seed)
+    units = state.all_units()
+    searcher = PlanSearch(state, units[unit_index], float("inf"))
+    root = Node(searcher, state, dict(enumerate(units)), 0)
+
+    done = 0
+    while (done < iterations) if iterations is not None else (time.perf_counter() < deadline):
+        done += 1
+
+        # sélection
+        node = root
+        path = [node]
+        while not node.untried and node.children:
+            node = node.select(searcher.team)
+            path.append(node)
+
+        # expansion
+        if node.untried:
+            plan = node.untried.pop(rng.randrange(len(node.untried)))
+            child_state, child_ids = searcher.play(node.state, node.ids, searcher.order[node.ply], plan)
+            child = Node(searcher, child_state, child_ids, node.ply + 1, plan)
+            node.children.append(child)
+            node = child
+            path.append(node)
+
+        # simulation puis rétropropagation
+        reward = rollout(searcher, node.state, node.ids, node.ply, rng)
+        for visited in path:
+            visited.visits += 1
+            visited.value += reward
+
+    return {(tuple(child.plan[0]), child.plan[1]): [child.visits, child.value] for child in root.children}
+
+
+
+
+def default_workers():
+    """Nombre de processus par défaut : un par cœur sauf RESERVED_CORES (au moins 1), ou 1 si fork n'est pas disponible."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return 1
+    return max((os.cpu_count() or 1) - RESERVED_CORES, 1)
+
+
+
+
+def start_pool(workers=None):
+    """
+    Crée le pool de processus et tous ses processus tout de suite (avec fork, ils sont tous créés à
+    la première tâche). À appeler depuis le thread principal, avant de lancer d'autres threads.
+
+    Retourne :
+    ---------
+    - concurrent.futures.ProcessPoolExecutor : le pool, ou None avec un seul processus.
+    """
+    global executor, executor_workers
+    if workers is None:
+        workers = default_workers()
+    if executor is None and workers > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                          mp_context=multiprocessing.get_context("fork"))
+        executor_workers = workers
+        executor.submit(int).result()
+    return executor
+
+
+
+
+def get_executor(workers):
+    """
+    Retourne le pool de processus. Il n'est créé ici que depuis le thread principal (outils, simulations) :
+    depuis un autre thread, sans start_pool au démarrage, retourne None et la recherche reste dans ce processus.
+    """
+    if executor is None and threading.current_thread() is threading.main_thread():
+        start_pool(workers)
+    return executor
+
+
+
+
+def best_plan(match, unit, budget=None, iterations=None, seed=None, workers=None):
+    """
+    Choisit le plan de l'unité avec la recherche Monte-Carlo.
+
+    Paramètres :
+    -----------
+    - match : MatchState
+        La partie en cours (elle n'est pas modifiée).
+    - unit : Fighter
+        L'unité qui va jouer.
+    - budget : float
+        Temps de réflexion en secondes (mode jeu).
+    - iterations : int
+        Itérations par processus (mode à graine fixe, prioritaire sur budget).
+    - seed : int
+        Graine du premier processus (le processus i utilise seed + i) ; None : graines aléatoires.
+    - workers : int
+        Nombre d'arbres, un par processus (par défaut la taille du pool de start_pool, sinon
+        default_workers()) ; 1 : pas de pool.
+
+    Retourne :
+    ---------
+    - tuple[list[tuple[int, int]], int] : le chemin à suivre et l'index de la compétence à utiliser (ou None).
+    """
+    if workers is None:
+        workers = executor_workers if executor is not None else default_workers()
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    state = clone_match(match)
+    unit_index = match.all_units().index(unit)
+    arguments = [(state, unit_index, budget, iterations, seed + worker) for worker in range(workers)]
+    pool = get_executor(workers) if workers > 1 else None
+    if pool is None:
+        if iterations is None:
+            # budget de temps : un seul arbre, pour ne pas dépasser le temps de réflexion
+            arguments = arguments[:1]
+        results = [grow_tree(*argument) for argument in arguments]
+    else:
+        futures = [pool.submit(grow_tree, *argument) for argument in arguments]
+        results = [future.result() for future in futures]
+
+    # fusion des statistiques de la racine (dans l'ordre des processus : résultat reproductible)
+    merged = {}
+    for result in results:
+        for key, (visits, value) in result.items():
+            total = merged.setdefault(key, [0, 0.0])
+            total[0] += visits
+            total[1] += value
+
+    if not merged:
+        # aucune itération (budget trop court) : plan de l'IA gloutonne
+        path, skill_index = ai.greedy_plan(match, unit)
+        return path or [], skill_index
+
+    best = max(merged.items(), key=lambda item: (item[1][0], item[1][1]))[0]
+    return list(best[0]), best[1]
+
+
+
+
+def play_turn(match, unit, budget=None, iterations=None, seed=None, workers=None):
+    """
+    Joue le tour complet d'une unité avec la recherche Monte-Carlo, sans affichage (équivalent de ai.play_turn).
+    """
+    path, skill = best_plan(match, unit, budget, iterations, seed, workers)
+    follow_path(match, unit, path)
+    if skill is not None:
+        unit.skills[skill].auto_use(unit, match)
+
+    target = ai.find_best_target(match, unit)
+    if target:
+        health = target.health
+        unit.attack(target)
+        match.record_damage("Attack", health - target.health)
+
+    match.remove_dead_units()
@@ -0,0 +1,144 @@
+"""
+Cellules atteignables par une unité et chemins pour s'y rendre, sans pygame.
+
+Un déplacement se fait case par case (haut, bas, gauche, droite) comme pour les joueurs.
+Chaque pas coûte 1 point d'endurance, plus la pénalité d'endurance du terrain d'arrivée pour le
+type de l'unité (TERRAIN_EFFECTS). Les murs, les bords de la carte et les cellules occupées
+bloquent le passage.
+"""
+
+import heapq
+
+from grid import TERRAIN_WALL, TERRAIN_NONE
+from rules import TERRAIN_EFFECTS
+
+
+STEPS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+
+
+def step_cost(terrain, archetype):
+    """
+    Retourne le coût en endurance d'un pas vers une cellule de ce terrain.
+
+    Paramètres :
+    -----------
+    - terrain : int
+        Type de terrain de la cellule d'arrivée.
+    - archetype : str
+        Type de l'unité ("Sorceress", "Samurai", "Shinobi").
+
+    Retourne :
+    ---------
+    - int : 1 plus la pénalité d'endurance du terrain.
+    """
+    effects = TERRAIN_EFFECTS.get(terrain)
+    if effects is None:
+        return 1
+    return 1 - min(0, effects.get(archetype, (0, 0))[1])
+
+
+
+
+def reachable_cells(match, unit, budget=None):
+    """
+    Calcule toutes les cellules que l'unité peut atteindre ce tour (algorithme de Dijkstra).
+
+    Paramètres :
+    -----------
+    - match : MatchState
+        La partie en cours.
+    - unit : Fighter
+        L'unité qui se déplace.
+    - budget : int
+        Endurance disponible (par défaut unit.endurence_max).
+
+    Retourne :
+    ---------
+    - dict[tuple[int, int], tuple[int, tuple[int, int]]] : pour chaque cellule atteignable, son coût
+      et la cellule précédente sur le chemin le moins cher (None pour la position de départ).
+    """
+    if budget is None:
+        budget = unit.endurence_max
+
+    terrain = match.terrain
+    width = terrain.width
+    height = terrain.height
+    data = terrain.data
+    occupied = match.occupancy.cells
+    archetype = unit.archetype
+
+    # coût d'entrée par type de terrain, calculé une fois pour l'unité
+    costs = {}
+
+    start = (unit.x, unit.y)
+    reached = {start: (0, None)}
+    queue = [(0, start)]
+    while queue:
+        cost, cell = heapq.heappop(queue)
+        if cost > reached[cell][0]:
+            continue
+        x, y = cell
+        for dx, dy in STEPS:
+            nx = x + dx
+            ny = y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            value = data[ny * width + nx]
+            if value == TERRAIN_WALL or value == TERRAIN_NONE or (nx, ny) in occupied:
+                continue
+            step = costs.get(value)
+            if step is None:
+                step = costs[value] = step_cost(value, archetype)
+            new_cost = cost + step
+            if new_cost > budget:
+                continue
+            known = reached.get((nx, ny))
+            if known is None or new_cost < known[0]:
+                reached[(nx, ny)] = (new_cost, cell)
+                heapq.heappush(queue, (new_cost, (nx, ny)))
+    return reached
+
+
+
+
+def path_to(reached, x, y):
+    """
+    Reconstruit le chemin vers la cellule (x, y) à partir du résultat de reachable_cells.
+
+    Retourne :
+    ---------
+    - list[tuple[int, int]] : les pas (dx, dy) successifs, vide si (x, y) est la position de départ,
+      ou None si la cellule n'est pas atteignable.
+    """
+    if (x, y) not in reached:
+        return None
+    path = []
+    cell = (x, y)
+    previous = reached[cell][1]
+    while previous is not None:
+        path.append((cell[0] - previous[0], cell[1] - previous[1]))
+        cell = previous
+        previous = reached[cell][1]
+    path.reverse()
+    return path
+
+
+
+
+def follow_path(match, unit, path):
+    """
+    Déplace l'unité pas à pas le long d'un chemin (les effets du terrain s'appliquent à chaque pas).
+    S'arrête au premier pas impossible.
+
+    Retourne :
+    ---------
+    - int : le nombre de pas effectués.
+    """
+    steps = 0
+    for dx, dy in path:
+        if unit.move(dx, dy, match) is None:
+            break
+        steps += 1
+    return steps
@@ -0,0 +1,220 @@
+import pygame
+from unit import CELL_SIZE
+
+
+
+
+class Renderer:
+    """
+    Classe pour rafraîchir l'écran uniquement là où il a changé (dirty rectangles).
+
+    Au lieu de pygame.display.flip() qui envoie toute la fenêtre, chaque partie du jeu
+    marque les rectangles qu'elle a modifiés puis appelle present(), qui ne pousse que
+    ces rectangles avec pygame.display.update(rects).
+
+    Attributs :
+    ----------
+    - dirty_rects : list[pygame.Rect]
+        Les rectangles modifiés depuis le dernier present().
+    - transient_rects : list[pygame.Rect]
+        Les surcouches temporaires (surbrillances, animations) affichées au dernier present().
+        Elles sont renvoyées au present() suivant pour que leur effacement soit visible.
+    - full_redraw : bool
+        Si True, le prochain present() rafraîchit toute la fenêtre.
+    - last_present_rects : int
+        Nombre de rectangles envoyés au dernier present() (pour le suivi des performances).
+    """
+
+
+
+
+    def __init__(self):
+        self.dirty_rects = []
+        self.transient_rects = []
+        self.pending_transient_rects = []
+        self.full_redraw = True
+        self.last_present_rects = 0
+
+
+
+
+    def invalidate(self):
+        """Force un rafraîchissement complet au prochain present() (changement d'écran, menus, ...)."""
+        self.full_redraw = True
+
+
+
+
+    def mark(self, rect, transient=False):
+        """
+        Marque un rectangle de l'écran comme modifié.
+
+        Paramètres :
+        -----------
+        - rect : pygame.Rect
+            Zone modifiée (par exemple la valeur retournée par blit ou pygame.draw.rect).
+        - transient : bool
+            True pour une surcouche temporaire qui sera effacée par le prochain affichage de la carte.
+        """
+        rect = pygame.Rect(rect)
+        if transient:
+            self.pending_transient_rects.append(rect)
+        else:
+            self.dirty_rects.append(rect)
+
+
+
+
+    def mark_cell(self, x, y, transient=False):
+        """Marque une cellule (x, y) de la grille comme modifiée."""
+        self.mark((x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE), transient)
+
+
+
+
+    def mark_cells(self, cells, transient=False):
+        """Marque une liste de cellules (x, y) de la grille comme modifiées."""
+        for x, y in cells:
+            self.mark_cell(x, y, transient)
+
+
+
+
+    def present(self):
+        """
+        Envoie à la fenêtre les rectangles modifiés depuis le dernier appel.
+        Les surcouches temporaires du dernier appel sont renvoyées une fois de plus.
+        """
+        if self.full_redraw:
+            pygame.display.flip()
+            self.last_present_rects = 1
+            self.full_redraw = False
+        else:
+            rects = []
+            for rect in self.dirty_rects + self.transient_rects + self.pending_transient_rects:
+                # ignorer les doublons (cellules marquées plusieurs fois)
+                if rect not in rects:
+                    rects.append(rect)
+            if rects:
+                pygame.display.update(rects)
+            self.last_present_rects = len(rects)
+
+        self.dirty_rects = []
+        self.transient_rects = self.pending_transient_rects
+        self.pending_transient_rects = []
+
+
+
+
+class FogLayer:
+    """
+    Classe pour le brouillard de guerre de toute la carte, dans une seule surface transparente.
+
+    La surface est créée une seule fois. À chaque affichage, seules les cellules dont la
+    visibilité a changé depuis l'affichage précédent sont repeintes, puis la surface est
+    composée sur l'écran en un seul blit.
+
+    Attributs :
+    ----------
+    - surface : pygame.Surface
+        Surface SRCALPHA de la taille de la carte.
+    - visible_cells : set[tuple[int, int]]
+        Cellules visibles au dernier update().
+    - surfaces_created : int
+        Nombre de surfaces allouées par le brouillard depuis sa création.
+    """
+
+    FOG_COLOR = (50, 50, 50, 100)  # gris, transparence 100/255
+    CLEAR_COLOR = (0, 0, 0, 0)
+
+
+
+
+    def __init__(self, grid_width, grid_height):
+        """
+        Paramètres :
+        -----------
+        - grid_width : int
+            Largeur de la carte en cellules.
+        - grid_height : int
+            Hauteur de la carte en cellules.
+        """
+        self.surface = pygame.Surface((grid_width * CELL_SIZE, grid_height * CELL_SIZE), pygame.SRCALPHA)
+        self.surfaces_created = 1
+        self.reset()
+
+
+
+
+    def reset(self):
+        """Remet toute la carte dans le brouillard."""
+        self.surface.fill(self.FOG_COLOR)
+        self.visible_cells = set()
+
+
+
+
+    def update(self, visible_cells):
+        """
+        Repeint uniquement les cellules dont la visibilité a changé.
+
+        Paramètres :
+        -----------
+        - visible_cells : set[tuple[int, int]]
+            Cellules visibles pour l'équipe affichée.
+
+        Retourne :
+        ---------
+        - set[tuple[int, int]] : les cellules dont la visibilité a changé.
+        """
+        changed_cells = visible_cells ^ self.visible_cells
+        for x, y in changed_cells:
+            color = self.CLEAR_COLOR if (x, y) in visible_cells else self.FOG_COLOR
+            self.surface.fill(color, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+        self.visible_cells = set(visible_cells)
+        return changed_cells
+
+
+
+
+    def draw(self, screen):
+        """Compose le brouillard sur l'écran en un seul blit."""
+        screen.blit(self.surface, (0, 0))
+
+
+
+
+# Mesure des allocations du brouillard : python render.py
+if __name__ == "__main__":
+    import time
+    from unit import GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT, screen
+
+    # une unité qui traverse la carte avec une vision carrée de 6 cases
+    frames = []
+    for step in range(GRID_SIZE_WIDTH):
+        frames.append({(x, y) for x in range(step - 6, step + 7) for y in range(2, 15)
+                       if 0 <= x < GRID_SIZE_WIDTH and 0 <= y < GRID_SIZE_HEIGHT})
+
+    # Avant : une surface temporaire par cellule dans le brouillard
+    allocations = 0
+    start = time.perf_counter()
+    for visible_cells in frames:
+        for x in range(GRID_SIZE_WIDTH):
+            for y in range(GRID_SIZE_HEIGHT):
+                if (x, y) not in visible_cells:
+                    s = pygame.Surface((CELL_SIZE, CELL_SIZE))
+                    allocations += 1
+                    s.set_alpha(100)
+                    s.fill((50, 50, 50))
+                    screen.blit(s, (x * CELL_SIZE, y * CELL_SIZE))
+    before_ms = (time.perf_counter() - start) * 1000 / len(frames)
+    print(f"avant : {allocations / len(frames):.1f} surfaces/image, {before_ms:.2f} ms/image")
+
+    # Après : une seule surface repeinte aux cellules modifiées
+    start = time.perf_counter()
+    fog = FogLayer(GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT)
+    for visible_cells in frames:
+        fog.update(visible_cells)
+        fog.draw(screen)
+    after_ms = (time.perf_counter() - start) * 1000 / len(frames)
+    print(f"après : {fog.surfaces_created / len(frames):.2f} surfaces/image, {after_ms:.2f} ms/image")
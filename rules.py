@@ -0,0 +1,912 @@
+"""
+Règles du jeu, sans pygame : unités, effets du terrain, dégâts, effets des compétences et fin de partie.
+
+Ce module ne dépend que de grid.py, footprints.py et assetpack.py : il peut être importé et exécuté sans
+fenêtre (simulations, recherche de l'IA, serveur, outils). L'interface pygame (unit.py, game.py) est
+construite par-dessus : Unit hérite de Fighter, chaque compétence hérite de ses règles, et Game hérite
+de MatchState.
+"""
+
+import csv
+
+from assetpack import open_text
+from footprints import Footprint, FOOTPRINTS, register, top_anchors
+from grid import (TerrainGrid, OccupancyIndex, PatternMask, TERRAIN_MAGMA, TERRAIN_WATER, TERRAIN_MUD,
+                  TERRAIN_HEALING, TERRAIN_BUSH)
+
+
+
+
+# Constantes de la partie
+GRID_SIZE_WIDTH = 30 # (1400//CELL_SIZE) - 1
+GRID_SIZE_HEIGHT = 16 # int(GRID_SIZE_WIDTH*(9/16))
+CHARACTER_PER_TEAM = 3
+VISION_RANGE = 6 # portée de la vision des unités (en cellules)
+PLAYER_TEAMS = ["player 1", "player 2"]
+
+# Réinitialisation de l'endurance maximale tous les ENDURANCE_RESET_TURNS tours
+ENDURANCE_RESET_TURNS = 5
+
+# Effets du terrain sur une unité qui y entre : (points de vie, endurance) par type d'unité
+TERRAIN_EFFECTS = {
+    TERRAIN_MAGMA: {"Samurai": (-6, 0), "Shinobi": (-8, 0), "Sorceress": (-10, 0)},
+    TERRAIN_MUD:   {"Samurai": (0, -5), "Shinobi": (0, -2), "Sorceress": (0, -3)},
+    TERRAIN_WATER: {"Samurai": (0, -4), "Shinobi": (0, -1), "Sorceress": (0, -2)},
+    TERRAIN_BUSH:  {"Samurai": (0, 0), "Shinobi": (-1, 0), "Sorceress": (-1, 0)},
+}
+HEALING_TERRAIN_AMOUNT = 10  # soin commun des cases healing
+TERRAIN_RESETS_TURN_COUNTER = [TERRAIN_MUD, TERRAIN_WATER]
+
+# Bonus d'équilibrage (dégâts supplémentaires)
+ICHIMONJI_ENEMY_BONUS = 6         # Ichimonji lancé par l'IA
+SHADOW_BERSERK_ENEMY_BONUS = 4    # Shadow Berserk lancé par l'IA
+PURPLE_CHAOS_PLAYER_1_MALUS = 8   # Purple Chaos contre une unité de "player 1"
+
+
+
+
+def skill_damage(damage, defense):
+    """
+    Dégâts d'une compétence après la défense de la cible.
+
+    Paramètres :
+    -----------
+    - damage : int
+        Dégâts de base de la compétence.
+    - defense : int
+        Défense de la cible (en pourcentage).
+
+    Retourne :
+    ---------
+    - int : les dégâts infligés.
+    """
+    return int(damage * (1 - defense / 100))
+
+
+
+
+def in_bounds(x, y):
+    """Vérifie si la cellule (x, y) est sur la carte."""
+    return 0 <= x < GRID_SIZE_WIDTH and 0 <= y < GRID_SIZE_HEIGHT
+
+
+
+
+def square_area(center_x, center_y, radius):
+    """Retourne les cellules de la carte dans le carré de rayon radius autour de (center_x, center_y)."""
+    return [(center_x + dx, center_y + dy)
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+            if in_bounds(center_x + dx, center_y + dy)]
+
+
+
+
+def load_poison_zones(filename):
+    """Charge les zones de poison depuis un fichier CSV (une case '*' par flacon)."""
+    zones = []
+    with open_text(filename) as file:
+        reader = csv.reader(file)
+        for y, row in enumerate(reader):
+            for x, cell in enumerate(row):
+                if cell == '*':
+                    zones.append((x, y))  # Ajouter la position du flacon (x, y)
+    return zones
+
+
+
+
+class Fighter:
+    """
+    Classe pour représenter l'état d'une unité, sans affichage.
+
+    Attributs :
+    ----------
+    - x, y : int
+        Position de l'unité sur la grille.
+    - health, max_health : int
+        Points de santé actuels et maximum.
+    - attack_power : int
+        Puissance d'attaque de l'unité.
+    - endurence_max_init, endurence_max, endurence : int
+        Endurance maximale initiale, maximale actuelle et restante pour ce tour.
+    - defense : int
+        Défense de l'unité (en pourcentage).
+    - team : str
+        Équipe de l'unité ('player 1', 'player 2' ou 'enemy').
+    - name : str
+        Nom de l'unité.
+    - skills : list
+        Les compétences de l'unité.
+    - archetype : str
+        Type d'unité ("Sorceress", "Samurai", "Shinobi") pour les effets du terrain.
+    """
+
+    archetype = None
+
+
+
+
+    def __init__(self, x, y, health, attack_power, endurence_max, team, name, defense=0):
+        self.x = x
+        self.y = y
+        self.health = health
+        self.max_health = health
+        self.attack_power = attack_power
+        self.endurence_max_init = endurence_max
+        self.endurence_max = endurence_max
+        self.endurence = self.endurence_max
+        self.defense = defense
+        self.team = team  # 'player 1' , 'player 2' ou 'enemy'
+        self.name = name
+        self.skills = []
+
+
+
+
+    def move(self, dx, dy, match):
+        """
+        Déplace l'unité de (dx, dy) et applique l'effet du terrain d'arrivée.
+
+        Paramètres :
+        -----------
+        - dx, dy : int
+            Déplacement en x et en y.
+        - match : MatchState
+            La partie en cours.
+
+        Retourne :
+        ---------
+        - int : le type de terrain d'arrivée, ou None si le déplacement est impossible.
+        """
+        new_x = self.x + dx
+        new_y = self.y + dy
+
+        # Verifie si les nouvelles coordonées ne sortent pas de la map, ne sont pas un mur ni occupées
+        if not in_bounds(new_x, new_y) or match.is_wall(new_x, new_y):
+            return None
+        if match.occupancy.is_occupied(new_x, new_y):
+            return None
+
+        # Vérifie que l'unité a suffisamment d'endurance pour se déplacer
+        if self.endurence <= -1:
+            print(f"{self.name} n'a plus assez d'endurance pour se déplacer.")
+            return None
+
+        # Met à jour la position (et l'index d'occupation)
+        match.occupancy.move(self, new_x, new_y)
+
+        terrain = match.terrain.terrain_at(self.x, self.y)
+        self.apply_terrain(terrain, match)
+        return terrain
+
+
+
+
+    def apply_terrain(self, terrain, match):
+        """Applique l'effet d'un type de terrain sur l'unité (voir TERRAIN_EFFECTS)."""
+        if terrain == TERRAIN_HEALING:
+            # S'assure que la santé ne dépasse pas le maximum
+            self.health = min(self.health + HEALING_TERRAIN_AMOUNT, self.max_health)
+
+        elif terrain in TERRAIN_EFFECTS:
+            health, endurance = TERRAIN_EFFECTS[terrain].get(self.archetype, (0, 0))
+            self.health += health
+            self.endurence_max += endurance
+            self.endurence += endurance
+
+        if terrain in TERRAIN_RESETS_TURN_COUNTER:
+            match.turn_counter = 0 # Réinitialisation du compteur
+
+        # Vérifie que l'endurance ne soit pas négative
+        if self.endurence_max <= 0:
+            self.endurence_max = 1
+        if self.endurence <= 0:
+            self.endurence = 0
+
+
+
+
+    def attack(self, target):
+        """
+        Attaque une cible donnée si elle est à portée.
+        """
+        if abs(self.x - target.x) <= 1 and abs(self.y - target.y) <= 1:
+            target.health -= self.attack_power
+
+
+
+
+class SkillRules:
+    """
+    Classe de base pour les effets d'une compétence, sans affichage.
+
+    Les compétences de unit.py héritent de ces classes : elles gèrent la sélection de la cible
+    et les animations, puis appellent les méthodes ci-dessous pour appliquer les effets.
+    """
+
+    name = ""
+    damage = 0
+    range = 0
+    AI_compatible = False
+
+
+
+
+    def hit(self, target, match, bonus=0):
+        """
+        Inflige les dégâts de la compétence à une cible et la retire de la partie si elle meurt.
+
+        Retourne :
+        ---------
+        - int : les dégâts infligés.
+        """
+        dealt = skill_damage(self.damage, target.defense) + bonus
+        target.health -= dealt
+        match.record_damage(self.name, dealt)
+        if target.health <= 0:
+            match.remove_unit(target)
+        return dealt
+
+
+
+
+    def hit_cells(self, owner, match, cells):
+        """Frappe les unités présentes dans les cellules (sauf le lanceur). Retourne les unités touchées."""
+        targets = [unit for unit in match.occupancy.units_in(cells) if unit != owner]
+        for target in targets:
+            self.hit(target, match)
+        return targets
+
+
+
+
+    def auto_use(self, owner, match):
+        """
+        Utilisation automatique par l'IA, sans affichage.
+        Retourne True si la compétence a eu un effet.
+        """
+        return False
+
+
+
+
+    def preview(self, owner, match):
+        """
+        Effet qu'aurait auto_use, sans modifier la partie : les mêmes règles sont jouées sur une copie
+        (clone_match), sans affichage ni son.
+
+        Retourne :
+        ---------
+        - dict[Fighter, int] : les points de vie perdus par chaque unité touchée (négatif pour un soin).
+        """
+        state = clone_match(match)
+        units = match.all_units()
+        copies = state.all_units()
+        copy = copies[units.index(owner)]
+        copy.skills[owner.skills.index(self)].auto_use(copy, state)
+        return {unit: unit.health - after.health for unit, after in zip(units, copies) if after.health != unit.health}
+
+
+
+
+    def expected_damage(self, owner, target):
+        """Points de vie qu'une cible perdrait dans la zone, comptés en négatif pour un allié du lanceur."""
+        dealt = min(skill_damage(self.damage, target.defense), max(target.health, 0))
+        return dealt if target.team != owner.team else -dealt
+
+
+
+
+    def best_anchors(self, owner, match, k=1):
+        """
+        Retourne les k meilleurs centres pour la zone de la compétence (empreintes de FOOTPRINTS),
+        sous la forme (dégâts attendus, (x, y), empreinte), du meilleur au moins bon.
+        """
+        scored = []
+        for footprint in FOOTPRINTS.get(self.name, []):
+            value = lambda unit: self.expected_damage(owner, unit)
+            for score, anchor in top_anchors(owner, match, footprint, value, k):
+                scored.append((score, anchor, footprint))
+        scored.sort(key=lambda item: -item[0])
+        return scored[:k]
+
+
+
+
+    def suggested_target(self, owner, match):
+        """Centre suggéré au joueur pour viser la zone : le meilleur de best_anchors, sinon le lanceur."""
+        best = self.best_anchors(owner, match)
+        return best[0][1] if best else (owner.x, owner.y)
+
+
+
+
+class LineSkillRules(SkillRules):
+    """Compétences lancées en ligne droite depuis le lanceur (Sky Clear, Shuriken)."""
+
+    length = 3
+
+
+
+
+    def line(self, owner, direction):
+        """Retourne les cellules de la trajectoire dans une direction ("up", "down", "left", "right")."""
+        dx, dy = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}.get(direction, (0, 0))
+        if (dx, dy) == (0, 0):
+            return []
+        return [(owner.x + dx * i, owner.y + dy * i) for i in range(1, self.length + 1)]
+
+
+
+
+    def apply(self, owner, match, cells):
+        """Frappe les unités sur la trajectoire."""
+        return self.hit_cells(owner, match, [(x, y) for x, y in cells if in_bounds(x, y)])
+
+
+
+
+class IchimonjiRules(SkillRules):
+    name = "Ichimonji"
+    damage = 14
+    range = 2
+    AI_compatible = True
+
+
+
+
+    def find_target(self, owner, match):
+        """
+        Première cible à portée : une unité adverse pour un joueur, une unité de "player 1" pour l'IA.
+        """
+        if owner.team == "enemy":
+            candidates = match.player_units
+        else:
+            candidates = [unit for unit in match.all_units() if unit.team != owner.team]
+        for unit in candidates:
+            if abs(owner.x - unit.x) <= self.range and abs(owner.y - unit.y) <= self.range:
+                return unit
+        return None
+
+
+
+
+    def apply(self, owner, target, match):
+        """Frappe la cible (avec le bonus d'équilibrage si le lanceur est l'IA)."""
+        bonus = ICHIMONJI_ENEMY_BONUS if owner.team == "enemy" else 0
+        return self.hit(target, match, bonus)
+
+
+
+
+    def auto_use(self, owner, match):
+        target = self.find_target(owner, match)
+        if target is None:
+            return False
+        self.apply(owner, target, match)
+        return True
+
+
+
+
+class SkyClearRules(LineSkillRules):
+    name = "Sky Clear"
+    damage = 16
+    range = 3
+    length = 3
+
+
+
+
+class SamuraiGraveRules(SkillRules):
+    name = "Samurai Grave"
+    damage = 10
+    range = 2
+
+
+
+
+    def area(self, target_x, target_y):
+        """Zone 3x3 autour de la cible."""
+        return square_area(target_x, target_y, 1)
+
+
+
+
+    def apply(self, owner, match, target_x, target_y):
+        """Frappe toutes les unités de la zone, lanceur compris."""
+        targets = match.occupancy.units_in(self.area(target_x, target_y))
+        for target in targets:
+            self.hit(target, match)
+        return targets
+
+
+
+
+class PurpleChaosRules(SkillRules):
+    name = "Purple Chaos"
+    damage = 10
+    range = 3
+    AI_compatible = True
+
+
+
+
+    def area(self, target_x, target_y):
+        """Zone 3x3 autour de la cible."""
+        return square_area(target_x, target_y, 1)
+
+
+
+
+    def choose_target(self, owner, match):
+        """
+        Cible de l'IA : le centre de zone à portée qui inflige le plus de dégâts aux adversaires,
+        moins ceux subis par les alliés du lanceur (et par lui-même). Retourne (x, y) ou None.
+        """
+        best = self.best_anchors(owner, match)
+        return best[0][1] if best else None
+
+
+
+
+    def expected_damage(self, owner, target):
+        """Points de vie qu'une cible perdrait dans la zone, comptés en négatif pour un allié du lanceur."""
+        malus = PURPLE_CHAOS_PLAYER_1_MALUS if target.team == "player 1" else 0
+        dealt = min(skill_damage(self.damage, target.defense) + malus, max(target.health, 0))
+        return dealt if target.team != owner.team else -dealt
+
+
+
+
+    def apply(self, match, target_x, target_y):
+        """Frappe toutes les unités de la zone (les unités de "player 1" subissent un malus d'équilibrage)."""
+        targets = match.occupancy.units_in(self.area(target_x, target_y))
+        for target in targets:
+            malus = PURPLE_CHAOS_PLAYER_1_MALUS if target.team == "player 1" else 0
+            self.hit(target, match, malus)
+        return targets
+
+
+
+
+    def auto_use(self, owner, match):
+        target = self.choose_target(owner, match)
+        if target is None:
+            return False
+        self.apply(match, *target)
+        return True
+
+
+
+
+class PoisonMasterRules(SkillRules):
+    name = "Poison Apocalypse"
+    damage = 10
+    range = 6
+    maps = ["data/maps/map_poison_1.csv", "data/maps/map_poison_2.csv", "data/maps/map_poison_3.csv"]
+    patterns = None  # masques compilés des cartes (PatternMask), partagés par toutes les instances
+
+
+
+
+    @classmethod
+    def compile_patterns(cls):
+        """Retourne les masques des cartes de poison (compilés ou relus du disque au premier appel)."""
+        if cls.patterns is None:
+            cls.patterns = [PatternMask.for_file(filename, GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT)
+                            for filename in cls.maps]
+        return cls.patterns
+
+
+
+
+    def apply(self, owner, match, zones):
+        """Frappe les unités présentes sur les flacons de poison (sauf le lanceur)."""
+        return self.hit_cells(owner, match, zones)
+
+
+
+
+    def apply_pattern(self, owner, match, pattern):
+        """
+        Frappe les unités présentes dans le masque d'une carte de poison (sauf le lanceur) :
+        le masque est croisé avec le bitset des cellules occupées. Retourne les unités touchées.
+        """
+        targets = [unit for unit in match.occupancy.units_in_mask(pattern) if unit != owner]
+        for target in targets:
+            self.hit(target, match)
+        return targets
+
+
+
+
+    def expected_damage(self, owner, target):
+        if target is owner:
+            return 0
+        return super().expected_damage(owner, target)
+
+
+
+
+class HealerRules(SkillRules):
+    name = "Healing"
+    heal_amount = 14  # Montant de soin par unité
+    damage = 5 # to avoid bugs when this attribute is called outside
+    range = 3  # Portée de la compétence
+
+
+
+
+    def area(self, target_x, target_y):
+        """Zone de soin autour du lanceur."""
+        return [(target_x + 1 + dx, target_y + 1 + dy)
+                for dx in range(-self.range, self.range - 1)
+                for dy in range(-self.range, self.range - 1)
+                if in_bounds(target_x + 1 + dx, target_y + 1 + dy)]
+
+
+
+
+    def apply(self, owner, match):
+        """Soigne les unités des joueurs dans la zone. Retourne les cellules de la zone."""
+        cells = self.area(owner.x, owner.y)
+        for target in match.occupancy.units_in(cells):
+            if target.team in PLAYER_TEAMS:  # Allié dans les deux équipes
+                # Assurer que les PV ne dépassent pas la capacité maximale de l'unité
+                target.health = min(target.health + self.heal_amount, target.max_health)
+        return cells
+
+
+
+
+class ShurikenRules(LineSkillRules):
+    name = "Shuriken"
+    damage = 13
+    range = 4
+    length = 4
+
+
+
+
+class AssasinFlickerRules(SkillRules):
+    name = "Death Shadow"
+    damage = 12
+    range = 4
+
+
+
+
+    def landing_cells(self, target, match):
+        """Cellules libres autour de la cible où le lanceur peut se téléporter."""
+        cells = []
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            x, y = target.x + dx, target.y + dy
+            if in_bounds(x, y) and not match.occupancy.is_occupied(x, y):
+                cells.append((x, y))
+        return cells
+
+
+
+
+    def apply(self, owner, match, target, position):
+        """Téléporte le lanceur à côté de la cible puis la frappe."""
+        match.occupancy.move(owner, *position)
+        return self.hit(target, match)
+
+
+
+
+class ShadowBerserkRules(SkillRules):
+    name = "Shadow Berserk"
+    damage = 12
+    range = 2
+    AI_compatible = True
+
+
+
+
+    def targets(self, owner, match):
+        """Unités adverses dans la zone d'effet autour du lanceur."""
+        return [unit for unit in match.occupancy.units_in(square_area(owner.x, owner.y, self.range))
+                if unit.team != owner.team]
+
+
+
+
+    def adjacent_position(self, target, match):
+        """
+        Trouve une position libre adjacente à une cible (target).
+        Retourne une position (x, y) ou None si aucune position n'est disponible.
+        """
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            x, y = target.x + dx, target.y + dy
+            if in_bounds(x, y) and not match.occupancy.is_occupied(x, y):
+                return x, y
+        return None
+
+
+
+
+    def shadow_positions(self, owner, match):
+        """Retourne les couples (position de l'ombre, cible) pour chaque cible qui a une case libre à côté."""
+        shadows = []
+        for target in self.targets(owner, match):
+            position = self.adjacent_position(target, match)
+            if position:
+                shadows.append((position, target))
+        return shadows
+
+
+
+
+    def strike(self, owner, target, match):
+        """Une ombre frappe sa cible (avec le bonus d'équilibrage si le lanceur est l'IA)."""
+        bonus = SHADOW_BERSERK_ENEMY_BONUS if owner.team == "enemy" else 0
+        return self.hit(target, match, bonus)
+
+
+
+
+    def expected_damage(self, owner, target):
+        """Seules les unités adverses sont frappées, avec le bonus d'équilibrage de l'IA."""
+        if target.team == owner.team:
+            return 0
+        bonus = SHADOW_BERSERK_ENEMY_BONUS if owner.team == "enemy" else 0
+        return min(skill_damage(self.damage, target.defense) + bonus, max(target.health, 0))
+
+
+
+
+    def auto_use(self, owner, match):
+        shadows = self.shadow_positions(owner, match)
+        for position, target in shadows:
+            self.strike(owner, target, match)
+        return bool(shadows)
+
+
+
+
+# Zones d'effet des compétences (footprints.py)
+register(SamuraiGraveRules.name, Footprint.square("3x3", 1, SamuraiGraveRules.range))
+register(PurpleChaosRules.name, Footprint.square("3x3", 1, PurpleChaosRules.range))
+register(ShadowBerserkRules.name, Footprint.square("5x5", ShadowBerserkRules.range, 0))
+register(PoisonMasterRules.name, *[Footprint.from_csv(filename) for filename in PoisonMasterRules.maps])
+
+# Caractéristiques de chaque type d'unité
+ARCHETYPES = {
+    "Sorceress": {"health": 30, "attack_power": 8, "endurence_max": 6, "defense": 15,
+                  "skills": [PurpleChaosRules, PoisonMasterRules, HealerRules]},
+    "Samurai": {"health": 30, "attack_power": 10, "endurence_max": 8, "defense": 30,
+                "skills": [IchimonjiRules, SkyClearRules, SamuraiGraveRules]},
+    "Shinobi": {"health": 30, "attack_power": 12, "endurence_max": 10, "defense": 20,
+                "skills": [ShurikenRules, AssasinFlickerRules, ShadowBerserkRules]},
+}
+
+# Personnages jouables et leur type
+ROSTER = {"Yennefer": "Sorceress", "Shogun": "Samurai", "Sekiro": "Shinobi"}
+
+
+
+
+def create_fighter(name, team, x=0, y=0):
+    """
+    Crée une unité sans affichage à partir du nom d'un personnage de ROSTER.
+    """
+    archetype = ROSTER[name]
+    stats = ARCHETYPES[archetype]
+    fighter = Fighter(x, y, stats["health"], stats["attack_power"], stats["endurence_max"], team, name,
+                      defense=stats["defense"])
+    fighter.archetype = archetype
+    fighter.skills = [skill() for skill in stats["skills"]]
+    return fighter
+
+
+
+
+class MatchState:
+    """
+    Classe pour représenter l'état d'une partie, sans affichage.
+
+    Attributs :
+    ----------
+    - player_units, player2_units, enemy_units : list[Fighter]
+        Les unités de chaque équipe.
+    - occupancy : OccupancyIndex
+        Cellule (x, y) -> unité qui l'occupe.
+    - terrain : TerrainGrid
+        Le terrain de la carte.
+    - GameMode : str
+        "PvE" ou "PvP".
+    - difficulty : str
+        Difficulté de l'IA en PvE ("normal", "hard" ou "expert", voir search.DIFFICULTIES et mcts.py).
+    - turn_counter : int
+        Tours écoulés depuis la dernière réinitialisation de l'endurance.
+    - damage_by_skill : dict[str, int]
+        Dégâts infligés depuis le début de la partie, par compétence (statistiques des simulations).
+    """
+
+
+
+
+    def __init__(self):
+        # units
+        self.player_units = []
+        self.player2_units = []
+        self.enemy_units = []
+        self.occupancy = OccupancyIndex(width=GRID_SIZE_WIDTH)  # cellule (x, y) -> unité qui l'occupe
+
+        # terrain
+        self.terrain = TerrainGrid(GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT)
+
+        # game mode
+        self.GameMode = ""
+        self.difficulty = "normal"
+
+        # Compteur de tours
+        self.turn_counter = 0
+
+        # Dégâts par compétence
+        self.damage_by_skill = {}
+
+
+
+
+    def load_terrain(self, filename):
+        """Charge le terrain d'une carte depuis son CSV."""
+        self.terrain = TerrainGrid.from_csv(filename)
+
+
+
+
+    def is_wall(self, x, y):
+        """
+        Vérifie si une cellule est un mur.
+        """
+        return self.terrain.is_wall(x, y)
+
+
+
+
+    def all_units(self):
+        """Retourne toutes les unités en jeu."""
+        return self.player_units + self.player2_units + self.enemy_units
+
+
+
+
+    def place_team(self, team, units):
+        """
+        Place une équipe à ses positions de départ : "player 1" à gauche, les autres en bas à droite.
+        """
+        for i, unit in enumerate(units):
+            unit.team = team
+            if team == "player 1":
+                unit.x = 0
+                unit.y = 2 + i
+            else:
+                unit.x = GRID_SIZE_WIDTH - 1
+                unit.y = GRID_SIZE_HEIGHT - 3 - i
+
+        if team == "player 1":
+            self.player_units = units
+        elif team == "player 2":
+            self.player2_units = units
+        elif team == "enemy":
+            self.enemy_units = units
+
+        # positions de départ dans l'index d'occupation
+        self.occupancy.rebuild(self.all_units())
+
+
+
+
+    def remove_unit(self, unit):
+        """
+        Retire une unité morte de son équipe et de l'index d'occupation.
+        """
+        if unit in self.player_units:
+            self.player_units.remove(unit)
+        elif unit in self.player2_units:
+            self.player2_units.remove(unit)
+        elif unit in self.enemy_units:
+            self.enemy_units.remove(unit)
+        self.occupancy.remove(unit)
+
+
+
+
+    def remove_dead_units(self):
+        """
+        Retire toutes les unités qui n'ont plus de points de vie.
+        """
+        for unit in self.all_units():
+            if unit.health <= 0:
+                self.remove_unit(unit)
+
+
+
+
+    def record_damage(self, source, amount):
+        """Ajoute des dégâts infligés par une compétence (ou une attaque) aux statistiques de la partie."""
+        self.damage_by_skill[source] = self.damage_by_skill.get(source, 0) + amount
+
+
+
+
+    def reset_endurance(self):
+        """Réinitialise l'endurance de toutes les unités (alliées et ennemies)."""
+        for unit in self.all_units():
+            unit.endurence_max = unit.endurence_max_init  # Réinitialisation à la valeur initiale
+
+
+
+
+    def end_turn(self):
+        """
+        Incrémente le compteur de tours et réinitialise l'endurance tous les ENDURANCE_RESET_TURNS tours.
+
+        Retourne :
+        ---------
+        - bool : True si l'endurance a été réinitialisée.
+        """
+        self.turn_counter += 1
+        if self.turn_counter >= ENDURANCE_RESET_TURNS:
+            self.reset_endurance()
+            self.turn_counter = 0  # Réinitialiser le compteur après réinitialisation
+            return True
+        return False
+
+
+
+
+    def loser(self):
+        """
+        Retourne l'équipe décimée ("player 1", "player 2" ou "enemy"), ou None si la partie continue.
+        """
+        if self.GameMode == "PvE":
+            if len(self.enemy_units) == 0:
+                return "enemy"
+            elif len(self.player_units) == 0:
+                return "player 1"
+        elif self.GameMode == "PvP":
+            if len(self.player2_units) == 0:
+                return "player 2"
+            elif len(self.player_units) == 0:
+                return "player 1"
+        return None
+
+
+
+
+def clone_match(match):
+    """
+    Retourne une copie de l'état de la partie, sans affichage : les unités sont des Fighter
+    avec leurs propres compétences ; le terrain (lu seulement) est partagé.
+    """
+    state = MatchState()
+    state.terrain = match.terrain
+    state.GameMode = match.GameMode
+    state.turn_counter = match.turn_counter
+    for source, units in ((match.player_units, state.player_units),
+                          (match.player2_units, state.player2_units),
+                          (match.enemy_units, state.enemy_units)):
+        for unit in source:
+            units.append(clone_unit(unit))
+    state.occupancy.rebuild(state.all_units())
+    return state
+
+
+
+
+def clone_unit(unit):
+    """Retourne une copie sans affichage d'une unité (ses compétences sont celles de son type)."""
+    copy = Fighter(unit.x, unit.y, unit.health, unit.attack_power, unit.endurence_max_init, unit.team, unit.name,
+                   defense=unit.defense)
+    copy.max_health = unit.max_health
+    copy.endurence_max = unit.endurence_max
+    copy.endurence = unit.endurence
+    copy.archetype = unit.archetype
+    copy.skills = [skill() for skill in ARCHETYPES[unit.archetype]["skills"]]
+    return copy
@@ -0,0 +1,300 @@
+"""
+IA avec anticipation (difficulté "hard"), sans pygame.
+
+Pour une unité, la recherche essaie des plans (cellule d'arrivée, compétence ou non), puis les
+réponses des unités suivantes, sur des copies de l'état de la partie (rules.clone_match). Elle procède par
+approfondissement itératif avec élagage alpha-bêta : profondeur 1, puis 2, ... jusqu'à l'échéance.
+Le budget de temps est strict : on retourne le meilleur plan de la dernière profondeur terminée.
+"""
+
+import time
+
+import ai
+from movement import reachable_cells, path_to, follow_path
+from rules import clone_match
+from transposition import get_hasher, TranspositionTable, EXACT, LOWER, UPPER
+
+
+# Budget de réflexion par unité (secondes) pour chaque difficulté ; None : IA gloutonne de ai.py.
+# "hard" utilise la recherche alpha-bêta ci-dessous, "expert" la recherche Monte-Carlo de mcts.py.
+DIFFICULTIES = {"normal": None, "hard": 0.05, "expert": 0.5}
+
+DESTINATIONS_PER_UNIT = 6  # cellules d'arrivée essayées par unité (les plus proches d'un adversaire)
+KILL_VALUE = 20            # valeur d'une unité en vie, en plus de sa santé
+HEALTH_BUCKET = 2          # santés regroupées par 2 dans le hachage des états
+TABLE_SIZE = 1 << 14       # entrées de la table de transposition
+DISTANCE_WEIGHT = 2        # pénalité par case entre une unité et l'adversaire le plus proche (comme ai.evaluate_position)
+
+
+
+
+class SearchTimeout(Exception):
+    """Levée quand l'échéance de la recherche est dépassée (la profondeur en cours est abandonnée)."""
+
+
+
+
+def evaluate(state, team):
+    """
+    Valeur de l'état pour une équipe : santé et nombre d'unités en vie de chaque camp,
+    moins la distance de ses unités à l'adversaire le plus proche (pour ne pas rester à l'écart).
+    """
+    score = 0
+    allies = []
+    enemies = []
+    for unit in state.all_units():
+        if unit.team == team:
+            score += unit.health + KILL_VALUE
+            allies.append(unit)
+        else:
+            score -= unit.health + KILL_VALUE
+            enemies.append(unit)
+    if enemies:
+        for unit in allies:
+            score -= DISTANCE_WEIGHT * min(abs(unit.x - other.x) + abs(unit.y - other.y) for other in enemies)
+    return score
+
+
+
+
+def candidate_plans(state, unit):
+    """
+    Retourne les plans à essayer pour une unité : (chemin, index de compétence ou None).
+    Les cellules d'arrivée retenues sont les plus proches d'un adversaire (la position actuelle comprise).
+    """
+    enemies = ai.opponents(state, unit)
+    reached = reachable_cells(state, unit)
+    if enemies:
+        cells = sorted(reached, key=lambda cell: min(abs(cell[0] - other.x) + abs(cell[1] - other.y)
+                                                     for other in enemies))
+    else:
+        cells = list(reached)
+    cells = cells[:DESTINATIONS_PER_UNIT]
+    if (unit.x, unit.y) not in cells:
+        cells.append((unit.x, unit.y))
+
+    skills = [None] + [index for index, skill in enumerate(unit.skills) if skill.AI_compatible]
+    return [(path_to(reached, x, y), skill) for (x, y) in cells for skill in skills]
+
+
+
+
+def apply_plan(state, unit, plan):
+    """
+    Joue un plan sur un état (copie) : déplacement, compétence, puis attaque comme dans ai.play_turn.
+    """
+    path, skill = plan
+    follow_path(state, unit, path)
+    if skill is not None:
+        unit.skills[skill].auto_use(unit, state)
+    target = ai.find_best_target(state, unit)
+    if target:
+        unit.attack(target)
+    state.remove_dead_units()
+
+
+
+
+class PlanSearch:
+    """
+    Classe pour chercher le meilleur plan d'une unité avant une échéance.
+
+    Attributs :
+    ----------
+    - team : str
+        L'équipe de l'unité (celle qui maximise).
+    - deadline : float
+        Instant (time.perf_counter) au-delà duquel la recherche s'arrête.
+    - order : list[int]
+        Indices (dans all_units) des unités qui jouent à chaque profondeur : l'unité courante,
+        puis alternativement un adversaire et un allié.
+    - nodes : int
+        Nombre d'états évalués.
+    - table : TranspositionTable
+        Résultats déjà calculés, partagés par les profondeurs successives.
+    """
+
+
+
+
+    def __init__(self, match, unit, deadline):
+        units = match.all_units()
+        self.team = unit.team
+        self.deadline = deadline
+        self.nodes = 0
+        self.hasher = get_hasher(match.terrain.width, match.terrain.height, HEALTH_BUCKET)
+        self.table = TranspositionTable(TABLE_SIZE)
+
+        allies = [index for index, other in enumerate(units) if other.team == unit.team and other is not unit]
+        enemies = [index for index, other in enumerate(units) if other.team != unit.team]
+        self.order = [units.index(unit)]
+        while allies or enemies:
+            if enemies:
+                self.order.append(enemies.pop(0))
+            if allies:
+                self.order.append(allies.pop(0))
+
+
+
+
+    def check_deadline(self):
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+
+
+
+    def search(self, state, ids, ply, depth, alpha, beta):
+        """
+        Alpha-bêta sur les unités de self.order[ply:depth]. ids associe chaque unité de state
+        à son indice dans la partie d'origine (les unités mortes disparaissent de state).
+        """
+        self.check_deadline()
+        self.nodes += 1
+        if ply >= depth or state.loser() is not None:
+            return evaluate(state, self.team)
+
+        unit = ids.get(self.order[ply])
+        if unit is None:
+            # unité morte : son tour est passé
+            return self.search(state, ids, ply + 1, depth, alpha, beta)
+
+        # état déjà cherché (par une autre suite de plans ou à la profondeur précédente)
+        remaining = depth - ply
+        key = self.hasher.hash_units(ids, ply)
+        entry = self.table.lookup(key)
+        first = None
+        if entry is not None:
+            first = entry[4]
+            if entry[1] >= remaining:
+                value, bound = entry[2], entry[3]
+                if bound == EXACT:
+                    return value
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                elif bound == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        plans = candidate_plans(state, unit)
+        order = list(range(len(plans)))
+        if first is not None and first < len(plans):
+            # le meilleur plan connu est essayé en premier : plus de coupures
+            order.remove(first)
+            order.insert(0, first)
+
+        maximizing = unit.team == self.team
+        alpha_start, beta_start = alpha, beta
+        best = None
+        best_index = None
+        for index in order:
+            child, child_ids = self.play(state, ids, self.order[ply], plans[index])
+            value = self.search(child, child_ids, ply + 1, depth, alpha, beta)
+            if maximizing:
+                if best is None or value > best:
+                    best, best_index = value, index
+                alpha = max(alpha, value)
+            else:
+                if best is None or value < best:
+                    best, best_index = value, index
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if best <= alpha_start:
+            bound = UPPER
+        elif best >= beta_start:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, remaining, best, bound, best_index)
+        return best
+
+
+
+
+    def play(self, state, ids, index, plan):
+        """Retourne une copie de state où l'unité d'indice index a joué plan."""
+        child = clone_match(state)
+        units = state.all_units()
+        child_units = child.all_units()
+        child_ids = {key: child_units[units.index(unit)] for key, unit in ids.items()}
+        apply_plan(child, child_ids[index], plan)
+        alive = set(map(id, child.all_units()))
+        return child, {key: unit for key, unit in child_ids.items() if id(unit) in alive}
+
+
+
+
+    def root(self, state, ids, plans, depth):
+        """Cherche à la profondeur depth ; retourne les plans classés du meilleur au moins bon."""
+        scored = []
+        alpha = float("-inf")
+        for plan in plans:
+            child, child_ids = self.play(state, ids, self.order[0], plan)
+            value = self.search(child, child_ids, 1, depth, alpha, float("inf"))
+            scored.append((value, plan))
+            alpha = max(alpha, value)
+        # tri stable : à valeur égale, l'ordre de la profondeur précédente est conservé
+        scored.sort(key=lambda item: -item[0])
+        return [plan for value, plan in scored]
+
+
+
+
+def best_plan(match, unit, budget):
+    """
+    Cherche le meilleur plan de l'unité en au plus budget secondes.
+
+    Paramètres :
+    -----------
+    - match : MatchState
+        La partie en cours (elle n'est pas modifiée).
+    - unit : Fighter
+        L'unité qui va jouer.
+    - budget : float
+        Temps de réflexion maximum, en secondes.
+
+    Retourne :
+    ---------
+    - tuple[list[tuple[int, int]], int] : le chemin à suivre et l'index de la compétence à utiliser (ou None).
+    """
+    deadline = time.perf_counter() + budget
+
+    # plan de secours (IA gloutonne, compétence choisie après le déplacement) si même la profondeur 1
+    # n'a pas le temps de finir
+    path, skill_index = ai.greedy_plan(match, unit)
+    plan = (path or [], skill_index)
+
+    searcher = PlanSearch(match, unit, deadline)
+    state = clone_match(match)
+    ids = dict(enumerate(state.all_units()))
+    try:
+        plans = candidate_plans(state, ids[searcher.order[0]])
+        for depth in range(1, len(searcher.order) + 1):
+            plans = searcher.root(state, ids, plans, depth)
+            plan = plans[0]
+    except SearchTimeout:
+        pass
+    return plan
+
+
+
+
+def play_turn(match, unit, budget):
+    """
+    Joue le tour complet d'une unité avec la recherche, sans affichage (équivalent de ai.play_turn).
+    """
+    path, skill = best_plan(match, unit, budget)
+    follow_path(match, unit, path)
+    if skill is not None:
+        unit.skills[skill].auto_use(unit, match)
+
+    target = ai.find_best_target(match, unit)
+    if target:
+        health = target.health
+        unit.attack(target)
+        match.record_damage("Attack", health - target.health)
+
+    match.remove_dead_units()
@@ -0,0 +1,210 @@
+"""
+Parties automatiques IA contre IA, sans fenêtre, pour régler l'équilibrage.
+
+Chaque partie se joue en mode PvE : les deux équipes ("player 1" et "enemy") sont jouées par l'IA
+de ai.py, avec une graine fixe par partie pour pouvoir la rejouer à l'identique. Les parties sont
+réparties sur un pool de processus (multiprocessing).
+
+Exemples :
+    python simulate.py -n 200
+    python simulate.py -n 500 --map data/maps/map2.csv --workers 8
+    python simulate.py -n 200 --set SHADOW_BERSERK_ENEMY_BONUS=2 --set PURPLE_CHAOS_PLAYER_1_MALUS=4
+    python simulate.py -n 200 --set ShadowBerserkRules.damage=10
+    python simulate.py -n 50 --difficulty hard
+    python simulate.py -n 50 --difficulty expert --mcts-iterations 200
+"""
+
+import argparse
+import ast
+import multiprocessing
+import random
+import statistics
+
+import ai
+import rules
+import search
+import mcts
+from influence import InfluenceMap
+
+
+
+
+def apply_overrides(overrides):
+    """
+    Modifie des constantes d'équilibrage de rules.py (dans le processus courant).
+
+    Paramètres :
+    -----------
+    - overrides : list[tuple[str, object]]
+        Couples (nom, valeur). Le nom est une constante du module ("SHADOW_BERSERK_ENEMY_BONUS")
+        ou un attribut de classe ("ShadowBerserkRules.damage").
+    """
+    for name, value in overrides:
+        target = rules
+        *path, attribute = name.split(".")
+        for part in path:
+            target = getattr(target, part)
+        if not hasattr(target, attribute):
+            raise AttributeError(f"rules.{name} n'existe pas")
+        setattr(target, attribute, value)
+
+
+
+
+def parse_override(text):
+    """Lit une option --set NOM=VALEUR (la valeur est un littéral Python : 4, 0.5, ...)."""
+    name, separator, value = text.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"format attendu NOM=VALEUR : {text}")
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f"valeur invalide : {text}")
+    return name.strip(), value
+
+
+
+
+def play_match(map_file, seed, team1, team2, max_rounds, difficulty="normal", mcts_iterations=100):
+    """
+    Joue une partie complète sans affichage.
+
+    Paramètres :
+    -----------
+    - map_file : str
+        Le CSV de la carte.
+    - seed : int
+        Graine de la partie.
+    - team1, team2 : list[str]
+        Les personnages (noms de rules.ROSTER) de "player 1" et de "enemy".
+    - max_rounds : int
+        Nombre de tours au-delà duquel la partie est déclarée nulle.
+    - difficulty : str
+        Difficulté de l'IA de "enemy" (voir search.DIFFICULTIES) ; "player 1" joue toujours en "normal".
+    - mcts_iterations : int
+        Itérations de la recherche Monte-Carlo en "expert" (graine tirée de celle de la partie,
+        un seul processus : la partie reste reproductible).
+
+    Retourne :
+    ---------
+    - dict : graine, équipe gagnante (None si nulle), nombre de tours et dégâts par compétence.
+    """
+    rng = random.Random(seed)
+    match = rules.MatchState()
+    match.GameMode = "PvE"
+    match.load_terrain(map_file)
+    match.place_team("player 1", [rules.create_fighter(name, "player 1") for name in team1])
+    match.place_team("enemy", [rules.create_fighter(name, "enemy") for name in team2])
+
+    rounds = 0
+    while match.loser() is None and rounds < max_rounds:
+        rounds += 1
+        for team in ("player 1", "enemy"):
+            # une carte d'influence par tour d'équipe, partagée par ses unités
+            influence = InfluenceMap(match, team)
+            for unit in [unit for unit in match.all_units() if unit.team == team]:
+                if unit.health <= 0 or match.loser() is not None:
+                    continue
+                budget = search.DIFFICULTIES[difficulty] if team == "enemy" else None
+                if budget and difficulty == "expert":
+                    mcts.play_turn(match, unit, iterations=mcts_iterations, seed=rng.randrange(2 ** 32), workers=1)
+                elif budget:
+                    search.play_turn(match, unit, budget)
+                else:
+                    ai.play_turn(match, unit, rng, influence)
+        match.end_turn()
+
+    loser = match.loser()
+    winner = None
+    if loser == "enemy":
+        winner = "player 1"
+    elif loser == "player 1":
+        winner = "enemy"
+    return {"seed": seed, "winner": winner, "rounds": rounds, "damage": dict(match.damage_by_skill)}
+
+
+
+
+def play_match_task(task):
+    """Point d'entrée des processus du pool (un seul argument)."""
+    return play_match(*task)
+
+
+
+
+def run(matches, map_file, seed, team1, team2, max_rounds, workers, overrides=(), difficulty="normal",
+        mcts_iterations=100):
+    """
+    Joue plusieurs parties, en parallèle si workers > 1, et retourne leurs résultats triés par graine.
+    """
+    # appliquées ici aussi pour signaler une constante inconnue avant de lancer le pool
+    apply_overrides(overrides)
+
+    tasks = [(map_file, seed + i, team1, team2, max_rounds, difficulty, mcts_iterations) for i in range(matches)]
+    if workers <= 1:
+        results = [play_match_task(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(workers, initializer=apply_overrides, initargs=(list(overrides),)) as pool:
+            chunksize = max(1, matches // (workers * 4))
+            results = list(pool.imap_unordered(play_match_task, tasks, chunksize))
+    return sorted(results, key=lambda result: result["seed"])
+
+
+
+
+def summarize(results):
+    """Affiche les taux de victoire, la durée des parties et les dégâts par compétence."""
+    count = len(results)
+    print(f"{count} parties")
+
+    for winner in ("player 1", "enemy", None):
+        wins = sum(1 for result in results if result["winner"] == winner)
+        label = winner if winner else "nulle"
+        print(f"  {label:10} : {wins:5} ({100 * wins / count:.1f} %)")
+
+    rounds = [result["rounds"] for result in results]
+    print(f"durée (tours) : moyenne {statistics.mean(rounds):.1f}, médiane {statistics.median(rounds)}, "
+          f"min {min(rounds)}, max {max(rounds)}")
+
+    totals = {}
+    for result in results:
+        for skill, damage in result["damage"].items():
+            totals[skill] = totals.get(skill, 0) + damage
+    print("dégâts par compétence (total, moyenne par partie) :")
+    for skill, damage in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f"  {skill:18} : {damage:7} ({damage / count:.1f})")
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parties automatiques IA contre IA (mode PvE, sans fenêtre).")
+    parser.add_argument("-n", "--matches", type=int, default=100, help="nombre de parties")
+    parser.add_argument("--map", default="data/maps/map1.csv", help="CSV de la carte")
+    parser.add_argument("--seed", type=int, default=0, help="graine de la première partie (partie i : seed + i)")
+    parser.add_argument("--team1", default=",".join(rules.ROSTER), help="personnages de player 1, séparés par des virgules")
+    parser.add_argument("--team2", default=",".join(rules.ROSTER), help="personnages de enemy, séparés par des virgules")
+    parser.add_argument("--max-rounds", type=int, default=200, help="tours avant de déclarer la partie nulle")
+    parser.add_argument("--difficulty", choices=list(search.DIFFICULTIES), default="normal",
+                        help="difficulté de l'IA de enemy (\"hard\" dépend du temps de calcul : résultats non reproductibles)")
+    parser.add_argument("--mcts-iterations", type=int, default=100, help="itérations par coup en \"expert\"")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="nombre de processus")
+    parser.add_argument("--set", dest="overrides", type=parse_override, action="append", default=[],
+                        metavar="NOM=VALEUR", help="modifier une constante de rules.py (répétable)")
+    args = parser.parse_args()
+
+    team1 = [name.strip() for name in args.team1.split(",")]
+    team2 = [name.strip() for name in args.team2.split(",")]
+    for name in team1 + team2:
+        if name not in rules.ROSTER:
+            parser.error(f"personnage inconnu : {name} (choix : {', '.join(rules.ROSTER)})")
+
+    results = run(args.matches, args.map, args.seed, team1, team2, args.max_rounds, args.workers, args.overrides,
+                  args.difficulty, args.mcts_iterations)
+    summarize(results)
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Banque de sons décodés à l'avance et canaux du mélangeur réservés par catégorie.
+
+Décoder un mp3 prend du temps : fait au moment d'une compétence, il retarde son animation. La banque
+décode tous les sons des compétences et des terrains une fois, dans les threads de chargement de
+assets.py, pendant que le jeu démarre. Chaque catégorie (terrain, compétence, interface) joue sur ses propres canaux réservés :
+les bruits de pas ne coupent jamais une compétence, et inversement.
+"""
+
+import pygame
+
+from assets import assets
+
+
+SOUND_DIRECTORIES = ["data/skills", "data/map_sound_effects"]  # sons décodés au chargement
+SOUND_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+# Canaux réservés : catégorie -> nombre de canaux (deux sons de compétence peuvent se superposer)
+CHANNELS = {"terrain": 1, "skill": 4, "ui": 1}
+FREE_CHANNELS = 8  # canaux laissés aux sons joués sans catégorie (Sound.play)
+
+
+
+
+class SoundBank:
+    """
+    Classe pour garder les sons décodés et les jouer sur les canaux de leur catégorie.
+
+    Attributs :
+    ----------
+    - paths : list[str]
+        Sons à décoder au chargement.
+    - sounds : dict[str, pygame.mixer.Sound]
+        Sons déjà décodés, par chemin (épinglés dans assets : hors du budget des images).
+    - channels : dict[str, list[pygame.mixer.Channel]]
+        Canaux réservés de chaque catégorie (créés à la première utilisation du mélangeur).
+    - turns : dict[str, int]
+        Prochain canal à réutiliser dans chaque catégorie quand ils sont tous occupés.
+    - requested : bool
+        True quand le décodage en arrière-plan a été demandé (preload).
+    """
+
+
+
+
+    def __init__(self, directories=SOUND_DIRECTORIES):
+        self.paths = []
+        for directory in directories:
+            self.paths += [directory + "/" + name for name in assets.listdir(directory)
+                           if name.lower().endswith(SOUND_EXTENSIONS)]
+        self.sounds = {}
+        self.channels = {}
+        self.turns = {}
+        self.requested = False
+
+
+
+
+    def reserve_channels(self):
+        """Réserve les canaux de chaque catégorie (pygame.mixer doit être initialisé)."""
+        if self.channels:
+            return
+        reserved = sum(CHANNELS.values())
+        if pygame.mixer.get_num_channels() < reserved + FREE_CHANNELS:
+            pygame.mixer.set_num_channels(reserved + FREE_CHANNELS)
+        pygame.mixer.set_reserved(reserved)  # les canaux 0 .. reserved-1 ne sont plus choisis par Sound.play
+        index = 0
+        for category, count in CHANNELS.items():
+            self.channels[category] = [pygame.mixer.Channel(index + offset) for offset in range(count)]
+            self.turns[category] = 0
+            index += count
+
+
+
+
+    def preload(self, priority=0):
+        """
+        Lance le décodage de tous les sons en arrière-plan (assets.preload).
+        Un son demandé avant la fin est décodé à la demande, ou attendu s'il est en cours (une seule fois).
+        """
+        self.reserve_channels()
+        if not self.requested:
+            self.requested = True
+            assets.preload([(self.get, path) for path in self.paths], priority)
+
+
+
+
+    def get(self, path):
+        """Retourne le son décodé d'un fichier."""
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = assets.sound(path, pinned=True)
+            self.sounds[path] = sound
+        return sound
+
+
+
+
+    def channel(self, category):
+        """Retourne un canal libre de la catégorie, sinon ses canaux sont réutilisés à tour de rôle."""
+        self.reserve_channels()
+        channels = self.channels[category]
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        channel = channels[self.turns[category]]
+        self.turns[category] = (self.turns[category] + 1) % len(channels)
+        return channel
+
+
+
+
+    def play(self, path, category="skill"):
+        """
+        Joue un son sur un canal de sa catégorie.
+
+        Paramètres :
+        -----------
+        - path : str
+            Chemin du son.
+        - category : str
+            "terrain", "skill" ou "ui" (clés de CHANNELS).
+
+        Retourne :
+        ---------
+        - pygame.mixer.Sound : le son joué (pour sa durée).
+        """
+        sound = self.get(path)
+        self.channel(category).play(sound)
+        return sound
+
+
+
+
+    def stop(self, category):
+        """Arrête les sons d'une catégorie."""
+        self.reserve_channels()
+        for channel in self.channels[category]:
+            channel.stop()
+
+
+
+
+# Banque partagée par tout le jeu
+sound_bank = SoundBank()
@@ -0,0 +1,17 @@
+"""
+Configuration commune des tests : les modules du jeu sont à la racine du dépôt, et pygame
+tourne sans fenêtre ni carte son.
+
+Lancer les tests depuis la racine du dépôt :
+    python -m pytest -q
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # les chemins des cartes (data/maps/...) sont relatifs à la racine
@@ -0,0 +1,47 @@
+"""Tests du champ de vision (fov.py) sur les cartes du jeu."""
+
+import hashlib
+
+import pytest
+
+from assetpack import read_file
+from fov import LineOfSightTable, bresenham_visible_cells, compute_visible_cells
+from grid import TerrainGrid
+
+
+MAPS = ["data/maps/map1.csv", "data/maps/map2.csv"]
+
+
+
+
+@pytest.mark.parametrize("radius", [6, 10])
+@pytest.mark.parametrize("filename", MAPS)
+def test_ray_tree_matches_bresenham(filename, radius):
+    """Le parcours de l'arbre des rayons voit exactement les cellules de la règle de Bresenham, partout sur la carte."""
+    terrain = TerrainGrid.from_csv(filename)
+    mismatches = []
+    for x in range(terrain.width):
+        for y in range(terrain.height):
+            if terrain.is_wall(x, y):
+                continue
+            if (compute_visible_cells(x, y, terrain.is_wall, terrain.width, terrain.height, radius)
+                    != bresenham_visible_cells(x, y, terrain.is_wall, terrain.width, terrain.height, radius)):
+                mismatches.append((x, y))
+    assert mismatches == []
+
+
+
+
+@pytest.mark.parametrize("filename", MAPS)
+def test_line_of_sight_table_matches_ray_tree(filename, tmp_path):
+    """La table pré-calculée, relue depuis son fichier, donne la même vision que le calcul direct."""
+    terrain = TerrainGrid.from_csv(filename)
+    source_hash = hashlib.sha256(read_file(filename)).digest()
+    table = LineOfSightTable.build(terrain.is_wall, terrain.width, terrain.height, 6, source_hash)
+    table.save(tmp_path / "map.los")
+    table = LineOfSightTable.load(tmp_path / "map.los")
+    assert table is not None and table.source_hash == source_hash
+    for x in range(terrain.width):
+        for y in range(terrain.height):
+            assert table.visible_cells(x, y) == compute_visible_cells(x, y, terrain.is_wall,
+                                                                      terrain.width, terrain.height, 6)
@@ -0,0 +1,59 @@
+"""Tests du mode à graine fixe de la recherche Monte-Carlo (mcts.py)."""
+
+import multiprocessing
+
+import pytest
+
+import mcts
+import rules
+
+
+
+
+def new_match():
+    """Partie PvE sur map1, trois unités par équipe à leurs positions de départ."""
+    match = rules.MatchState()
+    match.GameMode = "PvE"
+    match.load_terrain("data/maps/map1.csv")
+    match.place_team("player 1", [rules.create_fighter(name, "player 1") for name in rules.ROSTER])
+    match.place_team("enemy", [rules.create_fighter(name, "enemy") for name in rules.ROSTER])
+    return match
+
+
+
+
+@pytest.fixture
+def pool():
+    """Pool de deux processus créé depuis le thread principal, fermé après le test."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork n'est pas disponible : la recherche reste dans le processus")
+    yield mcts.start_pool(2)
+    mcts.executor.shutdown()
+    mcts.executor = None
+    mcts.executor_workers = 0
+
+
+
+
+def test_same_seed_same_plan_in_process():
+    """Même graine et mêmes itérations : même plan, sans pool."""
+    match = new_match()
+    unit = match.enemy_units[0]
+    first = mcts.best_plan(match, unit, iterations=60, seed=5, workers=1)
+    second = mcts.best_plan(match, unit, iterations=60, seed=5, workers=1)
+    assert first == second
+
+
+
+
+def test_same_seed_same_plan_with_pool(pool, monkeypatch):
+    """Même graine et mêmes itérations : même plan avec le pool, et le même que sans pool."""
+    match = new_match()
+    unit = match.enemy_units[0]
+    first = mcts.best_plan(match, unit, iterations=60, seed=5, workers=2)
+    second = mcts.best_plan(match, unit, iterations=60, seed=5, workers=2)
+    assert first == second
+
+    # sans pool, les deux arbres (graines 5 et 6) sont calculés l'un après l'autre dans ce processus
+    monkeypatch.setattr(mcts, "get_executor", lambda workers: None)
+    assert mcts.best_plan(match, unit, iterations=60, seed=5, workers=2) == first
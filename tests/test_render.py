@@ -0,0 +1,71 @@
+"""Tests du brouillard de guerre (render.py), avec le pilote vidéo sans fenêtre de conftest.py."""
+
+import random
+
+import pygame
+
+from render import FogLayer
+from unit import CELL_SIZE
+
+
+GRID_WIDTH = 12
+GRID_HEIGHT = 8
+
+
+
+
+def random_frames(count, seed=0):
+    """Ensembles de cellules visibles successifs, comme une équipe qui se déplace."""
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        x, y = rng.randrange(GRID_WIDTH), rng.randrange(GRID_HEIGHT)
+        radius = rng.randrange(4)
+        frames.append({(cx, cy) for cx in range(x - radius, x + radius + 1) for cy in range(y - radius, y + radius + 1)
+                       if 0 <= cx < GRID_WIDTH and 0 <= cy < GRID_HEIGHT})
+    return frames
+
+
+
+
+def test_incremental_update_matches_full_repaint():
+    """Après une suite de mises à jour partielles, la surface est celle d'un brouillard repeint en entier."""
+    fog = FogLayer(GRID_WIDTH, GRID_HEIGHT)
+    for visible_cells in random_frames(40):
+        fog.update(visible_cells)
+
+        fresh = FogLayer(GRID_WIDTH, GRID_HEIGHT)
+        fresh.update(visible_cells)
+        assert pygame.image.tobytes(fog.surface, "RGBA") == pygame.image.tobytes(fresh.surface, "RGBA")
+    assert fog.surfaces_created == 1
+
+
+
+
+def test_composite_matches_per_cell_blits():
+    """Le blit unique donne l'image de l'ancien affichage (une surface grise à alpha 100 par cellule cachée)."""
+    size = (GRID_WIDTH * CELL_SIZE, GRID_HEIGHT * CELL_SIZE)
+    background = pygame.Surface(size)
+    for x in range(GRID_WIDTH):
+        for y in range(GRID_HEIGHT):
+            background.fill(((x * 20) % 256, (y * 30) % 256, 90), (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+
+    fog = FogLayer(GRID_WIDTH, GRID_HEIGHT)
+    for visible_cells in random_frames(5, seed=1):
+        fog.update(visible_cells)
+
+        expected = background.copy()
+        for x in range(GRID_WIDTH):
+            for y in range(GRID_HEIGHT):
+                if (x, y) not in visible_cells:
+                    cell = pygame.Surface((CELL_SIZE, CELL_SIZE))
+                    cell.set_alpha(100)
+                    cell.fill((50, 50, 50))
+                    expected.blit(cell, (x * CELL_SIZE, y * CELL_SIZE))
+
+        composed = background.copy()
+        fog.draw(composed)
+        # les deux chemins de mélange de SDL peuvent arrondir différemment (1 niveau au plus)
+        difference = max(abs(a - b) for a, b in zip(pygame.image.tobytes(expected, "RGB"),
+                                                    pygame.image.tobytes(composed, "RGB")))
+        assert difference <= 1
@@ -0,0 +1,27 @@
+"""Tests du hachage de Zobrist (transposition.py)."""
+
+from rules import create_fighter
+from transposition import get_hasher
+
+
+
+
+def test_endurance_max_changes_hash():
+    """Deux unités identiques sauf endurence_max (budget de déplacement) n'ont pas le même hachage."""
+    hasher = get_hasher()
+    first = create_fighter("Shogun", "player 1", 4, 5)
+    second = create_fighter("Shogun", "player 1", 4, 5)
+    assert hasher.unit_key(0, first) == hasher.unit_key(0, second)
+
+    second.endurence_max += 2  # par exemple après un terrain qui ralentit ou accélère
+    assert hasher.unit_key(0, first) != hasher.unit_key(0, second)
+
+
+
+
+def test_same_units_same_hash():
+    """Le hachage ne dépend pas de l'ordre dans lequel les unités sont ajoutées."""
+    hasher = get_hasher()
+    units = {0: create_fighter("Yennefer", "player 1", 1, 1), 1: create_fighter("Sekiro", "enemy", 7, 3)}
+    reversed_units = dict(reversed(list(units.items())))
+    assert hasher.hash_units(units, 2) == hasher.hash_units(reversed_units, 2)
@@ -0,0 +1,81 @@
+"""
+Décisions de l'IA calculées en arrière-plan, pendant les attentes et les animations du tour ennemi.
+
+La décision d'une unité est calculée dans un thread sur une copie de la partie (rules.clone_match),
+prise au moment de la demande : l'affichage peut continuer à modifier la vraie partie sans gêner le
+calcul. Le résultat est un plan (chemin, index de compétence) à appliquer à l'unité réelle dans cet
+ordre : le déplacement, puis la compétence (choisie pour la position d'arrivée).
+"""
+
+import concurrent.futures
+
+import ai
+import mcts
+import search
+from rules import clone_match
+
+
+
+
+def decide(match, unit, difficulty="normal", influence=None):
+    """
+    Choisit le plan d'une unité selon la difficulté, sans l'appliquer. Le plan est joué dans l'ordre
+    déplacement puis compétence (comme ai.play_turn et Game.enemy_AI_turn) : la compétence est
+    toujours choisie pour l'état après le déplacement, quelle que soit la difficulté.
+
+    Paramètres :
+    -----------
+    - match : MatchState
+        La partie (ou une copie).
+    - unit : Fighter
+        L'unité qui va jouer.
+    - difficulty : str
+        "normal" (IA gloutonne de ai.py), "hard" (search.py) ou "expert" (mcts.py).
+    - influence : InfluenceMap
+        Carte d'influence du tour, pour l'IA gloutonne.
+
+    Retourne :
+    ---------
+    - tuple[list[tuple[int, int]], int] : le chemin à suivre et l'index de la compétence à utiliser (ou None).
+    """
+    budget = search.DIFFICULTIES.get(difficulty)
+    if difficulty == "expert":
+        return mcts.best_plan(match, unit, budget)
+    if budget:
+        return search.best_plan(match, unit, budget)
+
+    return ai.greedy_plan(match, unit, influence=influence)
+
+
+
+
+class BackgroundThinker:
+    """
+    Classe pour calculer les décisions de l'IA dans un thread.
+
+    Attributs :
+    ----------
+    - executor : concurrent.futures.ThreadPoolExecutor
+        Le thread de calcul (un seul : les décisions sont demandées une par une).
+    """
+
+
+
+
+    def __init__(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai")
+
+
+
+
+    def submit(self, match, unit, difficulty="normal", influence=None):
+        """
+        Lance le calcul de la décision d'une unité sur une copie de la partie prise maintenant.
+
+        Retourne :
+        ---------
+        - concurrent.futures.Future : son result() est le plan de decide().
+        """
+        state = clone_match(match)
+        copy = state.all_units()[match.all_units().index(unit)]
+        return self.executor.submit(decide, state, copy, difficulty, influence)
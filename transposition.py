@@ -0,0 +1,202 @@
+"""
+Hachage de Zobrist des états de la partie et table de transposition, sans pygame.
+
+Le hachage d'un état est le XOR de clés aléatoires de 64 bits : une par (unité, cellule),
+(unité, tranche de santé), (unité, endurance maximale) et une pour l'unité qui doit jouer. Deux
+suites de coups qui mènent au même état (A puis B, ou B puis A) ont donc le même hachage. Les clés
+sont tirées d'une graine fixe : un hachage est le même d'une exécution à l'autre (comparaison
+d'états dans les rediffusions).
+"""
+
+import random
+
+from rules import GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT
+
+
+ZOBRIST_SEED = 20241201
+MAX_UNITS = 16        # unités distinguées (indices dans all_units)
+HEALTH_LIMIT = 128    # santés au-delà comptées dans la dernière tranche
+ENDURANCE_LIMIT = 32
+MAX_PLIES = 64        # positions dans l'ordre de jeu
+
+# Types de bornes des valeurs de la table (élagage alpha-bêta)
+EXACT = 0
+LOWER = 1   # la valeur vraie est au moins value
+UPPER = 2   # la valeur vraie est au plus value
+
+
+
+
+class ZobristHasher:
+    """
+    Classe pour calculer le hachage de Zobrist d'un état.
+
+    Attributs :
+    ----------
+    - width, height : int
+        Dimensions de la carte.
+    - health_bucket : int
+        Largeur des tranches de santé : 1 pour distinguer toutes les santés (rediffusions),
+        plus pour regrouper des états presque identiques (recherche).
+    """
+
+
+
+
+    def __init__(self, width=GRID_SIZE_WIDTH, height=GRID_SIZE_HEIGHT, health_bucket=1):
+        self.width = width
+        self.height = height
+        self.health_bucket = health_bucket
+
+        rng = random.Random(ZOBRIST_SEED)
+        cells = width * height
+        buckets = HEALTH_LIMIT // health_bucket + 1
+        self.position_keys = [[rng.getrandbits(64) for _ in range(cells)] for _ in range(MAX_UNITS)]
+        self.health_keys = [[rng.getrandbits(64) for _ in range(buckets)] for _ in range(MAX_UNITS)]
+        self.endurance_keys = [[rng.getrandbits(64) for _ in range(ENDURANCE_LIMIT + 1)] for _ in range(MAX_UNITS)]
+        self.ply_keys = [rng.getrandbits(64) for _ in range(MAX_PLIES)]
+
+
+
+
+    def unit_key(self, slot, unit):
+        """Retourne la part du hachage due à une unité (slot : son indice dans la partie)."""
+        health = min(max(unit.health, 0), HEALTH_LIMIT) // self.health_bucket
+        # endurence_max est le budget de déplacement du tour (movement.py), modifié par le terrain
+        endurance = min(max(unit.endurence_max, 0), ENDURANCE_LIMIT)
+        return (self.position_keys[slot][unit.y * self.width + unit.x]
+                ^ self.health_keys[slot][health]
+                ^ self.endurance_keys[slot][endurance])
+
+
+
+
+    def hash_units(self, units, ply=0):
+        """
+        Retourne le hachage d'un ensemble d'unités.
+
+        Paramètres :
+        -----------
+        - units : dict[int, Fighter]
+            Les unités en vie, par indice dans la partie (les unités absentes sont mortes).
+        - ply : int
+            Position dans l'ordre de jeu de l'unité qui doit jouer.
+
+        Retourne :
+        ---------
+        - int : le hachage sur 64 bits.
+        """
+        key = self.ply_keys[ply]
+        for slot, unit in units.items():
+            key ^= self.unit_key(slot, unit)
+        return key
+
+
+
+
+    def hash_match(self, match, ply=0):
+        """Retourne le hachage d'une partie (les unités sont repérées par leur indice dans all_units)."""
+        return self.hash_units(dict(enumerate(match.all_units())), ply)
+
+
+
+
+hashers = {}  # (width, height, health_bucket) -> ZobristHasher, les clés ne sont tirées qu'une fois
+
+
+
+
+def get_hasher(width=GRID_SIZE_WIDTH, height=GRID_SIZE_HEIGHT, health_bucket=1):
+    """Retourne le ZobristHasher de ces dimensions (créé à la première demande)."""
+    key = (width, height, health_bucket)
+    if key not in hashers:
+        hashers[key] = ZobristHasher(width, height, health_bucket)
+    return hashers[key]
+
+
+
+
+class TranspositionTable:
+    """
+    Classe pour garder les résultats déjà calculés de la recherche, indexés par hachage de Zobrist.
+
+    La table a une taille fixe : l'entrée d'un hachage est rangée à l'index hachage % capacity. Quand
+    deux états tombent sur le même index, on garde celui qui a été cherché le plus profondément (ou le
+    plus récent à profondeur égale).
+
+    Attributs :
+    ----------
+    - capacity : int
+        Nombre d'entrées.
+    - probes, hits, stores, replacements : int
+        Statistiques : lectures, lectures réussies, écritures, entrées d'un autre état écrasées.
+    """
+
+
+
+
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.entries = [None] * capacity
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+
+
+
+    def lookup(self, key):
+        """
+        Retourne l'entrée (key, depth, value, bound, best) d'un hachage, ou None si elle n'est pas dans la table.
+        """
+        self.probes += 1
+        entry = self.entries[key % self.capacity]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+
+
+
+    def store(self, key, depth, value, bound, best=None):
+        """
+        Enregistre le résultat d'une recherche.
+
+        Paramètres :
+        -----------
+        - key : int
+            Hachage de l'état.
+        - depth : int
+            Profondeur restante de la recherche qui a donné value.
+        - value : int
+            Valeur trouvée.
+        - bound : int
+            EXACT, LOWER ou UPPER.
+        - best : int
+            Index du meilleur plan (pour l'essayer en premier la prochaine fois).
+        """
+        index = key % self.capacity
+        entry = self.entries[index]
+        if entry is not None and entry[0] != key:
+            if entry[1] > depth:
+                return
+            self.replacements += 1
+        self.entries[index] = (key, depth, value, bound, best)
+        self.stores += 1
+
+
+
+
+    def hit_rate(self):
+        """Retourne la proportion de lectures réussies."""
+        return self.hits / self.probes if self.probes else 0.0
+
+
+
+
+    def stats(self):
+        """Retourne les statistiques de la table (affichage, réglage de la capacité)."""
+        return {"probes": self.probes, "hits": self.hits, "hit_rate": self.hit_rate(),
+                "stores": self.stores, "replacements": self.replacements}
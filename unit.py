@@ -1,19 +1,22 @@
 import pygame
-import random
-import os
-import copy
-import csv
 from abc import ABC, abstractmethod
+from assets import assets
+from sounds import sound_bank
+from grid import (TERRAIN_GRASS, TERRAIN_MAGMA, TERRAIN_WATER, TERRAIN_MUD,
+                  TERRAIN_HEALING, TERRAIN_SNOW, TERRAIN_BUSH)
+from rules import (GRID_SIZE_WIDTH, GRID_SIZE_HEIGHT, ARCHETYPES,
+                   Fighter, IchimonjiRules, SkyClearRules, SamuraiGraveRules, PurpleChaosRules,
+                   PoisonMasterRules, HealerRules, ShurikenRules, AssasinFlickerRules, ShadowBerserkRules,
+                   square_area)
 
 
 
 
 # Constantes
-# Ces constantes définissent les paramètres du jeu, comme les dimensions de la grille, les couleurs et les équipes.
+# Ces constantes définissent les paramètres de l'affichage, comme la taille des cellules et les couleurs.
+# Les dimensions de la grille et les règles de la partie sont dans rules.py.
 GAME_TITLE = "Forest Gate"
 CELL_SIZE = 40
-GRID_SIZE_WIDTH = 30 # (1400//CELL_SIZE) - 1
-GRID_SIZE_HEIGHT = 16 # int(GRID_SIZE_WIDTH*(9/16))
 WIDTH = GRID_SIZE_WIDTH * CELL_SIZE
 HEIGHT = GRID_SIZE_HEIGHT * CELL_SIZE
 FPS = 30
@@ -28,10 +31,21 @@ ANOTHER_GREY= (224,224,224)
 ORANGE=(255,178,102)
 YELLOW = (255, 255, 0)
 PURPLE = (153, 51, 255)
-CHARACTER_PER_TEAM = 3
 INFO_PANEL_HEIGHT = 120
+SKILL_ICON_SIZE = 50 # côté des icônes des compétences dans le panneau d'information
 WINDOW_HEIGHT = HEIGHT + INFO_PANEL_HEIGHT
 
+# Son joué à l'entrée sur chaque type de terrain (clés de game.sounds)
+TERRAIN_SOUNDS = {
+    TERRAIN_MAGMA: 'magma',
+    TERRAIN_MUD: 'mud',
+    TERRAIN_WATER: 'water',
+    TERRAIN_HEALING: 'healing',
+    TERRAIN_GRASS: 'footstep',
+    TERRAIN_SNOW: 'snow',
+    TERRAIN_BUSH: 'bush',
+}
+
 
 
 
@@ -45,9 +59,9 @@ pygame.display.set_caption(GAME_TITLE)
 
 
 
-class Unit:
+class Unit(Fighter):
     """
-    Classe pour représenter une unité dans le jeu.
+    Classe pour représenter une unité dans le jeu (affichage d'un Fighter de rules.py).
 
     Attributs :
     ----------
@@ -65,6 +79,8 @@ class Unit:
         Équipe de l'unité ('player', 'enemy', etc.).
     - texture : pygame.Surface
         Texture utilisée pour représenter visuellement l'unité.
+    - texture_path : str
+        Chemin de la texture (chargée à chaque taille par assets.py), ou None si elle n'existe pas.
     - name : str
         Nom de l'unité.
 
@@ -111,34 +127,46 @@ class Unit:
             Nom de l'unité.
         """
 
-        self.x = x
-        self.y = y
-        self.health = health
-        self.max_health = health
-        self.attack_power = attack_power
-        self.endurence_max_init = endurence_max
-        self.endurence_max = endurence_max
-        self.endurence = self.endurence_max
-        self.defense = 0
-        self.team = team  # 'player 1' , 'player 2' ou 'enemy'
+        super().__init__(x, y, health, attack_power, endurence_max, team, name)
+        self.texture_path = texture_path
         self.is_selected = False
         self.x_choiceButton = x_choiceButton
         self.y_choiceButton = y_choiceButton
-        self.skills = []
-        self.name = name
 
-        # Charger la texture si elle existe
-        self.texture = None
-        if texture_path:
-            if os.path.exists(texture_path):
-                self.raw_texture = pygame.image.load(texture_path)
-                self.texture = pygame.transform.scale(self.raw_texture, (CELL_SIZE, CELL_SIZE))  # Redimensionner l'image
-                self.choice_texture = pygame.transform.scale(self.raw_texture, (CELL_SIZE*4, CELL_SIZE*4))
-            else:
-                print(f"{texture_path} not found")
-                self.raw_texture = None
-                self.texture = None
-                self.choice_texture = None
+        # Vérifier que la texture existe (elle est chargée par assets.py au premier affichage)
+        if texture_path and not assets.exists(texture_path):
+            print(f"{texture_path} not found")
+            self.texture_path = None
+
+
+
+
+    @property
+    def texture(self):
+        """Texture de l'unité à la taille d'une cellule, ou None si elle n'en a pas."""
+        if not self.texture_path:
+            return None
+        return assets.image(self.texture_path, (CELL_SIZE, CELL_SIZE))
+
+
+
+
+    @property
+    def choice_texture(self):
+        """Texture de l'unité sur le bouton du choix des personnages."""
+        return assets.image(self.texture_path, (CELL_SIZE*4, CELL_SIZE*4))
+
+
+
+
+    def image_requests(self):
+        """Images à précharger pour l'unité et ses compétences (demandes pour assets.preload)."""
+        requests = []
+        if self.texture_path:
+            requests.append((assets.image, self.texture_path, (CELL_SIZE, CELL_SIZE)))
+        for skill in self.skills:
+            requests += skill.image_requests()
+        return requests
 
 
 
@@ -161,122 +189,16 @@ class Unit:
         - None
         """
 
-        new_x = self.x + dx
-        new_y = self.y + dy
-
-        # Verifie si les nouvelles coordonées ne sortent pas de la map et ne sont pas un mur
-        if 0 <= new_x < GRID_SIZE_WIDTH and 0 <= new_y < GRID_SIZE_HEIGHT and not game.is_wall(new_x, new_y):
-            # Verifie si il ya pas d'autre unité dans la cellule
-            for unit in game.player_units + game.player2_units + game.enemy_units:
-                if unit.x == new_x and unit.y == new_y:
-                    return  
-                
-            # Vérifie si l'unité a suffisamment d'endurance pour se déplacer
-            if self.endurence <= -1:
-                print(f"{self.name} n'a plus assez d'endurance pour se déplacer.")
-                return
-
-            # Arrete le son en cours
-            if hasattr(game, 'current_sound') and game.current_sound:  
-                game.current_sound.stop()
-                
-            # Met à jour la position     
-            self.x = new_x
-            self.y = new_y
-
-            # Détection du type de terrain et application des effet de celui-ci sur l'unite
-            if (self.x, self.y) in game.magmas:
-                game.current_sound=game.sounds['magma']
-                game.current_sound.play()
-                if isinstance(self, Samurai):
-                    self.health -= 6
-                elif isinstance(self, Shinobi):
-                    self.health -= 8
-                elif isinstance(self, Sorceress):
-                    self.health -= 10
-
-            elif (self.x, self.y) in game.muds:
-                game.current_sound=game.sounds['mud']
-                game.current_sound.play()
-                if isinstance(self, Samurai):
-                    self.endurence_max -= 5
-                    self.endurence -= 5
-                elif isinstance(self, Shinobi):
-                    self.endurence_max -= 2
-                    self.endurence -= 2
-                elif isinstance(self, Sorceress):
-                    self.endurence_max -= 3
-                    self.endurence -= 3
-                game.turn_counter=0 # Réinitialisation du compteur
-
-            elif (self.x, self.y) in game.water:
-                game.current_sound=game.sounds['water']
-                game.current_sound.play()
-                if isinstance(self, Samurai):
-                    self.endurence_max -= 4
-                    self.endurence -= 4
-                elif isinstance(self, Shinobi):
-                    self.endurence_max -= 1
-                    self.endurence -= 1
-                elif isinstance(self, Sorceress):
-                    self.endurence_max -= 2
-                    self.endurence -= 2
-                game.turn_counter=0  # Réinitialisation du compteur
-
-            elif (self.x, self.y) in game.healing:
-                game.current_sound=game.sounds['healing']
-                game.current_sound.play()
-                self.health += 10  # Effet de soin commun
-                # S'assure que la santé ne dépasse pas le maximum
-                if self.health > self.max_health:
-                    self.health = self.max_health
-
-            elif (self.x, self.y) in game.grass:
-                game.current_sound=game.sounds['footstep']
-                game.current_sound.play()
-
-            elif (self.x, self.y) in game.snow:
-                game.current_sound=game.sounds['snow']
-                game.current_sound.play()
-
-            elif (self.x, self.y) in game.bush:
-                game.current_sound=game.sounds['bush']
-                game.current_sound.play()
-                if isinstance(self, Samurai):  # Shogun
-                    self.health -= 0
-                elif isinstance(self, Shinobi):  # Assassin
-                    self.health -= 1
-                elif isinstance(self, Sorceress):
-                    self.health -= 1
-
-            else:
-                game.current_sound=None # Aucun son à jouer 
-
-            # Vérifie que l'endurance ne soit pas négative
-            if self.endurence_max <= 0:
-                self.endurence_max = 1
-            if self.endurence <= 0:
-                self.endurence = 0
-
-
-
-
-    def attack(self, target):
-        """
-        Attaque une cible donnée si elle est à portée.
-
-        Paramètres :
-        -----------
-        - target : Unit
-            L'unité cible à attaquer.
-
-        Retourne :
-        ---------
-        - None
-        """
+        # Déplacement et effets du terrain (voir Fighter.move dans rules.py)
+        terrain = super().move(dx, dy, game)
+        if terrain is None:
+            return
 
-        if abs(self.x - target.x) <= 1 and abs(self.y - target.y) <= 1:
-            target.health -= self.attack_power
+        # Joue le son du terrain d'arrivée sur le canal des terrains (il remplace le son en cours)
+        if terrain in TERRAIN_SOUNDS:
+            sound_bank.play(game.sounds[TERRAIN_SOUNDS[terrain]], "terrain")
+        else:
+            sound_bank.stop("terrain") # Aucun son à jouer 
 
 
 
@@ -360,7 +282,7 @@ class Unit:
             pygame.draw.rect(screen, WHITE, self.button, 2)
 
             # Affiche le nom du personnage :
-            font = pygame.font.Font(None, 36)
+            font = assets.font(None, 36)
             text = font.render(f"{self.name}", True, WHITE)
             screen.blit(text, (self.button.x + ((CELL_SIZE*4) - text.get_width()) // 2, self.button.y+int(CELL_SIZE*4.5)))
 
@@ -371,25 +293,34 @@ class Unit:
 
 # Definitions Des Types d'unités :
 class Sorceress(Unit):
+    archetype = "Sorceress"
+
     def __init__(self, x, y, team, texture_path, x_choiceButton, y_choiceButton, name):
-        super().__init__(x, y, health=30, attack_power=8, endurence_max=6, team=team, texture_path=texture_path, x_choiceButton=x_choiceButton, y_choiceButton=y_choiceButton, name=name)
-        self.defense = 15
+        stats = ARCHETYPES[self.archetype]  # caractéristiques dans rules.py
+        super().__init__(x, y, health=stats["health"], attack_power=stats["attack_power"], endurence_max=stats["endurence_max"], team=team, texture_path=texture_path, x_choiceButton=x_choiceButton, y_choiceButton=y_choiceButton, name=name)
+        self.defense = stats["defense"]
         self.skills.append(Purple_Chaos())
         self.skills.append(Poison_Master())
         self.skills.append(Healer())
         
 class Samurai(Unit):
+    archetype = "Samurai"
+
     def __init__(self, x, y, team, texture_path, x_choiceButton, y_choiceButton, name):
-        super().__init__(x, y, health=30, attack_power=10, endurence_max=8, team=team, texture_path=texture_path, x_choiceButton=x_choiceButton, y_choiceButton=y_choiceButton, name=name)
-        self.defense = 30
+        stats = ARCHETYPES[self.archetype]  # caractéristiques dans rules.py
+        super().__init__(x, y, health=stats["health"], attack_power=stats["attack_power"], endurence_max=stats["endurence_max"], team=team, texture_path=texture_path, x_choiceButton=x_choiceButton, y_choiceButton=y_choiceButton, name=name)
+        self.defense = stats["defense"]
         self.skills.append(Ichimonji())
         self.skills.append(Sky_Clear())
         self.skills.append(Samurai_Grave())
 
 class Shinobi(Unit):
+    archetype = "Shinobi"
+
     def __init__(self, x, y, team, texture_path, x_choiceButton, y_choiceButton, name):
-        super().__init__(x, y, health=30, attack_power=12, endurence_max=10, team=team, texture_path=texture_path, x_choiceButton=x_choiceButton, y_choiceButton=y_choiceButton, name=name)
-        self.defense = 20
+        stats = ARCHETYPES[self.archetype]  # caractéristiques dans rules.py
+        super().__init__(x, y, health=stats["health"], attack_power=stats["attack_power"], endurence_max=stats["endurence_max"], team=team, texture_path=texture_path, x_choiceButton=x_choiceButton, y_choiceButton=y_choiceButton, name=name)
+        self.defense = stats["defense"]
         self.skills.append(Shuriken())
         self.skills.append(Assasin_Flicker())
         self.skills.append(Shadow_Berserk())
@@ -400,6 +331,27 @@ class Shinobi(Unit):
 
 # Definition des compétances :
 class Skill(ABC):
+    # chemins des images (animation_frames est défini par chaque compétence) ; les images
+    # sont demandées à assets.py au moment de les afficher, déjà préchargées en général
+    animation_frames = []
+    skill_logo_path = None
+
+    @property
+    def animation_image(self):
+        """Images de l'animation, à la taille d'une cellule."""
+        return [assets.image(frame, (CELL_SIZE, CELL_SIZE)) for frame in self.animation_frames]
+
+    @property
+    def skill_logo(self):
+        """Logo de la compétence, à la taille des icônes du panneau d'information."""
+        return assets.image(self.skill_logo_path, (SKILL_ICON_SIZE, SKILL_ICON_SIZE))
+
+    def image_requests(self):
+        """Images à précharger pour cette compétence (demandes pour assets.preload)."""
+        requests = [(assets.image, frame, (CELL_SIZE, CELL_SIZE)) for frame in self.animation_frames]
+        requests.append((assets.image, self.skill_logo_path, (SKILL_ICON_SIZE, SKILL_ICON_SIZE)))
+        return requests
+
     @abstractmethod
     def use_skill(self, owner_unit, game):
         pass
@@ -408,128 +360,63 @@ class Skill(ABC):
 
 
 
-class Ichimonji(Skill):
+class Ichimonji(IchimonjiRules, Skill):
     def __init__(self):
-        self.name = "Ichimonji"
-        self.damage = 14
-        self.range = 2
         self.sound_effect = "data/skills/ichimonji.mp3"
 
         # animations
         self.animation_frames = ["data/skills/ichimonji.png"]
-        self.animation_image = []
-        for frame in self.animation_frames:
-            image = pygame.image.load(frame).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
-            self.animation_image.append(image)
 
         # skill logo
-        skill_logo_path = "data/skills/samurai_slash.jpg"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/samurai_slash.jpg"
 
         # commandes 
         self.instructions = [
                 "Attack (if enemy is in range) : Space",
                 "Cancel Skill : X",
             ]
-        
-        # est ce que ce skill a une utilisation IA
-        self.AI_compatible = True
 
     def use_skill(self, owner_unit, game):
-        # utilisation du skill par un joueur
-        if (owner_unit.team == "player 1") or (owner_unit.team == "player 2"):
-            target = None  # Initialize the target
-            # Check all potential targets
-            for potential_target in game.player_units + game.player2_units + game.enemy_units:
-                if  ((owner_unit.team != potential_target.team) and
-                    (abs(owner_unit.x - potential_target.x) <= self.range and abs(owner_unit.y - potential_target.y) <= self.range)):
-                    # validate target
-                    target = potential_target
-
-                    # Apply skill effects to the target
-                    target.health -= int(self.damage * (1 - target.defense / 100))
-
-                    # Play the sound effect
-                    if self.sound_effect:
-                        sound = pygame.mixer.Sound(self.sound_effect)
-                        sound.play()
-
-                    # Play the animation
-                    for image in self.animation_image:
-                        game.screen.blit(image, (target.x * CELL_SIZE, target.y * CELL_SIZE))
-                        pygame.display.flip()
-                        pygame.time.delay(200)  # Delay between frames
+        # Cible : une unité adverse à portée pour un joueur, une unité de "player 1" pour l'IA (voir rules.py)
+        target = self.find_target(owner_unit, game)
 
-                    self.used = True
-                    break
-
-            if target == None :
-                print("No valid target in range, Skill canceled.")
-                self.used = True
-
-        # utilisation du skill automatique par enemy
-        elif (owner_unit.team == "enemy") :
-            target = None  # Initialize the target
-            # Check all potential targets
-            for potential_target in game.player_units:
-                if ((abs(owner_unit.x - potential_target.x) <= self.range) and (abs(owner_unit.y - potential_target.y) <= self.range)):
-                    # validate target
-                    target = potential_target
-
-                    # Apply skill effects to the target
-                    target.health -= (int(self.damage * (1 - target.defense / 100)) + 6) # buff pour les enemies pour equilibrer
-
-                    # Play the sound effect
-                    if self.sound_effect:
-                        sound = pygame.mixer.Sound(self.sound_effect)
-                        sound.play()
-
-                    # Play the animation
-                    for image in self.animation_image:
-                        game.screen.blit(image, (target.x * CELL_SIZE, target.y * CELL_SIZE))
-                        pygame.display.flip()
-                        pygame.time.delay(100)  # Delay between frames
+        if target == None :
+            print("No valid target in range, Skill canceled.")
+            self.used = True
+        else:
+            # Apply skill effects to the target (avec le buff des enemies pour equilibrer)
+            self.apply(owner_unit, target, game)
 
-                    self.used = True
-                    break
+            # Play the sound effect
+            if self.sound_effect:
+                sound_bank.play(self.sound_effect)
 
-            if target == None :
-                print("No valid target in range, Skill canceled.")
-                self.used = True
+            # Play the animation
+            delay = 100 if owner_unit.team == "enemy" else 200
+            for image in self.animation_image:
+                game.renderer.mark(game.screen.blit(image, (target.x * CELL_SIZE, target.y * CELL_SIZE)), transient=True)
+                game.renderer.present()
+                pygame.time.delay(delay)  # Delay between frames
+
+            self.used = True
 
         # test to remove dead units
-        for unit in game.player_units + game.player2_units + game.enemy_units:
-            if unit.team == "player 1" and unit.health<=0 :
-                game.player_units.remove(unit)
-            elif unit.team == "player 2" and unit.health<=0 :
-                game.player2_units.remove(unit)
-            elif unit.team == "enemy" and unit.health<=0 :
-                game.enemy_units.remove(unit)
+        game.remove_dead_units()
 
         
 
 
 
 
-class Sky_Clear(Skill):
+class Sky_Clear(SkyClearRules, Skill):
     def __init__(self):
-        self.name = "Sky Clear"
-        self.damage = 16 
-        self.range = 3 
         self.sound_effect = "data/skills/ichimonji.mp3"
 
         # animations
         self.animation_frames = ["data/skills/skyclear.jpg"]
-        self.animation_image = []
-        for frame in self.animation_frames:
-            image = pygame.image.load(frame).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
-            self.animation_image.append(image)
 
         # skill logo
-        skill_logo_path = "data/skills/skyclear.jpg"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/skyclear.jpg"
 
         # commandes 
         self.instructions = [
@@ -537,9 +424,6 @@ class Sky_Clear(Skill):
                 "Throw the katana : Space",
                 "Cancel Skill : X",
             ]
-        
-        # est ce que ce skill a une utilisation IA
-        self.AI_compatible = False
 
     def use_skill(self, owner_unit, game):
         target_x, target_y = owner_unit.x, owner_unit.y  # Start with the owner's position
@@ -547,8 +431,8 @@ class Sky_Clear(Skill):
         # Initial target zone draw
         game.draw_map_units(team=owner_unit.team)
         highlight_rect = pygame.Rect((target_x) * CELL_SIZE, (target_y) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-        pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)  # Gray border
-        pygame.display.flip()
+        game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)  # Gray border
+        game.renderer.present()
 
         direction=None 
 
@@ -572,27 +456,16 @@ class Sky_Clear(Skill):
                         direction="down"
                         
 
-                    # Déterminer les 3 cases consécutives basées sur la direction
-                    target_positions=[]
-                    if direction=="up":
-                        target_positions=[(owner_unit.x,owner_unit.y-i) for i in range(1,4)]
-                    if direction=="down":
-                        target_positions=[(owner_unit.x,owner_unit.y+i) for i in range(1,4)]
-                    if direction=="left":
-                        target_positions=[(owner_unit.x-i,owner_unit.y) for i in range(1,4)]
-                    if direction=="right":
-                        target_positions=[(owner_unit.x+i,owner_unit.y) for i in range(1,4)]
-
-                    # Ensure the effect zone does not include the caster
-                    target_positions = [(x, y) for x, y in target_positions if (x, y) != (owner_unit.x, owner_unit.y)]
+                    # Déterminer les cases consécutives basées sur la direction (sans le lanceur)
+                    target_positions = self.line(owner_unit, direction)
 
                     # Redraw the map with the highlight
                     game.draw_map_units(team=owner_unit.team)
                     for new_target_x,new_target_y in target_positions:
                         if 0 <= new_target_x < GRID_SIZE_WIDTH and 0 <= new_target_y < GRID_SIZE_HEIGHT:
                             highlight_rect = pygame.Rect((new_target_x) * CELL_SIZE, (new_target_y) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                            pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)  # Gray border
-                    pygame.display.flip()
+                            game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)  # Gray border
+                    game.renderer.present()
 
                     # Validate the target with the space key
                     if event.key == pygame.K_SPACE:
@@ -608,65 +481,41 @@ class Sky_Clear(Skill):
 
         # Explosion phase
         game.draw_map_units(team=owner_unit.team)
-        pygame.display.flip()
 
         # Play sound effect
         if self.sound_effect:
-            sound2 = pygame.mixer.Sound("data/skills/sword_throw.mp3")
-            sound3 = pygame.mixer.Sound("data/skills/crack.mp3")
-            sound2.play()
-            sound3.play()
+            sound_bank.play("data/skills/sword_throw.mp3")
+            sound_bank.play("data/skills/crack.mp3")
 
         # Damage units in the picked area
         for new_target_x,new_target_y in target_positions:
             if 0 <= new_target_x < GRID_SIZE_WIDTH and 0 <= new_target_y < GRID_SIZE_HEIGHT:
-                for potential_target in game.player_units + game.player2_units + game.enemy_units:
-                    if potential_target == owner_unit:
-                        continue
-                    if potential_target.x == new_target_x and potential_target.y == new_target_y:
-                        potential_target.health -= int(self.damage * (1 - potential_target.defense / 100))
-
-                        # Remove units with 0 or less health
-                        if potential_target.health <= 0:
-                            if potential_target.team == "player 1":
-                                game.player_units.remove(potential_target)
-                            elif potential_target.team == "player 2":
-                                game.player2_units.remove(potential_target)
-                            elif potential_target.team == "enemy":
-                                game.enemy_units.remove(potential_target)
+                # Damage the unit in the cell and remove it if its health drops to 0 (rules.py)
+                self.apply(owner_unit, game, [(new_target_x, new_target_y)])
 
                 # Play animation for the cell
                 for image in self.animation_image:
                     for cracked_image in self.animation_image:
 
                         # Draw the cracked ground image first (background)
-                        game.screen.blit(cracked_image, (new_target_x * CELL_SIZE, new_target_y * CELL_SIZE))
+                        game.renderer.mark(game.screen.blit(cracked_image, (new_target_x * CELL_SIZE, new_target_y * CELL_SIZE)), transient=True)
                         # Draw the ichimonji image on top
-                        game.screen.blit(image, (new_target_x * CELL_SIZE, new_target_y * CELL_SIZE))
+                        game.renderer.mark(game.screen.blit(image, (new_target_x * CELL_SIZE, new_target_y * CELL_SIZE)), transient=True)
 
                         # Update the display
-                        pygame.display.flip()
+                        game.renderer.present()
                         pygame.time.delay(200)  # Delay between frames
 
 
-class Samurai_Grave(Skill):
+class Samurai_Grave(SamuraiGraveRules, Skill):
     def __init__(self):
-        self.name = "Samurai Grave"
-        self.damage = 10
-        self.range = 2
         self.sound_effect = "data/skills/ichimonji.mp3"
 
         # Animations
         self.animation_frames = ["data/skills/samurai_grave.png"]
-        self.animation_image = []
-        for frame in self.animation_frames:
-            image = pygame.image.load(frame).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
-            self.animation_image.append(image)
 
         # skill logo
-        skill_logo_path = "data/skills/samurai_grave.png"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/samurai_grave.png"
 
         # commandes 
         self.instructions = [
@@ -674,19 +523,16 @@ class Samurai_Grave(Skill):
                 "Perform The Ritual : Space",
                 "Cancel Skill : X",
             ]
-        
-        # est ce que ce skill a une utilisation IA
-        self.AI_compatible = False
 
     def use_skill(self, owner_unit, game):
-        target_x, target_y = owner_unit.x, owner_unit.y  # Start with the owner's position
-        new_target_x, new_target_y = owner_unit.x, owner_unit.y
+        target_x, target_y = self.suggested_target(owner_unit, game)  # Start with the best area (footprints.py)
+        new_target_x, new_target_y = target_x, target_y
 
         # Initial target zone draw
         game.draw_map_units(team=owner_unit.team)
         highlight_rect = pygame.Rect((target_x-1) * CELL_SIZE, (target_y-1) * CELL_SIZE, CELL_SIZE*3, CELL_SIZE*3)
-        pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)  # Gray border
-        pygame.display.flip()
+        game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)  # Gray border
+        game.renderer.present()
 
         # Target selection phase
         selecting_target = True
@@ -719,8 +565,8 @@ class Samurai_Grave(Skill):
                     # Redraw the map with the highlight
                     game.draw_map_units(team=owner_unit.team)
                     highlight_rect = pygame.Rect((target_x-1) * CELL_SIZE, (target_y-1) * CELL_SIZE, CELL_SIZE*3, CELL_SIZE*3)
-                    pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)  # Gray border
-                    pygame.display.flip()
+                    game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)  # Gray border
+                    game.renderer.present()
 
                     # Validate the target with the space key
                     if event.key == pygame.K_SPACE:
@@ -736,84 +582,46 @@ class Samurai_Grave(Skill):
 
         # Explosion phase
         game.draw_map_units(team=owner_unit.team)
-        pygame.display.flip()
 
         # Play sound effect
         if self.sound_effect:
-            sound = pygame.mixer.Sound(self.sound_effect)
-            sound2=pygame.mixer.Sound("data/skills/die.mp3")
-            sound.play()
-            sound2.play()
+            sound_bank.play(self.sound_effect)
+            sound_bank.play("data/skills/die.mp3")
             
 
         # play animations and apply damage
-        affected_cells = []
-        for dx in range(-1, 2):  # -1, 0, 1 for 3x3 area
-            for dy in range(-1, 2):
-                cell_x = target_x + dx
-                cell_y = target_y + dy
-
-                # Skip cells out of bounds
-                if cell_x < 0 or cell_x >= GRID_SIZE_WIDTH or cell_y < 0 or cell_y >= GRID_SIZE_HEIGHT:
-                    continue
-
-                affected_cells.append((cell_x, cell_y))
+        affected_cells = self.area(target_x, target_y)  # 3x3 area inside the map
 
         # Play animations and apply damage simultaneously
         for image in self.animation_image:
             # Draw the "samurai_grave" animation
             for cell_x, cell_y in affected_cells:
-                game.screen.blit(image, (cell_x * CELL_SIZE, cell_y * CELL_SIZE))
+                game.renderer.mark(game.screen.blit(image, (cell_x * CELL_SIZE, cell_y * CELL_SIZE)), transient=True)
 
-            pygame.display.flip()
+            game.renderer.present()
             pygame.time.delay(500)  # Delay between frames
         
-        sound3 = pygame.mixer.Sound("data/skills/dagger-slash-sound.mp3")
-        sound3.play()
+        sound3 = sound_bank.play("data/skills/dagger-slash-sound.mp3")
         pygame.time.delay(int(sound3.get_length() * 100))  # Attendre la fin du deuxième son
-        sound4=pygame.mixer.Sound("data/skills/sword-blade-slash-fx.mp3")
-        sound4.play()
+        sound4 = sound_bank.play("data/skills/sword-blade-slash-fx.mp3")
         pygame.time.delay(int(sound4.get_length() * 100))  # Attendre la fin du deuxième son
-        sound5 = pygame.mixer.Sound("data/skills/sword-clash.mp3")
-        sound5.play()
+        sound5 = sound_bank.play("data/skills/sword-clash.mp3")
         pygame.time.delay(int(sound5.get_length() * 100))  # Attendre la fin du deuxième son
-        sound6=pygame.mixer.Sound("data/skills/sword-blade-slash-metallic.mp3")
-        sound6.play()
+        sound6 = sound_bank.play("data/skills/sword-blade-slash-metallic.mp3")
         pygame.time.delay(int(sound6.get_length() * 100))  # Attendre la fin du deuxième son
 
         # Apply damage to units in affected cells
-        for cell_x, cell_y in affected_cells:
-            for potential_target in game.player_units + game.player2_units + game.enemy_units:
-                if potential_target.x == cell_x and potential_target.y == cell_y:
-                    potential_target.health -= int(self.damage * (1 - potential_target.defense / 100))
-
-                    # Remove units with 0 or less health
-                    if potential_target.health <= 0:
-                        if potential_target.team == "player 1":
-                            game.player_units.remove(potential_target)
-                        elif potential_target.team == "player 2":
-                            game.player2_units.remove(potential_target)
-                        elif potential_target.team == "enemy":
-                            game.enemy_units.remove(potential_target)
-
-class Purple_Chaos(Skill):
+        self.apply(owner_unit, game, target_x, target_y)
+
+class Purple_Chaos(PurpleChaosRules, Skill):
     def __init__(self):
-        self.name = "Purple Chaos"
-        self.damage = 10 
-        self.range = 3
         self.sound_effect = "data/skills/magicblast.mp3"
 
         # Animations 
         self.animation_frames = ["data/skills/purple.png"]
-        self.animation_image = []
-        for frame in self.animation_frames:
-            image = pygame.image.load(frame).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
-            self.animation_image.append(image)
 
         # Logo de la compétence
-        skill_logo_path = "data/skills/purple.png"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/purple.png"
 
         # Commandes 
         self.instructions = [
@@ -821,9 +629,6 @@ class Purple_Chaos(Skill):
                 "Lancer le chaos : Espace",
                 "Annuler la compétence : X",
             ]
-        
-        # Est-ce que cette compétence peut être utilisée par l'IA ?
-        self.AI_compatible = True
 
     def use_skill(self, owner_unit, game):
         if owner_unit.team in ["player 1", "player 2"]:
@@ -832,23 +637,17 @@ class Purple_Chaos(Skill):
             self.enemy_use_skill(owner_unit, game)
 
         # test to remove dead units
-        for unit in game.player_units + game.player2_units + game.enemy_units:
-            if unit.team == "player 1" and unit.health<=0 :
-                game.player_units.remove(unit)
-            elif unit.team == "player 2" and unit.health<=0 :
-                game.player2_units.remove(unit)
-            elif unit.team == "enemy" and unit.health<=0 :
-                game.enemy_units.remove(unit)
+        game.remove_dead_units()
 
     def player_use_skill(self, owner_unit, game):
-        target_x, target_y = owner_unit.x, owner_unit.y  # Position initiale
-        new_target_x, new_target_y = owner_unit.x, owner_unit.y
+        target_x, target_y = self.suggested_target(owner_unit, game)  # Position initiale : meilleure zone (footprints.py)
+        new_target_x, new_target_y = target_x, target_y
 
         # Dessiner la zone cible initiale
         game.draw_map_units(team=owner_unit.team)
         highlight_rect = pygame.Rect((target_x-1) * CELL_SIZE, (target_y-1) * CELL_SIZE, CELL_SIZE*3, CELL_SIZE*3)
-        pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)  # Bordure grise
-        pygame.display.flip()
+        game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)  # Bordure grise
+        game.renderer.present()
 
         # Phase de sélection de la cible
         selecting_target = True
@@ -881,8 +680,8 @@ class Purple_Chaos(Skill):
                     # Redessiner la carte avec la zone cible mise à jour
                     game.draw_map_units(team=owner_unit.team)
                     highlight_rect = pygame.Rect((target_x-1) * CELL_SIZE, (target_y-1) * CELL_SIZE, CELL_SIZE*3, CELL_SIZE*3)
-                    pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)
-                    pygame.display.flip()
+                    game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)
+                    game.renderer.present()
 
                     # Valider la cible avec la barre d'espace
                     if event.key == pygame.K_SPACE:
@@ -898,92 +697,48 @@ class Purple_Chaos(Skill):
         self.execute_skill(target_x, target_y, game)
 
     def enemy_use_skill(self, owner_unit, game):
-        # Déterminer toutes les cibles potentielles dans la portée
-        potential_targets = []
-        for dx in range(-self.range, self.range + 1):
-            for dy in range(-self.range, self.range + 1):
-                x, y = owner_unit.x + dx, owner_unit.y + dy
-                if 0 <= x < GRID_SIZE_WIDTH and 0 <= y < GRID_SIZE_HEIGHT:
-                    targets = [
-                        unit for unit in game.player_units + game.player2_units + game.enemy_units
-                        if unit.x == x and unit.y == y
-                    ]
-                    if targets:
-                        potential_targets.append((x, y, targets))
-
-        # Filtrer pour trouver une zone qui ne touche que les unités des joueurs
-        for target_x, target_y, targets in potential_targets:
-            enemy_units_hit = any(unit.team == "enemy" for unit in targets)
-            player_units_hit = any(unit.team in ["player 1", "player 2"] for unit in targets)
-            if player_units_hit and not enemy_units_hit:
-                print("L'ennemi utilise Purple Chaos !")
-                self.execute_skill(target_x, target_y, game)
-                return
+        # Meilleur centre de la zone 3x3 à portée (best_anchors) : dégâts aux adversaires, moins ceux subis par les alliés
+        target = self.choose_target(owner_unit, game)
+        if target is not None:
+            print("L'ennemi utilise Purple Chaos !")
+            self.execute_skill(target[0], target[1], game)
+            return
 
         print("L'ennemi annule Purple Chaos car aucune cible appropriée n'est disponible.")
 
     def execute_skill(self, target_x, target_y, game):
         # Phase d'explosion
         game.draw_map_units()
-        pygame.display.flip()
 
         # Jouer l'effet sonore
         if self.sound_effect:
-            sound = pygame.mixer.Sound(self.sound_effect)
-            sound.play()
-
-        # Jouer les animations et appliquer les dégâts
-        for dx in range(-1, 2):  # -1, 0, 1 pour une zone de 3x3
-            for dy in range(-1, 2):
-                cell_x = target_x + dx
-                cell_y = target_y + dy
-
-                # Ignorer les cellules hors limites
-                if cell_x < 0 or cell_x >= GRID_SIZE_WIDTH or cell_y < 0 or cell_y >= GRID_SIZE_HEIGHT:
-                    continue
-
-                # Infliger des dégâts aux unités dans la zone 3x3
-                for potential_target in game.player_units + game.player2_units + game.enemy_units:
-                    if potential_target.x == cell_x and potential_target.y == cell_y:
-                        potential_target.health -= int(self.damage * (1 - potential_target.defense / 100))
-                        # buff pour les enemies pour equilibrer
-                        if potential_target.team == "player 1" : 
-                            potential_target.health -= 8
-
-                        # Supprimer les unités avec 0 PV ou moins
-                        if potential_target.health <= 0:
-                            if potential_target in game.player_units:
-                                game.player_units.remove(potential_target)
-                            elif potential_target in game.player2_units:
-                                game.player2_units.remove(potential_target)
-                            elif potential_target in game.enemy_units:
-                                game.enemy_units.remove(potential_target)
-
-                # Jouer l'animation pour chaque cellule
-                for image in self.animation_image:
-                    game.screen.blit(image, (cell_x * CELL_SIZE, cell_y * CELL_SIZE))
-                    pygame.display.flip()
-                    pygame.time.delay(100)  # Délai entre les frames
+            sound_bank.play(self.sound_effect)
+
+        # Infliger des dégâts aux unités dans la zone 3x3 (buff pour les enemies pour equilibrer : voir rules.py)
+        self.apply(game, target_x, target_y)
 
+        # Jouer l'animation pour chaque cellule
+        for cell_x, cell_y in self.area(target_x, target_y):
+            for image in self.animation_image:
+                game.renderer.mark(game.screen.blit(image, (cell_x * CELL_SIZE, cell_y * CELL_SIZE)), transient=True)
+                game.renderer.present()
+                pygame.time.delay(100)  # Délai entre les frames
 
 
-class Poison_Master(Skill):
+
+class Poison_Master(PoisonMasterRules, Skill):
     def __init__(self):
-        self.name = "Poison Apocalypse"
-        self.damage = 10
-        self.range = 6
         self.sound_effect = "data/skills/poison_master.mp3"
 
         # animations
         self.animation_frames = ["data/skills/poison_cell.png"]
 
-        self.maps = ["data/maps/map_poison_1.csv", "data/maps/map_poison_2.csv", "data/maps/map_poison_3.csv"]
+        # cartes de poison : self.maps (rules.py), compilées une fois en masques
         self.current_map_index = 0
-        self.poison_zones = self.load_poison_zones(self.maps[self.current_map_index])
+        self.poison_zones = self.compile_patterns()[self.current_map_index].cells()
 
         # skill logo
-        skill_logo_path = "data/skills/poison_cell.png"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/poison_cell.png"
 
         # commandes 
         self.instructions = [
@@ -991,36 +746,16 @@ class Poison_Master(Skill):
                 "Unleash Poison : Space",
                 "Cancel Skill : X",
             ]
-        
-        # est ce que ce skill a une utilisation IA
-        self.AI_compatible = False
 
         # Variables graphiques
         self.temp_surface = None
-        self.animation_image = None
     
-    def initialize_graphics(self):
-        """Initialise les graphismes et les surfaces après l'initialisation de Pygame."""
-        if self.animation_image is None:
-            self.animation_image = pygame.image.load(self.animation_frames[0]).convert_alpha()
-            self.animation_image = pygame.transform.scale(self.animation_image, (CELL_SIZE, CELL_SIZE))
-    
-    def load_poison_zones(self, filename):
-        """Charge les zones de poison depuis un fichier CSV."""
-        zones = []
-        with open(filename, mode='r') as file:
-            reader = csv.reader(file)
-            for y, row in enumerate(reader):
-                for x, cell in enumerate(row):
-                    if cell == '*':
-                        zones.append((x, y))  # Ajouter la position du flacon (x, y)
-        return zones
-
-        
     def use_skill(self, owner_unit, game):
-        # S'assurer que les graphismes sont initialisés
-        if self.animation_image is None:
-            self.initialize_graphics()
+        # Carte de poison proposée d'abord : celle qui touche le plus d'adversaires (footprints.py)
+        best = self.best_anchors(owner_unit, game)
+        if best:
+            self.current_map_index = self.maps.index(best[0][2].filename)
+            self.poison_zones = self.patterns[self.current_map_index].cells()
         
         selecting_target = True
         # Préparer une surface temporaire de la taille de l'écran
@@ -1038,7 +773,8 @@ class Poison_Master(Skill):
             # Blitter la surface temporaire sur l'écran principal
             game.draw_map_units(team=owner_unit.team)  # Dessiner l'état de la carte
             game.screen.blit(self.temp_surface, (0, 0))
-            pygame.display.flip()
+            game.renderer.mark_cells(self.poison_zones, transient=True)
+            game.renderer.present()
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -1048,7 +784,7 @@ class Poison_Master(Skill):
                     # Changer de carte avec les flèches directionnelles
                     if event.key == pygame.K_LEFT or event.key == pygame.K_RIGHT:
                         self.current_map_index = (self.current_map_index + 1) % len(self.maps)
-                        self.poison_zones = self.load_poison_zones(self.maps[self.current_map_index])
+                        self.poison_zones = self.patterns[self.current_map_index].cells()
                         break
                     # Valider avec K_SPACE
                     elif event.key == pygame.K_SPACE:
@@ -1061,66 +797,39 @@ class Poison_Master(Skill):
                         return
         # Play sound effect
         if self.sound_effect:
-            sound = pygame.mixer.Sound(self.sound_effect)
-            sound.play()
+            sound_bank.play(self.sound_effect)
             
         # Phase d'explosion
         game.draw_map_units(team=owner_unit.team)
         self.temp_surface.fill((0, 0, 0, 0))  # Effacer la surface temporaire
         for x, y in self.poison_zones:
-            self.temp_surface.blit(self.animation_image, (x * CELL_SIZE, y * CELL_SIZE))  # Dessiner l'image d'animation
+            self.temp_surface.blit(self.animation_image[0], (x * CELL_SIZE, y * CELL_SIZE))  # Dessiner l'image d'animation
         # Afficher la surface avec toutes les animations sur l'écran
         game.screen.blit(self.temp_surface, (0, 0))
-        pygame.display.flip()
+        game.renderer.mark_cells(self.poison_zones, transient=True)
+        game.renderer.present()
         pygame.time.delay(500)  # Réduire le délai pour un affichage fluide
         
         
-        # Appliquer les dégâts
-        for cell_x, cell_y in self.poison_zones:
-            for potential_target in game.player_units + game.player2_units + game.enemy_units:
-                if potential_target == owner_unit:
-                    continue
-                if potential_target.x == cell_x and potential_target.y == cell_y:
-                    potential_target.health -= int(self.damage * (1 - potential_target.defense / 100))
-                    
-                    # Remove units with 0 or less health
-                    if potential_target.health <= 0:
-                        if potential_target.team == "player 1":
-                            game.player_units.remove(potential_target)
-                        elif potential_target.team == "player 2":
-                            game.player2_units.remove(potential_target)
-                        elif potential_target.team == "enemy":       
-                            game.enemy_units.remove(potential_target)
-
-
-class Healer(Skill):
+        # Appliquer les dégâts (masque de la carte croisé avec les cellules occupées)
+        self.apply_pattern(owner_unit, game, self.patterns[self.current_map_index])
+
+
+class Healer(HealerRules, Skill):
     def __init__(self):
-        self.name = "Healing"
-        self.heal_amount = 14  # Montant de soin par unité
-        self.damage = 5 # to avoid bugs when this attribute is called outside
-        self.range = 3  # Portée de la compétence
         self.sound_effect = "data/skills/magic.mp3"  # Effet sonore
 
         # animations 
         self.animation_frames = ["data/skills/healer.png"]  # Animation de soin
-        self.animation_image = []
-        for frame in self.animation_frames:
-            image = pygame.image.load(frame).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
-            self.animation_image.append(image)
 
         # skill logo
-        skill_logo_path = "data/skills/healer.png"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/healer.png"
 
         # commandes 
         self.instructions = [
                 "Heal : Space",
                 "Cancel Skill : X",
             ]
-        
-        # est ce que ce skill a une utilisation IA
-        self.AI_compatible = False
 
     def use_skill(self, owner_unit, game):
         target_x, target_y = owner_unit.x, owner_unit.y  # Position du propriétaire
@@ -1128,8 +837,8 @@ class Healer(Skill):
         # Afficher la zone grise de la portée
         game.draw_map_units(team=owner_unit.team)
         highlight_rect = pygame.Rect((target_x-2) * CELL_SIZE, (target_y-2) * CELL_SIZE, CELL_SIZE*5, CELL_SIZE*5)
-        pygame.draw.rect(game.screen, (GREEN), highlight_rect, 3)  # Bord gris
-        pygame.display.flip()
+        game.renderer.mark(pygame.draw.rect(game.screen, (GREEN), highlight_rect, 3), transient=True)  # Bord gris
+        game.renderer.present()
 
         # Attendre que l'utilisateur appuie sur la barre d'espace pour lancer la compétence
         selecting_target = True
@@ -1153,69 +862,34 @@ class Healer(Skill):
 
         # Phase d'activation de la compétence
         game.draw_map_units(team=owner_unit.team)
-        pygame.display.flip()
 
         # Jouer l'effet sonore
         if self.sound_effect:
-            sound = pygame.mixer.Sound(self.sound_effect)
-            sound.play()
-        affected_cells=[]
+            sound_bank.play(self.sound_effect)
         # Appliquer les soins aux alliés dans la zone d'effet
-        for dx in range(-self.range, self.range-1):  # -range, ..., +range pour une zone carrée
-            for dy in range(-self.range, self.range -1):
-                cell_x = target_x+1 + dx
-                cell_y = target_y+1 + dy
-
-                # Vérifier si la cellule est dans les limites du terrain
-                if cell_x < 0 or cell_x >= GRID_SIZE_WIDTH or cell_y < 0 or cell_y >= GRID_SIZE_HEIGHT:
-                    continue
-
-                # Soigner les unités alliées dans la zone d'effet
-                for potential_target in game.player_units + game.player2_units:  # Allié dans les deux équipes
-                    if potential_target.x == cell_x and potential_target.y == cell_y:
-                        potential_target.health += self.heal_amount  # Augmenter les PV de l'unité
-
-                        # Assurer que les PV ne dépassent pas la capacité maximale de l'unité
-                        if potential_target.health > potential_target.max_health:
-                            potential_target.health = potential_target.max_health
-
-                affected_cells.append((cell_x,cell_y))
+        affected_cells = self.apply(owner_unit, game)
         # Jouer l'animation de soin pour la cellule
         for image in self.animation_image:
             game.draw_map_units(team=owner_unit.team)
 
             # Draw the "samurai_grave" animation
             for cell_x, cell_y in affected_cells:
-                game.screen.blit(image, (cell_x * CELL_SIZE, cell_y * CELL_SIZE))
+                game.renderer.mark(game.screen.blit(image, (cell_x * CELL_SIZE, cell_y * CELL_SIZE)), transient=True)
 
-            pygame.display.flip()
+            game.renderer.present()
             pygame.time.delay(1000)  # Delay between frames
 
         
-class Shuriken(Skill):
+class Shuriken(ShurikenRules, Skill):
     def __init__(self):
-        self.name = "Shuriken"
-        self.damage = 13
-        self.range = 4  
         self.sound_effect = "data/skills/shuriken_sound_1.mp3"
 
         # animations
         self.animation_frames = ["data/skills/green_magma.png"]
-        self.animation_image = []
-        for frame in self.animation_frames:
-            image = pygame.image.load(frame).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
-            self.animation_image.append(image)
         self.animation_frames_2 = ["data/skills/shuriken.png"]
-        self.animation_image_2 = []
-        for frame2 in self.animation_frames_2:
-            image = pygame.image.load(frame2).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
-            self.animation_image_2.append(image)
 
         # skill logo
-        skill_logo_path = "data/skills/poison_shuriken.jpg"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/poison_shuriken.jpg"
 
         # commandes 
         self.instructions = [
@@ -1223,9 +897,14 @@ class Shuriken(Skill):
                 "Throw Poisoned Shuriken : Space",
                 "Cancel Skill : X",
             ]
-        
-        # est ce que ce skill a une utilisation IA
-        self.AI_compatible = False
+
+    @property
+    def animation_image_2(self):
+        """Images du shuriken lancé, à la taille d'une cellule."""
+        return [assets.image(frame, (CELL_SIZE, CELL_SIZE)) for frame in self.animation_frames_2]
+
+    def image_requests(self):
+        return super().image_requests() + [(assets.image, frame, (CELL_SIZE, CELL_SIZE)) for frame in self.animation_frames_2]
 
     def use_skill(self, owner_unit, game):
         target_x, target_y = owner_unit.x, owner_unit.y  # Start with the owner's position
@@ -1233,8 +912,8 @@ class Shuriken(Skill):
         # Initial target zone draw
         game.draw_map_units(team=owner_unit.team)
         highlight_rect = pygame.Rect((target_x) * CELL_SIZE, (target_y) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-        pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)  # Gray border
-        pygame.display.flip()
+        game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)  # Gray border
+        game.renderer.present()
 
         direction=None 
 
@@ -1258,27 +937,16 @@ class Shuriken(Skill):
                         direction="down"
                         
 
-                    # Déterminer les 3 cases consécutives basées sur la direction
-                    target_positions=[]
-                    if direction=="up":
-                        target_positions=[(owner_unit.x,owner_unit.y-i) for i in range(1,5)]
-                    if direction=="down":
-                        target_positions=[(owner_unit.x,owner_unit.y+i) for i in range(1,5)]
-                    if direction=="left":
-                        target_positions=[(owner_unit.x-i,owner_unit.y) for i in range(1,5)]
-                    if direction=="right":
-                        target_positions=[(owner_unit.x+i,owner_unit.y) for i in range(1,5)]
-
-                    # Ensure the effect zone does not include the caster
-                    target_positions = [(x, y) for x, y in target_positions if (x, y) != (owner_unit.x, owner_unit.y)]
+                    # Déterminer les cases consécutives basées sur la direction (sans le lanceur)
+                    target_positions = self.line(owner_unit, direction)
 
                     # Redraw the map with the highlight
                     game.draw_map_units(team=owner_unit.team)
                     for new_target_x,new_target_y in target_positions:
                         if 0 <= new_target_x < GRID_SIZE_WIDTH and 0 <= new_target_y < GRID_SIZE_HEIGHT:
                             highlight_rect = pygame.Rect((new_target_x) * CELL_SIZE, (new_target_y) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                            pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)  # Gray border
-                    pygame.display.flip()
+                            game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)  # Gray border
+                    game.renderer.present()
 
                     # Validate the target with the space key
                     if event.key == pygame.K_SPACE:
@@ -1294,37 +962,21 @@ class Shuriken(Skill):
 
         # Explosion phase
         game.draw_map_units(team=owner_unit.team)
-        pygame.display.flip()
 
         # Play sound effect
         if self.sound_effect:
-            sound1 = pygame.mixer.Sound(self.sound_effect)
-            sound1.play()
+            sound_bank.play(self.sound_effect)
             pygame.time.delay(50)  # Attendre la fin du premier son
 
             # Jouer un deuxième son
-            sound2 = pygame.mixer.Sound("data/skills/shuriken_sound_2.mp3")
-            sound3 = pygame.mixer.Sound("data/skills/sword-blade-slash-metallic.mp3")
-            sound2.play()
-            sound3.play()
+            sound_bank.play("data/skills/shuriken_sound_2.mp3")
+            sound_bank.play("data/skills/sword-blade-slash-metallic.mp3")
 
         # Damage units in the picked area
         for new_target_x,new_target_y in target_positions:
             if 0 <= new_target_x < GRID_SIZE_WIDTH and 0 <= new_target_y < GRID_SIZE_HEIGHT:
-                for potential_target in game.player_units + game.player2_units + game.enemy_units:
-                    if potential_target == owner_unit:
-                        continue
-                    if potential_target.x == new_target_x and potential_target.y == new_target_y:
-                        potential_target.health -= int(self.damage * (1 - potential_target.defense / 100))
-
-                        # Remove units with 0 or less health
-                        if potential_target.health <= 0:
-                            if potential_target.team == "player 1":
-                                game.player_units.remove(potential_target)
-                            elif potential_target.team == "player 2":
-                                game.player2_units.remove(potential_target)
-                            elif potential_target.team == "enemy":
-                                game.enemy_units.remove(potential_target)
+                # Damage the unit in the cell and remove it if its health drops to 0 (rules.py)
+                self.apply(owner_unit, game, [(new_target_x, new_target_y)])
 
                 # Play animation for the cell
                 for image in self.animation_image:
@@ -1332,28 +984,24 @@ class Shuriken(Skill):
                     for image2 in self.animation_image_2:
 
                         # Draw the cracked ground image first (background)
-                        game.screen.blit(image, (new_target_x * CELL_SIZE, new_target_y * CELL_SIZE))
+                        game.renderer.mark(game.screen.blit(image, (new_target_x * CELL_SIZE, new_target_y * CELL_SIZE)), transient=True)
                         # Draw the ichimonji image on top
-                        game.screen.blit(image2, (new_target_x * CELL_SIZE, new_target_y * CELL_SIZE))
+                        game.renderer.mark(game.screen.blit(image2, (new_target_x * CELL_SIZE, new_target_y * CELL_SIZE)), transient=True)
 
                         # Update the display
-                        pygame.display.flip()
+                        game.renderer.present()
                         pygame.time.delay(100)  # Delay between frames
         
 
 
 
-class Assasin_Flicker(Skill):
+class Assasin_Flicker(AssasinFlickerRules, Skill):
     def __init__(self):
-        self.name = "Death Shadow"
-        self.damage = 12
-        self.range = 4
         self.sound_effect = "data/skills/ichimonji.mp3"
         self.animation_frames = ["data/skills/butterfly_slash.png"]
 
         # skill logo
-        skill_logo_path = "data/skills/butterfly_slash.png"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/butterfly_slash.png"
 
         # commandes 
         self.instructions = [
@@ -1362,9 +1010,6 @@ class Assasin_Flicker(Skill):
                 "Execute The Shadow Art : Arrow keys",
                 "Cancel Skill : X",
             ]
-        
-        # est ce que ce skill a une utilisation IA
-        self.AI_compatible = False
 
     def use_skill(self, owner_unit, game):
         target = None
@@ -1376,8 +1021,8 @@ class Assasin_Flicker(Skill):
                 x, y = owner_unit.x + dx, owner_unit.y + dy
                 if 0 <= x < GRID_SIZE_WIDTH and 0 <= y < GRID_SIZE_HEIGHT:
                     highlight_rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)
-        pygame.display.flip()
+                    game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)
+        game.renderer.present()
 
         selecting_target = True
         while selecting_target:
@@ -1393,11 +1038,10 @@ class Assasin_Flicker(Skill):
 
                     # Check if the clicked position is within range and has an enemy
                     if abs(owner_unit.x - clicked_x) <= self.range and abs(owner_unit.y - clicked_y) <= self.range:
-                        for potential_target in game.player_units + game.player2_units + game.enemy_units:
-                            if potential_target.x == clicked_x and potential_target.y == clicked_y:
-                                target = potential_target
-                                selecting_target = False
-                                break
+                        potential_target = game.occupancy.unit_at(clicked_x, clicked_y)
+                        if potential_target is not None:
+                            target = potential_target
+                            selecting_target = False
 
                 # Cancel skill
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_x:
@@ -1408,12 +1052,8 @@ class Assasin_Flicker(Skill):
             print("No valid target selected.")
             return
 
-        # Highlight the area around the target
-        adjacent_units = []
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            adj_x, adj_y = target.x + dx, target.y + dy
-            if 0 <= adj_x < GRID_SIZE_WIDTH and 0 <= adj_y < GRID_SIZE_HEIGHT:
-                adjacent_units.append((adj_x, adj_y))
+        # Highlight the area around the target (une seule unité par cellule : cases libres uniquement)
+        adjacent_units = self.landing_cells(target, game)
 
         direction_selection = True
         selected_position = None
@@ -1421,8 +1061,8 @@ class Assasin_Flicker(Skill):
             game.draw_map_units(team=owner_unit.team)
             for adj_x, adj_y in adjacent_units:
                 highlight_rect = pygame.Rect(adj_x * CELL_SIZE, adj_y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(game.screen, (153, 51, 255, 128), highlight_rect, 3)  # Purple border
-            pygame.display.flip()
+                game.renderer.mark(pygame.draw.rect(game.screen, (153, 51, 255, 128), highlight_rect, 3), transient=True)  # Purple border
+            game.renderer.present()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -1433,26 +1073,26 @@ class Assasin_Flicker(Skill):
                     if event.key == pygame.K_LEFT:
                         selected_position = (target.x - 1, target.y)
                         highlight_rect = pygame.Rect( (target.x - 1)* CELL_SIZE, target.y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                        pygame.draw.rect(game.screen, (255, 255, 0, 128), highlight_rect, 3)  # Yellow border
-                        pygame.display.flip()
+                        game.renderer.mark(pygame.draw.rect(game.screen, (255, 255, 0, 128), highlight_rect, 3), transient=True)  # Yellow border
+                        game.renderer.present()
                         pygame.time.delay(100) 
                     elif event.key == pygame.K_RIGHT:
                         selected_position = (target.x + 1, target.y)
                         highlight_rect = pygame.Rect( (target.x + 1)* CELL_SIZE, target.y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                        pygame.draw.rect(game.screen, (255, 255, 0, 128), highlight_rect, 3)  # Yellow border
-                        pygame.display.flip()
+                        game.renderer.mark(pygame.draw.rect(game.screen, (255, 255, 0, 128), highlight_rect, 3), transient=True)  # Yellow border
+                        game.renderer.present()
                         pygame.time.delay(100)
                     elif event.key == pygame.K_UP:
                         selected_position = (target.x, target.y - 1)
                         highlight_rect = pygame.Rect( (target.x)* CELL_SIZE, (target.y-1) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                        pygame.draw.rect(game.screen, (255, 255, 0, 128), highlight_rect, 3)  # Yellow border
-                        pygame.display.flip()
+                        game.renderer.mark(pygame.draw.rect(game.screen, (255, 255, 0, 128), highlight_rect, 3), transient=True)  # Yellow border
+                        game.renderer.present()
                         pygame.time.delay(100)
                     elif event.key == pygame.K_DOWN:
                         selected_position = (target.x, target.y + 1)
                         highlight_rect = pygame.Rect( (target.x)* CELL_SIZE, (target.y+1) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                        pygame.draw.rect(game.screen, (255, 255, 0, 128), highlight_rect, 3)  # Yellow border
-                        pygame.display.flip()
+                        game.renderer.mark(pygame.draw.rect(game.screen, (255, 255, 0, 128), highlight_rect, 3), transient=True)  # Yellow border
+                        game.renderer.present()
                         pygame.time.delay(100)
 
                     # Confirm selection with space key
@@ -1465,71 +1105,50 @@ class Assasin_Flicker(Skill):
                         print("Skill canceled.")
                         return
 
-        # Teleport behind the target and apply damage
-        owner_unit.x, owner_unit.y = selected_position
-
         # Play sound effect
         if self.sound_effect:
-            sound = pygame.mixer.Sound(self.sound_effect)
-            sound.play()
+            sound_bank.play(self.sound_effect)
 
-        # Apply damage
-        target.health -= int(self.damage * (1 - target.defense / 100))
-        if target.health <= 0:
-            if target in game.player_units:
-                game.player_units.remove(target)
-            elif target in game.player2_units:
-                game.player2_units.remove(target)
-            elif target in game.enemy_units:
-                game.enemy_units.remove(target)
+        # Teleport behind the target and apply damage
+        self.apply(owner_unit, game, target, selected_position)
 
 
     
         # Play animation
-        animation_image = pygame.image.load(self.animation_frames[0]).convert_alpha()
-        animation_image = pygame.transform.scale(animation_image, (CELL_SIZE, CELL_SIZE))
-        game.screen.blit(animation_image, (target.x * CELL_SIZE, target.y * CELL_SIZE))
-        pygame.display.flip()
+        animation_image = assets.image(self.animation_frames[0], (CELL_SIZE, CELL_SIZE))
+        game.renderer.mark(game.screen.blit(animation_image, (target.x * CELL_SIZE, target.y * CELL_SIZE)), transient=True)
+        game.renderer.present()
         pygame.time.delay(100)
 
 
 
 
 class Shadow:
+    # animations
+    animation_frames = ["data/skills/shadow.png"]
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
-        # animations
-        self.animation_frames = ["data/skills/shadow.png"]
         self.animation_image = []
         for frame in self.animation_frames:
-            image = pygame.image.load(frame).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
+            image = assets.image(frame, (CELL_SIZE, CELL_SIZE))
             self.animation_image.append(image)
 
 
 
 
 
-class Shadow_Berserk(Skill):
+class Shadow_Berserk(ShadowBerserkRules, Skill):
     def __init__(self):
-        self.name = "Shadow Berserk"
-        self.damage = 12
-        self.range = 2
         self.sound_effect = "data/skills/ichimonji.mp3"
 
         # animations
         self.animation_frames = ["data/skills/ichimonji.png"]
-        self.animation_image = []
-        for frame in self.animation_frames:
-            image = pygame.image.load(frame).convert_alpha()
-            image = pygame.transform.scale(image, (CELL_SIZE, CELL_SIZE))
-            self.animation_image.append(image)
 
         # logo de la compétence
-        skill_logo_path = "data/skills/shadow.png"
-        self.skill_logo = pygame.image.load(skill_logo_path).convert_alpha()
+        self.skill_logo_path = "data/skills/shadow.png"
 
         # commandes 
         self.instructions = [
@@ -1537,8 +1156,9 @@ class Shadow_Berserk(Skill):
                 "Annuler la compétence : X",
             ]
 
-        # est-ce que cette compétence peut être utilisée par l'IA
-        self.AI_compatible = True
+    def image_requests(self):
+        # les ombres invoquées pendant la compétence
+        return super().image_requests() + [(assets.image, frame, (CELL_SIZE, CELL_SIZE)) for frame in Shadow.animation_frames]
 
     def use_skill(self, owner_unit, game):
         # utilisation de la compétence par un joueur
@@ -1550,19 +1170,14 @@ class Shadow_Berserk(Skill):
 
     def player_use_skill(self, owner_unit, game):
         # Calculer la zone d'effet
-        zone_of_effect = []
-        for dx in range(-self.range, self.range+1):
-            for dy in range(-self.range, self.range+1):
-                x, y = owner_unit.x + dx, owner_unit.y + dy
-                if 0 <= x < GRID_SIZE_WIDTH and 0 <= y < GRID_SIZE_HEIGHT:
-                    zone_of_effect.append((x, y))
+        zone_of_effect = square_area(owner_unit.x, owner_unit.y, self.range)
 
         # Dessiner la zone d'effet
         game.draw_map_units(team=owner_unit.team)
         for x, y in zone_of_effect:
             highlight_rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3)
-        pygame.display.flip()
+            game.renderer.mark(pygame.draw.rect(game.screen, (128, 128, 128, 128), highlight_rect, 3), transient=True)
+        game.renderer.present()
 
         selecting_target = True
         while selecting_target:
@@ -1581,111 +1196,41 @@ class Shadow_Berserk(Skill):
                         return
 
         # Trouver tous les ennemis dans la zone d'effet (ignorer les alliés)
-        enemies_in_zone = [
-            unit for unit in game.player_units + game.player2_units + game.enemy_units
-            if (unit.x, unit.y) in zone_of_effect and unit.team != owner_unit.team
-        ]
-        if not enemies_in_zone:
+        if not self.targets(owner_unit, game):
             print("Aucun ennemi dans la zone d'effet.")
             return
 
-        # Créer des shadows et les positionner près des ennemis
-        shadows = []
-        for enemy in enemies_in_zone:
-            shadow_position = self.get_adjacent_position(enemy, game)
-            if shadow_position:
-                shadow = Shadow(*shadow_position)
-                shadows.append((shadow, enemy))
-
-        # Afficher les shadows sur la carte
-        for shadow, enemy in shadows:
-            game.screen.blit(shadow.animation_image[0], (shadow.x * CELL_SIZE, shadow.y * CELL_SIZE))
-        pygame.display.flip()
-        pygame.time.delay(500)
-
-        # Les shadows attaquent leurs ennemis associés
-        for shadow, enemy in shadows:
-            shadow.x, shadow.y = self.get_adjacent_position(enemy, game)
-            game.screen.blit(self.animation_image[0], (enemy.x * CELL_SIZE, enemy.y * CELL_SIZE))
-            pygame.display.flip()
-            pygame.time.delay(200)
-            enemy.health -= int(self.damage * (1 - enemy.defense / 100))
-            if enemy.health <= 0:
-                if enemy in game.player_units:
-                    game.player_units.remove(enemy)
-                elif enemy in game.player2_units:
-                    game.player2_units.remove(enemy)
-                elif enemy in game.enemy_units:
-                    game.enemy_units.remove(enemy)
-
-        # Jouer l'effet sonore
-        if self.sound_effect:
-            sound = pygame.mixer.Sound(self.sound_effect)
-            sound.play()
+        self.release_shadows(owner_unit, game)
 
     def enemy_use_skill(self, owner_unit, game):
-        # Calculer la zone d'effet
-        zone_of_effect = []
-        for dx in range(-self.range, self.range+1):
-            for dy in range(-self.range, self.range+1):
-                x, y = owner_unit.x + dx, owner_unit.y + dy
-                if 0 <= x < GRID_SIZE_WIDTH and 0 <= y < GRID_SIZE_HEIGHT:
-                    zone_of_effect.append((x, y))
-
         # Trouver tous les ennemis dans la zone d'effet (ignorer les alliés)
-        enemies_in_zone = [
-            unit for unit in game.player_units + game.player2_units
-            if (unit.x, unit.y) in zone_of_effect and unit.team != owner_unit.team
-        ]
-        if not enemies_in_zone:
+        if not self.targets(owner_unit, game):
             return
 
+        self.release_shadows(owner_unit, game)
+
+    def release_shadows(self, owner_unit, game):
         # Créer des shadows et les positionner près des ennemis
         shadows = []
-        for enemy in enemies_in_zone:
-            shadow_position = self.get_adjacent_position(enemy, game)
-            if shadow_position:
-                shadow = Shadow(*shadow_position)
-                shadows.append((shadow, enemy))
+        for shadow_position, enemy in self.shadow_positions(owner_unit, game):
+            shadows.append((Shadow(*shadow_position), enemy))
 
         # Afficher les shadows sur la carte
         for shadow, enemy in shadows:
-            game.screen.blit(shadow.animation_image[0], (shadow.x * CELL_SIZE, shadow.y * CELL_SIZE))
-        pygame.display.flip()
+            game.renderer.mark(game.screen.blit(shadow.animation_image[0], (shadow.x * CELL_SIZE, shadow.y * CELL_SIZE)), transient=True)
+        game.renderer.present()
         pygame.time.delay(500)
 
-        # Les shadows attaquent leurs ennemis associés
+        # Les shadows attaquent leurs ennemis associés (buff pour les enemies pour equilibrer : voir rules.py)
         for shadow, enemy in shadows:
-            shadow.x, shadow.y = self.get_adjacent_position(enemy, game)
-            game.screen.blit(self.animation_image[0], (enemy.x * CELL_SIZE, enemy.y * CELL_SIZE))
-            pygame.display.flip()
+            game.renderer.mark(game.screen.blit(self.animation_image[0], (enemy.x * CELL_SIZE, enemy.y * CELL_SIZE)), transient=True)
+            game.renderer.present()
             pygame.time.delay(200)
-            enemy.health -= (int(self.damage * (1 - enemy.defense / 100)) + 4) # buff pour les enemies pour equilibrer
-            if enemy.health <= 0:
-                if enemy in game.player_units:
-                    game.player_units.remove(enemy)
-                elif enemy in game.player2_units:
-                    game.player2_units.remove(enemy)
+            self.strike(owner_unit, enemy, game)
 
         # Jouer l'effet sonore
         if self.sound_effect:
-            sound = pygame.mixer.Sound(self.sound_effect)
-            sound.play()
-
-    def get_adjacent_position(self, target, game):
-        """
-        Trouve une position libre adjacente à une cible (target).
-        Retourne une position (x, y) ou None si aucune position n'est disponible.
-        """
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            adj_x, adj_y = target.x + dx, target.y + dy
-            if 0 <= adj_x < GRID_SIZE_WIDTH and 0 <= adj_y < GRID_SIZE_HEIGHT:
-                if not any(
-                    unit.x == adj_x and unit.y == adj_y
-                    for unit in game.player_units + game.player2_units + game.enemy_units
-                ):
-                    return adj_x, adj_y
-        return None
+            sound_bank.play(self.sound_effect)
 
 
 